@@ -0,0 +1 @@
+"""Benchmark suite for the Tic-Tac-Toe package."""
@@ -0,0 +1,48 @@
+"""Command-line entry point: ``python -m benchmarks run|compare``."""
+
+import argparse
+import sys
+import time
+from pathlib import Path
+
+from .compare import compare, load_report
+from .suite import BENCHMARKS, run_suite, save_report
+
+RESULTS_DIR = Path(__file__).resolve().parent / "results"
+
+def main(argv=None) -> int:
+    parser = argparse.ArgumentParser(prog="python -m benchmarks", description=__doc__)
+    commands = parser.add_subparsers(dest="command", required=True)
+
+    run = commands.add_parser("run", help="run benchmarks and save a JSON report")
+    run.add_argument("names", nargs="*", metavar="name",
+                     help=f"benchmarks to run (default: all of {', '.join(BENCHMARKS)})")
+    run.add_argument("-o", "--output", type=Path,
+                     help="report path (default: benchmarks/results/<timestamp>.json)")
+    run.add_argument("--min-time", type=float, default=0.5, help="seconds per timing round")
+    run.add_argument("--repeat", type=int, default=3, help="timing rounds; the best is kept")
+
+    diff = commands.add_parser("compare", help="compare two reports")
+    diff.add_argument("old", type=Path)
+    diff.add_argument("new", type=Path)
+    diff.add_argument("--threshold", type=float, default=0.10,
+                      help="throughput drop counted as a regression (default: 0.10)")
+
+    args = parser.parse_args(argv)
+
+    if args.command == "run":
+        unknown = sorted(set(args.names) - set(BENCHMARKS))
+        if unknown:
+            parser.error(f"unknown benchmarks: {', '.join(unknown)}")
+        report = run_suite(args.names or None, args.min_time, args.repeat)
+        output = args.output or RESULTS_DIR / f"{time.strftime('%Y%m%d-%H%M%S')}.json"
+        save_report(report, output)
+        print(f"Report saved to {output}")
+        return 0
+
+    text, regressions = compare(load_report(args.old), load_report(args.new), args.threshold)
+    print(text)
+    return 1 if regressions else 0
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,35 @@
+"""Compare two benchmark reports and flag regressions."""
+
+import json
+from pathlib import Path
+from typing import Dict, List, Tuple
+
+def load_report(path: Path) -> Dict:
+    """Read a report written by ``suite.save_report``."""
+    return json.loads(Path(path).read_text())
+
+def compare(old: Dict, new: Dict, threshold: float = 0.10) -> Tuple[str, List[str]]:
+    """Return a rendered comparison and the names of regressed benchmarks.
+
+    A benchmark regresses when its throughput drops by more than
+    ``threshold`` (a fraction) relative to ``old``.
+    """
+    lines = [f"{'benchmark':24s} {'old ops/s':>14s} {'new ops/s':>14s} {'change':>9s} {'peak MB':>15s}"]
+    regressions = []
+    for name in sorted(set(old["results"]) | set(new["results"])):
+        before, after = old["results"].get(name), new["results"].get(name)
+        if before is None or after is None:
+            lines.append(f"{name:24s} {'only in ' + ('new' if before is None else 'old'):>30s}")
+            continue
+        change = after["ops_per_sec"] / before["ops_per_sec"] - 1
+        flag = ""
+        if change < -threshold:
+            flag = "  REGRESSION"
+            regressions.append(name)
+        elif change > threshold:
+            flag = "  faster"
+        memory = f"{before['peak_bytes'] / 1e6:.1f}->{after['peak_bytes'] / 1e6:.1f}"
+        lines.append(f"{name:24s} {before['ops_per_sec']:>14,.0f} {after['ops_per_sec']:>14,.0f}"
+                     f" {change:>+8.1%} {memory:>15s}{flag}")
+    header = f"{old.get('revision') or '?'} -> {new.get('revision') or '?'}"
+    return header + "\n" + "\n".join(lines), regressions
@@ -0,0 +1,185 @@
+"""Benchmarks for game primitives, simulation, training and policy I/O.
+
+Each benchmark is a setup function returning ``(func, ops)``: ``func`` is
+the timed callable and ``ops`` the number of operations one call performs
+(boards checked, games played, episodes trained...), so throughput is
+reported per operation rather than per call.
+"""
+
+import contextlib
+import gc
+import io
+import json
+import pickle
+import platform
+import subprocess
+import sys
+import tempfile
+import time
+import tracemalloc
+from pathlib import Path
+from typing import Callable, Dict, List, Optional, Tuple
+
+import numpy as np
+
+from tictactoe import graph, solver
+from tictactoe.game import get_empty_cells, make_move, state_of_board
+from tictactoe.policies import DensePolicy, convert_to_fixed_length, create_random_policy
+from tictactoe.simulation import play_game, run_simulation, simulate_games
+from tictactoe.training import train_q_learning
+
+DATA_DIR = Path(__file__).resolve().parent.parent / "data"
+
+Setup = Callable[[], Tuple[Callable[[], object], int]]
+BENCHMARKS: Dict[str, Setup] = {}
+
+def benchmark(name: str) -> Callable[[Setup], Setup]:
+    """Register a setup function under ``name``."""
+    def register(setup: Setup) -> Setup:
+        BENCHMARKS[name] = setup
+        return setup
+    return register
+
+def _sample_boards(n: int = 1000) -> List[Tuple[int, ...]]:
+    rng = np.random.default_rng(0)
+    return [tuple(rng.integers(0, 3, 9).tolist()) for _ in range(n)]
+
+def _fixed_policies():
+    with open(DATA_DIR / "perfectPolicy.p", "rb") as f:
+        perfect = pickle.load(f)
+    return convert_to_fixed_length(perfect), convert_to_fixed_length(create_random_policy(perfect))
+
+@benchmark("state_of_board")
+def bench_state_of_board():
+    boards = _sample_boards()
+    return lambda: [state_of_board(b) for b in boards], len(boards)
+
+@benchmark("get_empty_cells")
+def bench_get_empty_cells():
+    boards = _sample_boards()
+    return lambda: [get_empty_cells(b) for b in boards], len(boards)
+
+@benchmark("make_move")
+def bench_make_move():
+    boards = _sample_boards()
+    return lambda: [make_move(b, 4, 1) for b in boards], len(boards)
+
+@benchmark("play_game")
+def bench_play_game():
+    perfect, random = _fixed_policies()
+    return lambda: [play_game(random, perfect) for _ in range(100)], 100
+
+@benchmark("run_simulation")
+def bench_run_simulation():
+    perfect, random = _fixed_policies()
+    def run():
+        with contextlib.redirect_stdout(io.StringIO()):
+            return run_simulation(random, perfect, 200)
+    return run, 200
+
+@benchmark("simulate_games")
+def bench_simulate_games():
+    perfect, random = _fixed_policies()
+    return lambda: simulate_games(random, perfect, 100_000, rng=0), 100_000
+
+@benchmark("train_q_learning")
+def bench_train_q_learning():
+    _, random = _fixed_policies()
+    return lambda: train_q_learning(dict(random), episodes=20_000, rng=0), 20_000
+
+@benchmark("solve_perfect_policy")
+def bench_solve_perfect_policy():
+    def run():
+        solver.clear_cache()
+        return solver.perfect_policy()
+    return run, 1
+
+@benchmark("value_iteration_policy")
+def bench_value_iteration_policy():
+    def run():
+        graph.clear_cache()
+        return graph.optimal_policy("value")
+    return run, 1
+
+@benchmark("load_pickle_policy")
+def bench_load_pickle_policy():
+    path = DATA_DIR / "perfectPolicy.p"
+    def run():
+        with open(path, "rb") as f:
+            return pickle.load(f)
+    return run, 1
+
+@benchmark("load_dense_policy")
+def bench_load_dense_policy():
+    perfect, _ = _fixed_policies()
+    scratch = tempfile.TemporaryDirectory()
+    path = Path(scratch.name) / "perfect.npz"
+    DensePolicy.from_dict(perfect).save(path)
+
+    def load(scratch=scratch):
+        # Holding ``scratch`` keeps the file until measure() drops this function
+        return DensePolicy.load(path)
+    return load, 1
+
+@benchmark("import_tictactoe_game")
+def bench_import_tictactoe_game():
+    command = [sys.executable, "-c", "import tictactoe.game"]
+    root = Path(__file__).resolve().parent.parent
+    return lambda: subprocess.run(command, cwd=root, check=True), 1
+
+def measure(setup: Setup, min_time: float = 0.5, repeat: int = 3) -> Dict[str, float]:
+    """Time one benchmark and record its peak traced memory.
+
+    Calls are repeated until ``min_time`` has elapsed, ``repeat`` times
+    over; the fastest round is reported. The peak is taken from one
+    separate call under ``tracemalloc`` so tracing does not skew timings.
+    """
+    func, ops = setup()
+    func()  # warm-up: imports, caches, lazily built tables
+
+    best = float("inf")
+    for _ in range(repeat):
+        calls, start = 0, time.perf_counter()
+        while True:
+            func()
+            calls += 1
+            elapsed = time.perf_counter() - start
+            if elapsed >= min_time:
+                break
+        best = min(best, elapsed / calls)
+
+    gc.collect()
+    tracemalloc.start()
+    func()
+    _, peak = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+
+    return {"ops_per_sec": ops / best, "sec_per_call": best, "ops_per_call": ops, "peak_bytes": peak}
+
+def _git_revision() -> Optional[str]:
+    try:
+        return subprocess.run(["git", "rev-parse", "--short", "HEAD"], capture_output=True,
+                              text=True, check=True).stdout.strip()
+    except (OSError, subprocess.CalledProcessError):
+        return None
+
+def run_suite(names: Optional[List[str]] = None, min_time: float = 0.5, repeat: int = 3) -> Dict:
+    """Run the selected benchmarks (all by default) and return a JSON-ready report."""
+    results = {}
+    for name in names or list(BENCHMARKS):
+        results[name] = measure(BENCHMARKS[name], min_time, repeat)
+        print(f"{name:24s} {results[name]['ops_per_sec']:>14,.0f} ops/s"
+              f"   peak {results[name]['peak_bytes'] / 1e6:8.2f} MB")
+    return {
+        "revision": _git_revision(),
+        "timestamp": time.strftime("%Y-%m-%dT%H:%M:%S"),
+        "python": platform.python_version(),
+        "numpy": np.__version__,
+        "machine": platform.machine(),
+        "results": results,
+    }
+
+def save_report(report: Dict, path: Path) -> None:
+    """Write a report as indented JSON, creating parent directories."""
+    path.parent.mkdir(parents=True, exist_ok=True)
+    path.write_text(json.dumps(report, indent=2))
@@ -6,11 +6,16 @@ setup(
     description="Tic-Tac-Toe AI Analysis with Reinforcement Learning",
     author="Your Name",
     author_email="your.email@example.com",
-    packages=find_packages(),
+    packages=find_packages(include=["tictactoe", "tictactoe.*"]),
     install_requires=[
         "numpy>=1.20.0",
         "matplotlib>=3.5.0",
         "seaborn>=0.11.0",
     ],
     python_requires=">=3.8",
+    entry_points={
+        "console_scripts": [
+            "tictactoe=tictactoe.cli:main",
+        ],
+    },
 )
\ No newline at end of file
@@ -0,0 +1,27 @@
+"""
+Shared fixtures for the shipped policy files.
+"""
+
+import pickle
+import pytest
+from pathlib import Path
+from tictactoe.policies import convert_to_fixed_length
+
+@pytest.fixture(scope="session")
+def data_dir():
+    """Directory holding the pickled policies, independent of the working directory."""
+    return Path(__file__).resolve().parent.parent / "data"
+
+def _load_fixed(path):
+    with open(path, "rb") as f:
+        return convert_to_fixed_length(pickle.load(f))
+
+@pytest.fixture
+def perfect_policy(data_dir):
+    """A fresh fixed-length copy of the shipped perfect policy."""
+    return _load_fixed(data_dir / "perfectPolicy.p")
+
+@pytest.fixture
+def random_policy(data_dir):
+    """A fresh fixed-length copy of the shipped uniform random policy."""
+    return _load_fixed(data_dir / "randomPolicy.p")
@@ -0,0 +1,40 @@
+#!/usr/bin/env python3
+"""
+Tests for the integer board encoding and its lookup tables.
+"""
+
+import itertools
+from tictactoe import board as bb
+from tictactoe.game import state_of_board, get_empty_cells, make_move
+
+def test_round_trip():
+    """Test encode/decode are inverses over every board."""
+    for cells in itertools.product(range(3), repeat=9):
+        state = bb.encode(cells)
+        assert bb.decode(state) == cells, f"Round trip failed for {cells}"
+    assert bb.encode((0,) * 9) == bb.EMPTY_STATE, "Empty board should encode to 0"
+
+def test_tables_match_tuple_functions():
+    """Test status and legal-move tables agree with the tuple implementation."""
+    for state in range(bb.N_STATES):
+        board = bb.decode(state)
+        outcome = state_of_board(board)
+        assert bb.status(state) == outcome, f"Status mismatch for {board}"
+        assert bb.WINNER[state] == max(outcome, 0), f"Winner mismatch for {board}"
+        expected = tuple(get_empty_cells(board)) if outcome == -1 else ()
+        assert bb.legal_moves(state) == expected, f"Legal moves mismatch for {board}"
+        assert list(bb.LEGAL[state].nonzero()[0]) == list(expected)
+
+def test_make_move():
+    """Test integer moves match tuple moves."""
+    board = (1, 0, 2, 0, 1, 0, 0, 0, 2)
+    state = bb.encode(board)
+    for cell in get_empty_cells(board):
+        for player in (1, 2):
+            assert bb.make_move(state, cell, player) == bb.encode(make_move(board, cell, player))
+
+def test_player_to_move():
+    """Test the mover is derived from the piece count."""
+    assert bb.player_to_move(bb.EMPTY_STATE) == 1
+    assert bb.player_to_move(bb.encode((1, 0, 0, 0, 0, 0, 0, 0, 0))) == 2
+    assert bb.player_to_move(bb.encode((1, 2, 0, 0, 0, 0, 0, 0, 0))) == 1
@@ -0,0 +1,94 @@
+#!/usr/bin/env python3
+"""
+Tests for the content-addressed result cache.
+"""
+
+import os
+import numpy as np
+import pytest
+from tictactoe.cache import ResultCache, Uncacheable, cache_key
+from tictactoe.policies import DensePolicy, convert_to_fixed_length
+from tictactoe.simulation import run_simulation
+from tictactoe.solver import perfect_policy
+from tictactoe.training import train_q_learning
+
+calls = []
+
+def traced(n, seed=0):
+    calls.append(n)
+    return np.arange(n) + (seed or 0)
+
+def test_hit_and_miss(tmp_path):
+    """Test a repeated call is served from disk and new inputs are computed."""
+    calls.clear()
+    cache = ResultCache(tmp_path)
+    first = cache.call(traced, 5)
+    np.testing.assert_array_equal(cache.call(traced, 5, seed=0), first)
+    cache.call(traced, 5, seed=1)
+    assert calls == [5, 5]
+    assert (cache.hits, cache.misses) == (1, 2)
+    assert ResultCache(tmp_path).call(traced, 5).tolist() == first.tolist()
+    assert calls == [5, 5], "A fresh cache object reads the same directory"
+
+def test_unseeded_calls_bypass_the_cache(tmp_path):
+    """Test calls with seed=None always run and store nothing."""
+    calls.clear()
+    cache = ResultCache(tmp_path)
+    cache.call(traced, 3, seed=None)
+    cache.call(traced, 3, seed=None)
+    assert calls == [3, 3]
+    assert cache.entries() == []
+
+def test_keys_follow_policy_contents():
+    """Test keys ignore dict order and representation but not probabilities."""
+    fixed = convert_to_fixed_length(perfect_policy())
+    key = cache_key(run_simulation, fixed, {}, 100, rng=0)
+    reordered = dict(reversed(list(fixed.items())))
+    assert cache_key(run_simulation, reordered, {}, 100, rng=0) == key
+    assert cache_key(run_simulation, DensePolicy.from_dict(fixed, np.float64), {}, 100, rng=0) == key
+
+    changed = dict(fixed)
+    board = next(iter(changed))
+    changed[board] = np.eye(9)[4]
+    assert cache_key(run_simulation, changed, {}, 100, rng=0) != key
+    assert cache_key(run_simulation, fixed, {}, 101, rng=0) != key
+    assert cache_key(run_simulation, fixed, {}, 100, rng=1) != key
+    with pytest.raises(Uncacheable):
+        cache_key(run_simulation, fixed, {}, 100, rng=np.random.default_rng(0))
+
+def test_cached_training_matches(tmp_path):
+    """Test a cached training run returns the policy the first run learned."""
+    cache = ResultCache(tmp_path)
+    fixed = cache.call(convert_to_fixed_length, perfect_policy())
+    first = cache.call(train_q_learning, fixed.copy(), episodes=200, rng=0)
+    second = cache.call(train_q_learning, fixed.copy(), episodes=200, rng=0)
+    assert cache.hits == 1
+    assert first.keys() == second.keys()
+    assert all(np.array_equal(first[board], second[board]) for board in first)
+
+def test_lru_eviction_and_clear(tmp_path):
+    """Test the least recently used entries go first once over the size limit."""
+    cache = ResultCache(tmp_path)
+    for n in range(3):
+        cache.call(traced, 1000, seed=n)
+    entries = cache.entries()
+    for age, entry in enumerate(entries):
+        os.utime(entry["path"], (1000 + age, 1000 + age))
+    cache.call(traced, 1000, seed=0)  # a hit makes seed=0 the most recent
+
+    size = entries[0]["bytes"]
+    assert cache.evict(2 * size) == 1
+    assert not os.path.exists(entries[1]["path"]), "seed=1 was least recently used"
+    assert cache.size() == 2 * size
+    assert cache.clear() == 2
+    assert cache.entries() == []
+
+def test_cli_info_and_clear(tmp_path, capsys):
+    """Test ``tictactoe cache`` lists entries and clears them."""
+    from tictactoe.cli import main
+    ResultCache(tmp_path).call(traced, 10)
+    main(["cache", "info", "--dir", str(tmp_path)])
+    assert "1 entries" in capsys.readouterr().out
+    main(["cache", "clear", "--dir", str(tmp_path)])
+    assert "Removed 1 entries" in capsys.readouterr().out
+    assert ResultCache(tmp_path).entries() == []
@@ -0,0 +1,65 @@
+#!/usr/bin/env python3
+"""
+Tests for the tictactoe command-line interface.
+"""
+
+import json
+import pickle
+import pytest
+from tictactoe.cli import load_results, main
+from tictactoe.policies import DensePolicy
+
+def test_solve_and_train(tmp_path):
+    """Test solving, then training from the saved policy, in both file formats."""
+    assert main(["-q", "solve", "-o", str(tmp_path / "perfect.p"),
+                 "--random-output", str(tmp_path / "random.npz")]) == 0
+    with open(tmp_path / "perfect.p", "rb") as f:
+        assert len(pickle.load(f)) == 4520
+    assert len(DensePolicy.load(tmp_path / "random.npz")) == 4520
+
+    out = tmp_path / "trained.npz"
+    assert main(["-q", "train", "--policy", str(tmp_path / "random.npz"),
+                 "--episodes", "2048", "--seed", "0", "-o", str(out)]) == 0
+    assert len(DensePolicy.load(out)) == 4520
+
+@pytest.mark.parametrize("extra", [
+    ["--resume", "--checkpoint", "missing.npz"],
+    ["--actors", "2", "--checkpoint", "run.npz", "--checkpoint-every", "100"],
+])
+def test_train_rejects_bad_options(tmp_path, capsys, extra):
+    """Test a missing checkpoint and checkpointing with actors are usage errors."""
+    with pytest.raises(SystemExit) as error:
+        main(["-q", "train", "-o", str(tmp_path / "out.p")] + extra)
+    assert error.value.code == 2
+    assert "--resume" in capsys.readouterr().err
+
+def test_simulate_json_is_seeded(tmp_path, capsys):
+    """Test simulate output is reproducible and readable by the plot loader."""
+    paths = [tmp_path / "a.json", tmp_path / "b.json"]
+    for path in paths:
+        main(["-q", "simulate", "random", "perfect", "--games", "3000", "--seed", "5",
+              "--exact", "--format", "json", "-o", str(path)])
+    first, second = (json.loads(path.read_text()) for path in paths)
+    assert first == second
+    assert sum(first["results"]["random vs perfect"]) == 3000
+    assert first["exact"]["random vs perfect"][1] == 0.0, "Random O never beats perfect X"
+
+    main(["-q", "simulate", "random", "random", "--games", "100", "--name", "R vs R"])
+    assert "R vs R: 100 games" in capsys.readouterr().out
+
+def test_tournament_json(tmp_path):
+    """Test tournament JSON output and its expansion into named matchups."""
+    path = tmp_path / "t.json"
+    main(["-q", "tournament", "random", "best=perfect", "--games", "500", "--workers", "1",
+          "--no-self-play", "--format", "json", "-o", str(path)])
+    data = json.loads(path.read_text())
+    assert data["names"] == ["random", "best"]
+    assert set(load_results([path])) == {"random vs best", "best vs random"}
+
+def test_plot(tmp_path):
+    """Test plotting saved results."""
+    pytest.importorskip("matplotlib")
+    path = tmp_path / "r.json"
+    path.write_text(json.dumps({"results": {"A vs B": [10, 20, 30]}}))
+    main(["-q", "plot", str(path), "-o", str(tmp_path / "plot.png")])
+    assert (tmp_path / "plot.png").exists()
@@ -0,0 +1,50 @@
+#!/usr/bin/env python3
+"""
+Tests for the cached CompiledPolicy wrapper.
+"""
+
+import numpy as np
+from tictactoe.mcts import MCTSAgent
+from tictactoe.policies import CompiledPolicy, compile_policy, get_valid_move_probs
+from tictactoe.simulation import play_game
+from tictactoe.training import train_q_learning
+
+def test_matches_uncompiled_play(random_policy):
+    """Test compiled sampling reproduces np.random.choice draw for draw."""
+    policy = random_policy
+    compiled = CompiledPolicy(policy)
+    np.random.seed(3)
+    plain = [play_game(policy, policy) for _ in range(300)]
+    np.random.seed(3)
+    cached = [play_game(compiled, compiled) for _ in range(300)]
+    assert plain == cached
+
+def test_probs_match_and_invalidate(random_policy):
+    """Test cached probabilities track writes to the wrapped policy."""
+    compiled = CompiledPolicy(random_policy)
+    board = (1, 0, 2, 0, 1, 0, 0, 0, 0)
+    assert np.allclose(get_valid_move_probs(board, compiled), 1 / 6)
+
+    row = np.zeros(9)
+    row[8] = 1.0
+    compiled[board] = row
+    assert np.allclose(compiled.move_probs(board), [0, 0, 0, 0, 0, 1])
+    assert compiled.sample(board, np.random.default_rng(0)) == 8
+
+def test_training_invalidates():
+    """Test rows rewritten by training are resampled from the new values."""
+    compiled = CompiledPolicy({})
+    compiled.precompile()
+    empty = (0,) * 9
+    before = compiled.move_probs(empty).copy()
+    train_q_learning(compiled, episodes=2000, rng=0)
+    assert empty in compiled
+    assert not np.allclose(compiled.move_probs(empty), before)
+    assert np.allclose(compiled.move_probs(empty), compiled[empty])
+
+def test_compile_policy_skips_agents():
+    """Test search agents are not wrapped, since their answers change per call."""
+    agent = MCTSAgent(iterations=10)
+    assert compile_policy(agent) is agent
+    compiled = compile_policy({})
+    assert isinstance(compiled, CompiledPolicy) and compile_policy(compiled) is compiled
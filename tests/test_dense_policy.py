@@ -0,0 +1,60 @@
+#!/usr/bin/env python3
+"""
+Tests for the array-backed DensePolicy and its memory-mapped storage.
+"""
+
+import numpy as np
+import pytest
+from tictactoe.policies import DensePolicy, load_policy, policy_table
+from tictactoe.training import train_q_learning
+
+def test_round_trip(perfect_policy):
+    """Test dict -> dense -> dict keeps every board, in order, with exact float64 values."""
+    policy = perfect_policy
+    dense = DensePolicy.from_dict(policy, dtype=np.float64)
+    assert dense.probs.shape == (len(policy), 9)
+    restored = dense.to_dict()
+    assert list(restored) == list(policy), "Key order should survive the round trip"
+    assert all(np.array_equal(restored[b], policy[b]) for b in policy)
+
+def test_mapping_behaviour(perfect_policy):
+    """Test lookups, membership and in-place updates behave like a dict."""
+    dense = DensePolicy.from_dict(perfect_policy)
+    empty = (0,) * 9
+    assert empty in dense and (1, 1, 1, 2, 2, 0, 0, 0, 0) not in dense
+    dense[empty] = np.full(9, 1 / 9)
+    assert np.allclose(dense[empty], 1 / 9)
+    with pytest.raises(KeyError):
+        dense[(1, 1, 1, 2, 2, 0, 0, 0, 0)] = np.zeros(9)
+
+def test_memory_mapped_load(tmp_path, perfect_policy):
+    """Test saved policies reopen memory-mapped and give the same table."""
+    dense = DensePolicy.from_dict(perfect_policy)
+    path = tmp_path / "perfect.npz"
+    dense.save(path)
+    loaded = load_policy(path)
+    assert isinstance(loaded.probs, np.memmap), "Probabilities should be memory-mapped"
+    assert np.array_equal(loaded.probs, dense.probs)
+    assert np.array_equal(policy_table(loaded), policy_table(dense))
+    copy = loaded.copy()
+    copy[(0,) * 9] = np.zeros(9)
+    assert not np.array_equal(copy[(0,) * 9], loaded[(0,) * 9]), "Copies should be independent"
+
+def test_train_memory_mapped_policy(tmp_path, perfect_policy):
+    """Test training a policy loaded from .npz leaves the file alone and returns a trained copy."""
+    path = tmp_path / "perfect.npz"
+    DensePolicy.from_dict(perfect_policy).save(path)
+    loaded = load_policy(path)
+    trained = train_q_learning(loaded, episodes=200, rng=0)
+    assert isinstance(trained, DensePolicy) and trained is not loaded
+    assert trained.probs.flags.writeable
+    assert not np.array_equal(trained.probs, loaded.probs), "Training should change some rows"
+    assert np.array_equal(load_policy(path).probs, loaded.probs), "The file should be unchanged"
+
+def test_train_grows_partial_policy():
+    """Test training a DensePolicy missing visited boards returns one that holds them."""
+    partial = DensePolicy(np.arange(10, dtype=np.int32), np.full((10, 9), 1 / 9))
+    trained = train_q_learning(partial, episodes=200, rng=0)
+    assert len(partial) == 10, "The original policy is left unchanged"
+    assert len(trained) > 10
+    assert np.allclose(trained.probs.sum(axis=1), 1)
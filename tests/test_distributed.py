@@ -0,0 +1,33 @@
+#!/usr/bin/env python3
+"""
+Tests for parallel actor-learner training.
+"""
+
+import numpy as np
+from tictactoe.distributed import episodes_to_records, records_to_episodes, train_parallel
+from tictactoe.policies import policy_table
+from tictactoe.training import play_episodes
+
+def test_record_round_trip():
+    """Test trajectories survive the compact record encoding."""
+    cdf = np.cumsum(policy_table({}), axis=1)
+    states, actions, outcomes = play_episodes(cdf, 500, np.random.default_rng(0))
+    records = episodes_to_records(states, actions, outcomes)
+    assert records.shape == (500, 10)
+    back_states, back_actions, back_outcomes = records_to_episodes(records)
+    played = states >= 0
+    assert np.array_equal(back_states, states)
+    assert np.array_equal(back_actions[played], actions[played])
+    assert np.array_equal(back_outcomes, outcomes)
+
+def test_processes_match_in_process_run():
+    """Test actor processes give the same policy as the in-process run, every time."""
+    runs = [train_parallel({}, 5000, actors=2, round_episodes=512, seed=3),
+            train_parallel({}, 5000, actors=2, round_episodes=512, seed=3),
+            train_parallel({}, 5000, actors=2, round_episodes=512, seed=3, processes=False)]
+    tables = [policy_table(run) for run in runs]
+    assert np.array_equal(tables[0], tables[1])
+    assert np.array_equal(tables[0], tables[2])
+    other = policy_table(train_parallel({}, 5000, actors=3, round_episodes=512, seed=3,
+                                        processes=False))
+    assert not np.array_equal(tables[0], other), "Actor count changes the streams"
@@ -0,0 +1,33 @@
+#!/usr/bin/env python3
+"""
+Tests for exact matchup evaluation.
+"""
+
+import numpy as np
+import pytest
+from tictactoe.board import LEGAL
+from tictactoe.evaluation import outcome_probabilities
+
+def test_random_vs_random():
+    """Test uniform play reproduces the known exact outcome distribution."""
+    # An empty policy falls back to uniform moves on every board
+    probs = outcome_probabilities({}, {})
+    assert np.isclose(probs.sum(), 1.0), "Probabilities should sum to one"
+    assert np.allclose(probs, [0.12698413, 0.58492063, 0.28809524], atol=1e-8)
+
+def test_deterministic_policies():
+    """Test deterministic policies give a single certain outcome."""
+    # Both players take the lowest empty cell: O ends up on 0, 2, 4, 6
+    # and wins on the anti-diagonal.
+    table = np.zeros((3 ** 9, 9))
+    has_move = LEGAL.any(axis=1)
+    table[has_move, LEGAL.argmax(axis=1)[has_move]] = 1.0
+    probs = outcome_probabilities(table, table)
+    assert np.allclose(probs, [0, 1, 0]), f"Expected a certain O win, got {probs}"
+
+def test_variable_length_policy_is_rejected():
+    """Test a policy not yet converted to fixed length gets a clear error."""
+    # Variable-length rows list probabilities for the empty cells only
+    policy = {(0,) * 9: np.full(9, 1 / 9), (1,) + (0,) * 8: np.full(8, 1 / 8)}
+    with pytest.raises(ValueError, match="convert_to_fixed_length"):
+        outcome_probabilities(policy, {})
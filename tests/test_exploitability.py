@@ -0,0 +1,38 @@
+#!/usr/bin/env python3
+"""
+Tests for best responses and exploitability.
+"""
+
+import numpy as np
+from tictactoe.cli import load_policy_spec
+from tictactoe.evaluation import outcome_probabilities
+from tictactoe.exploitability import best_response, exploitability, reachable_layers
+from tictactoe.policies import policy_table
+
+def test_reachable_tree():
+    """Test the layers hold the 4520 reachable non-terminal boards."""
+    layers = reachable_layers()
+    assert len(layers) == 9
+    assert sum(len(layer) for layer in layers) == 4520
+
+def test_perfect_policy_is_unexploitable():
+    """Test the solved policy concedes nothing from either seat."""
+    assert exploitability(load_policy_spec("perfect")) == 0.0
+
+def test_best_response_value_matches_play():
+    """Test the best-response value equals the exact outcome of playing it."""
+    for seat in (1, 2):
+        response = best_response({}, seat)
+        if seat == 1:
+            draw, o_win, x_win = outcome_probabilities(response.policy, {})
+            assert np.isclose(response.value, o_win - x_win)
+        else:
+            draw, o_win, x_win = outcome_probabilities({}, response.policy)
+            assert np.isclose(response.value, x_win - o_win)
+        assert all(probs.sum() == 1 for probs in response.policy.values()), "Responses are one-hot"
+
+def test_random_policy_is_exploitable():
+    """Test the uniform policy's score and that dict and table inputs agree."""
+    value = exploitability({})
+    assert 0.9 < value < 1.0
+    assert exploitability(policy_table({})) == value
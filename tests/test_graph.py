@@ -0,0 +1,56 @@
+#!/usr/bin/env python3
+"""
+Tests for the state graph and the value/policy iteration solvers.
+"""
+
+import numpy as np
+from tictactoe.board import EMPTY_STATE, TERMINAL, encode
+from tictactoe.graph import (clear_cache, evaluate_policy, greedy_table, optimal_policy,
+                             policy_iteration, state_graph, value_iteration)
+from tictactoe.policies import convert_to_fixed_length, policy_table
+from tictactoe.solver import perfect_policy
+
+def test_graph_structure():
+    """Test ids, CSR edges and terminal flags of the reachable graph."""
+    graph = state_graph()
+    assert len(graph.states) == 5478, "Tic-Tac-Toe has 5478 reachable positions"
+    assert graph.states[0] == EMPTY_STATE and graph.index[EMPTY_STATE] == 0
+    assert graph.terminal.sum() == 958
+    assert np.array_equal(graph.terminal, TERMINAL[graph.states])
+    children = np.diff(graph.offsets)
+    assert (children[graph.terminal] == 0).all() and (children[~graph.terminal] > 0).all()
+    assert (graph.ply[graph.targets] == graph.ply[graph.sources] + 1).all()
+    assert state_graph() is graph, "The graph should be built once"
+    clear_cache()
+    rebuilt = state_graph()
+    assert rebuilt is not graph and np.array_equal(rebuilt.states, graph.states)
+
+def test_value_and_policy_iteration_match_solver():
+    """Test both solvers find the game's value and the solver's best moves."""
+    graph = state_graph()
+    ongoing = graph.states[~graph.terminal]
+    expected = policy_table(convert_to_fixed_length(perfect_policy()))[ongoing]
+
+    values, sweeps = value_iteration(gamma=0.9)
+    assert sweeps < 10 and values[0] == 0.0, "Perfect play draws"
+    assert np.allclose(greedy_table(values, 0.9)[ongoing], expected)
+
+    _, table, iterations = policy_iteration(gamma=0.9)
+    assert iterations < 10
+    assert np.allclose(table[ongoing], expected)
+    assert len(optimal_policy("policy")) == 4520
+
+def test_evaluate_policy():
+    """Test evaluating the uniform policy reproduces its exact first-player edge."""
+    values, _ = evaluate_policy({})
+    # O wins 58.49% and X 28.81% of random games (see test_evaluation).
+    assert np.isclose(values[0], 0.58492063 - 0.28809524)
+
+def test_discounting_starts_after_an_immediate_win():
+    """Test an immediate win is worth 1 and a forced win k plies away gamma ** (k - 1)."""
+    graph = state_graph()
+    values, _ = value_iteration(gamma=0.9)
+    # O to move completes the top row.
+    assert values[graph.index[encode((1, 1, 0, 2, 2, 0, 0, 0, 0))]] == 1.0
+    # X answered O's corner with an adjacent edge; O forces a win in five plies.
+    assert np.isclose(values[graph.index[encode((1, 2, 0, 0, 0, 0, 0, 0, 0))]], 0.9 ** 4)
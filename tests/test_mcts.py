@@ -0,0 +1,74 @@
+#!/usr/bin/env python3
+"""
+Tests for the Monte Carlo Tree Search agent.
+"""
+
+import numpy as np
+from tictactoe.mcts import MCTSAgent, batch_rollouts
+from tictactoe.mnk import MNKBoard, MNKGame, random_playout
+from tictactoe.simulation import play_game
+
+def test_batch_rollouts_match_sequential_playouts():
+    """Test vectorized rollouts give the same outcome rates as one-by-one playouts."""
+    game = MNKGame(4, 4, 3)
+    rng = np.random.default_rng(0)
+    batched = np.bincount(batch_rollouts(game, [0] * 16, 1, 20000, rng), minlength=3) / 20000
+    single = np.zeros(3)
+    for _ in range(4000):
+        single[random_playout(game.new_board(), rng)] += 1
+    assert np.allclose(batched, single / 4000, atol=0.03), f"{batched} vs {single / 4000}"
+
+def test_finds_tactical_moves():
+    """Test the agent takes a win and blocks a threat."""
+    agent = MCTSAgent(iterations=300, rng=0)
+    assert agent.best_move((1, 1, 0, 2, 2, 0, 0, 0, 0)) == 2, "O should complete the top row"
+    assert agent.best_move((1, 2, 0, 0, 1, 0, 0, 0, 0)) == 8, "X should block the diagonal"
+
+def test_tree_reuse():
+    """Test the subtree below the reply is kept and detached from the old tree."""
+    agent = MCTSAgent(iterations=200, rng=0)
+    agent.search((0,) * 9)
+    old_root, nodes = agent.root, len(agent.pool)
+    visits = agent.pool.visits[old_root]
+    agent.search((1, 2, 0, 0, 0, 0, 0, 0, 0))
+    assert agent._root_cells == (1, 2, 0, 0, 0, 0, 0, 0, 0)
+    assert len(agent.pool) >= nodes, "The tree should have been reused, not rebuilt"
+    assert agent.root != old_root and agent.pool.parent[agent.root] == -1
+    assert agent.pool.move[agent.root] == 1, "The root should be the reply, X in cell 1"
+    assert agent.pool.visits[old_root] == visits, "Old ancestors should not be updated"
+
+def test_tree_reuse_across_several_plies():
+    """Test deeper gaps find a node for the exact position or start afresh."""
+    agent = MCTSAgent(iterations=2000, rng=0)
+    agent.search((0,) * 9)
+    cells = (1, 0, 0, 0, 2, 0, 0, 1, 2)
+    node = agent._descend(cells)
+    assert node is not None, "2000 iterations should reach this four-ply position"
+    path, pool = [], agent.pool
+    while node != agent.root:
+        path.append(int(pool.move[node]))
+        node = pool.parent[node]
+    path.reverse()
+    assert sorted(path) == [0, 4, 7, 8]
+    assert [cells[move] for move in path] == [1, 2, 1, 2], "Turns should alternate from O"
+
+    assert agent._descend((1, 1, 1, 0, 0, 0, 0, 0, 0)) is None, "O cannot play three in a row"
+    agent.search(cells)
+    agent.search((2, 1, 0, 0, 0, 0, 0, 0, 1))
+    assert agent.root == 0, "A position that does not extend the root starts a fresh tree"
+
+def test_plays_through_policy_interface():
+    """Test the agent drops into play_game like a Policy dict."""
+    agent = MCTSAgent(iterations=100, rng=0)
+    assert (0,) * 9 in agent and (1, 1, 1, 2, 2, 0, 0, 0, 0) not in agent
+    np.random.seed(0)
+    # Uniform X: an empty policy falls back to random moves
+    outcomes = [play_game(agent, {}) for _ in range(10)]
+    assert outcomes.count(2) == 0, "MCTS as O should not lose to a random player"
+
+def test_time_budget():
+    """Test a time limit caps the search."""
+    game = MNKGame(5, 5, 4)
+    agent = MCTSAgent(game, iterations=10 ** 9, time_limit=0.05, rng=0)
+    board = MNKBoard(game)
+    assert agent.search(board.to_tuple()).sum() > 0
@@ -0,0 +1,55 @@
+#!/usr/bin/env python3
+"""
+Tests for the generalized m,n,k board engine.
+"""
+
+import numpy as np
+from tictactoe.game import state_of_board, get_empty_cells, make_move
+from tictactoe.mnk import MNKBoard, MNKGame, random_playout
+
+def test_matches_tictactoe_rules():
+    """Test incremental results agree with state_of_board over random 3x3 games."""
+    rng = np.random.default_rng(0)
+    for _ in range(500):
+        board = MNKBoard()
+        reference = (0,) * 9
+        while board.result == -1:
+            assert sorted(board.legal) == get_empty_cells(reference)
+            cell = int(rng.choice(sorted(board.legal)))
+            reference = make_move(reference, cell, board.player)
+            board.play(cell)
+            assert board.result == state_of_board(reference)
+            assert MNKBoard.from_cells(reference).result == board.result
+
+def test_undo_restores_position():
+    """Test undo reverses play exactly."""
+    board = MNKBoard(MNKGame(4, 4, 3))
+    for cell in (5, 0, 6, 1):
+        board.play(cell)
+    before = board.copy()
+    assert board.play(7) == 1, "O should complete 5-6-7"
+    board.undo()
+    assert board.to_tuple() == before.to_tuple() and board.legal == before.legal
+    assert board.player == before.player and board.result == -1
+
+def test_larger_board_lines():
+    """Test wins on a 5x5 board with k=4, including diagonals near the edge."""
+    game = MNKGame(5, 5, 4)
+    assert len(game.windows) == 28, "5x5 with k=4 has 28 winning windows"
+    # O plays the anti-diagonal 4, 8, 12, 16 while X plays the left column
+    board = game.new_board()
+    for o_cell, x_cell in zip((4, 8, 12), (0, 5, 10)):
+        board.play(o_cell)
+        board.play(x_cell)
+    assert board.result == -1
+    assert board.play(16) == 1
+
+def test_random_playout_finishes():
+    """Test random playouts always end in a legal terminal position."""
+    game = MNKGame(5, 5, 4)
+    rng = np.random.default_rng(1)
+    for _ in range(200):
+        board = game.new_board()
+        result = random_playout(board, rng)
+        assert result in (0, 1, 2)
+        assert MNKBoard.from_cells(board.to_tuple(), game).result == result
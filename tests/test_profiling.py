@@ -0,0 +1,55 @@
+#!/usr/bin/env python3
+"""
+Tests for the profiling instrumentation.
+"""
+
+import json
+import os
+import subprocess
+import sys
+from pathlib import Path
+from tictactoe import game, profiling
+from tictactoe.simulation import simulate_games
+
+ROOT = Path(__file__).resolve().parent.parent
+
+def test_disabled_is_free():
+    """Test hot functions are left unwrapped and nothing is recorded by default."""
+    assert not profiling.enabled()
+    assert "__wrapped__" not in vars(game.state_of_board)
+    with profiling.stage("idle"):
+        profiling.count("games", 10)
+    assert profiling.report() == {"stages": {}, "functions": {}, "counters": {}}
+
+def test_stage_counters_and_rates():
+    """Test counts are credited to the active stages and turned into rates."""
+    profiling.enable()
+    try:
+        with profiling.stage("outer"):
+            with profiling.stage("simulate"):
+                simulate_games({}, {}, 1000, rng=0)
+        report = profiling.report()
+    finally:
+        profiling.disable()
+        profiling.reset()
+    assert report["counters"]["games"] == 1000
+    assert report["counters"]["moves"] >= 5000, "Every game lasts at least 5 moves"
+    simulate = report["stages"]["simulate"]
+    assert simulate["counters"] == report["stages"]["outer"]["counters"]
+    assert simulate["rates"]["games/sec"] > 0
+
+def test_env_var_instruments_hot_functions(tmp_path):
+    """Test TICTACTOE_PROFILE wraps game functions and the CLI writes JSON and pstats."""
+    out, prof = tmp_path / "report.json", tmp_path / "run.prof"
+    code = ("from tictactoe.cli import main\n"
+            "from tictactoe.game import state_of_board\n"
+            "state_of_board((0,) * 9)\n"
+            f"main(['-q', '--profile', {str(out)!r}, '--cprofile', {str(prof)!r},"
+            " 'train', '--episodes', '100', '-o', " + repr(str(tmp_path / "t.p")) + "])")
+    env = dict(os.environ, **{profiling.ENV_VAR: "1"})
+    subprocess.run([sys.executable, "-c", code], cwd=ROOT, env=env, check=True)
+    report = json.loads(out.read_text())
+    assert report["functions"]["tictactoe.game.state_of_board"]["calls"] == 1
+    assert report["stages"]["train"]["counters"]["episodes"] == 100
+    assert report["counters"]["states_visited"] > 0
+    assert prof.stat().st_size > 0
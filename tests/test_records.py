@@ -0,0 +1,56 @@
+#!/usr/bin/env python3
+"""
+Tests for binary game records and their lazy readers.
+"""
+
+import numpy as np
+from tictactoe.game import make_move, state_of_board
+from tictactoe.records import (GameRecordWriter, count_games, iter_games,
+                               iter_record_chunks, iter_transitions)
+from tictactoe.simulation import play_game, simulate_games
+
+def test_round_trip(tmp_path):
+    """Test written games read back unchanged, across appends."""
+    path = tmp_path / "games.ttt"
+    with GameRecordWriter(path) as writer:
+        writer.write([4, 0, 8, 2, 1, 6, 3], 0)  # outcomes are stored as given
+        writer.write([0, 3, 1, 4, 2], 1)
+    with GameRecordWriter(path) as writer:
+        writer.write([4, 0, 8, 2, 6, 1], 2)
+    games = list(iter_games(path))
+    assert count_games(path) == 3 and path.stat().st_size == 4 + 3 * 10
+    assert games[1].moves == (0, 3, 1, 4, 2) and games[1].players == (1, 2, 1, 2, 1)
+    assert [game.outcome for game in games] == [0, 1, 2]
+
+def test_simulated_games_replay(tmp_path):
+    """Test logged batch games replay to the logged outcome and match the counts."""
+    path = tmp_path / "games.ttt"
+    with GameRecordWriter(path, buffer_games=100) as writer:
+        results = simulate_games({}, {}, 5000, rng=0, chunk_size=1024, recorder=writer)
+    logged = [0, 0, 0]
+    for game in iter_games(path, chunk_games=777):
+        board = (0,) * 9
+        for move, player in zip(game.moves, game.players):
+            board = make_move(board, move, player)
+        assert state_of_board(board) == game.outcome
+        logged[game.outcome] += 1
+    assert logged == results
+    assert sum(len(chunk) for chunk in iter_record_chunks(path, 1000)) == 5000
+
+def test_transitions(tmp_path):
+    """Test (state, action, return) tuples follow the game from each mover's view."""
+    path = tmp_path / "games.ttt"
+    with GameRecordWriter(path) as writer:
+        writer.write([0, 3, 1, 4, 2], 1)
+    transitions = list(iter_transitions(path, gamma=0.5))
+    assert transitions[0] == ((0,) * 9, 0, 0.5 ** 4)
+    assert transitions[1][2] == -(0.5 ** 3), "X lost"
+    assert transitions[-1] == ((1, 1, 0, 2, 2, 0, 0, 0, 0), 2, 1.0)
+
+def test_play_game_recorder(tmp_path):
+    """Test single games can be logged too."""
+    path = tmp_path / "games.ttt"
+    np.random.seed(0)
+    with GameRecordWriter(path) as writer:
+        outcomes = [play_game({}, {}, recorder=writer) for _ in range(20)]
+    assert [game.outcome for game in iter_games(path)] == outcomes
@@ -0,0 +1,65 @@
+#!/usr/bin/env python3
+"""
+Tests for the asynchronous move server.
+"""
+
+import asyncio
+import json
+import numpy as np
+from tictactoe.cli import load_policy_spec
+from tictactoe.policies import get_valid_move_probs
+from tictactoe.server import PolicyServer, run_load
+
+async def query(port, lines):
+    """Send raw request lines on one connection and return the parsed responses."""
+    reader, writer = await asyncio.open_connection("127.0.0.1", port)
+    writer.write(b"".join(line.encode() + b"\n" for line in lines))
+    await writer.drain()
+    responses = [json.loads(await reader.readline()) for _ in lines]
+    writer.close()
+    return responses
+
+def test_answers_match_policy():
+    """Test pipelined answers come back in order and match get_valid_move_probs."""
+    policy = load_policy_spec("perfect")
+    board = (1, 2, 0, 0, 1, 0, 0, 0, 0)
+
+    async def scenario():
+        server = PolicyServer(policy, max_delay=0.01)
+        _, port = await server.start()
+        try:
+            return await query(port, [
+                json.dumps({"id": 1, "board": list(board)}),
+                json.dumps({"id": 2, "board": list(board), "op": "move"}),
+                json.dumps({"id": 3, "board": [1, 1, 1, 2, 2, 0, 0, 0, 0]}),
+                "not json",
+                json.dumps({"id": 4, "op": "stats"}),
+            ])
+        finally:
+            await server.close()
+
+    probs, move, finished, invalid, stats = asyncio.run(scenario())
+    assert probs["id"] == 1
+    assert np.allclose(probs["probs"], get_valid_move_probs(board, policy))
+    assert probs["moves"] == [2, 3, 5, 6, 7, 8]
+    assert policy[board][move["move"]] > 0, "Sampled moves should be ones the policy plays"
+    assert finished["error"] == "game is over"
+    assert "error" in invalid
+    assert stats["id"] == 4
+
+def test_load_generator_batches():
+    """Test concurrent clients are micro-batched and latency is reported."""
+    async def scenario():
+        server = PolicyServer({}, max_delay=0.002)
+        _, port = await server.start()
+        try:
+            return await run_load("127.0.0.1", port, requests=2000, concurrency=16,
+                                  pipeline=4, seed=0)
+        finally:
+            await server.close()
+
+    result = asyncio.run(scenario())
+    assert result["requests"] == 2000 and result["errors"] == 0
+    assert result["server"]["requests"] == 2000
+    assert result["server"]["mean_batch"] > 1, "Concurrent requests should share batches"
+    assert 0 < result["p50_ms"] <= result["p99_ms"]
@@ -0,0 +1,63 @@
+#!/usr/bin/env python3
+"""
+Tests for single-game and batched simulation.
+"""
+
+import numpy as np
+from tictactoe.policies import policy_table
+from tictactoe.simulation import play_game, simulate_adaptive, simulate_games
+
+def test_policy_table_rows_normalized(perfect_policy):
+    """Test dense table rows sum to one on ongoing boards and zero on terminal ones."""
+    perfect = perfect_policy
+    table = policy_table(perfect)
+    assert table.shape == (3 ** 9, 9)
+    assert np.allclose(table[0], perfect[(0,) * 9]), "Opening row should match the policy"
+    totals = table.sum(axis=1)
+    assert np.all((np.abs(totals - 1) < 1e-12) | (totals == 0))
+
+def test_batched_counts(random_policy):
+    """Test batched simulation returns the requested number of games."""
+    random = random_policy
+    results = simulate_games(random, random, 10000, rng=0)
+    assert sum(results) == 10000
+    assert results == simulate_games(random, random, 10000, rng=0), "Seeded runs should repeat"
+    # Random vs random: O wins roughly 58.5%, X 28.8%, draws 12.7%
+    assert abs(results[1] / 10000 - 0.585) < 0.03
+
+def test_batched_matches_single_game(perfect_policy, random_policy):
+    """Test batched and single-game simulators agree statistically."""
+    perfect, random = perfect_policy, random_policy
+    np.random.seed(1)
+    single = [0, 0, 0]
+    for _ in range(2000):
+        single[play_game(random, perfect)] += 1
+    batched = simulate_games(random, perfect, 2000, rng=1)
+    for a, b in zip(single, batched):
+        assert abs(a - b) / 2000 < 0.05, f"{single} vs {batched}"
+
+def test_adaptive_stops_early(perfect_policy, random_policy):
+    """Test adaptive simulation stops on the sequential test or on precision."""
+    perfect, random = perfect_policy, random_policy
+    lopsided = simulate_adaptive(random, perfect, max_games=100000, rng=0)
+    assert lopsided.reason == "sequential test" and lopsided.decision == -1
+    assert lopsided.games <= 200 and sum(lopsided.counts) == lopsided.games
+    assert sum(lopsided.swapped) == lopsided.games, "The test plays both seat assignments"
+
+    even = simulate_adaptive(random, random, precision=0.02, sequential=False, rng=0)
+    assert even.reason == "precision" and even.decision == 0
+    assert 1000 < even.games < 5000, "About 2400 games give a 2% half-width at p=0.58"
+    assert even == simulate_adaptive(random, random, precision=0.02, sequential=False, rng=0)
+
+    assert even.swapped == [0, 0, 0]
+
+    capped = simulate_adaptive(random, random, precision=0.001, max_games=250, batch_size=100,
+                               sequential=False, rng=0)
+    assert capped.games == 250 and capped.reason == "max games"
+
+def test_adaptive_identical_policies_are_even():
+    """Test the first-move advantage is not mistaken for a stronger policy."""
+    decisions = [simulate_adaptive({}, {}, precision=0.001, rng=seed).decision for seed in range(20)]
+    assert decisions.count(0) >= 17, f"Identical policies were called different: {decisions}"
+    same = simulate_adaptive({}, {}, rng=0)
+    assert same.reason == "sequential test" and same.decision == 0
@@ -0,0 +1,40 @@
+#!/usr/bin/env python3
+"""
+Tests for the negamax solver and the optimal policy it emits.
+"""
+
+import numpy as np
+from tictactoe import solver
+from tictactoe.evaluation import outcome_probabilities
+from tictactoe.policies import convert_to_fixed_length, create_random_policy
+
+def test_game_value():
+    """Test the empty board is a draw that lasts all nine plies."""
+    empty = (0,) * 9
+    assert solver.position_value(empty) == 0, "Tic-Tac-Toe is a draw"
+    assert solver.depth_to_result(empty) == 9
+    solver.clear_cache()
+    assert solver.position_value(empty) == 0, "A cold search should agree"
+
+def test_forced_win_depth():
+    """Test an immediate win and a fork are scored by their depth."""
+    # O to move completes the top row
+    board = (1, 1, 0, 2, 2, 0, 0, 0, 0)
+    assert solver.position_value(board) == 1
+    assert solver.depth_to_result(board) == 1
+    scores = solver.move_scores(board)
+    assert max(scores, key=scores.get) == 2, "O should take the winning cell"
+    # X must block 8, then O forks with 6 and wins on the fourth ply
+    board = (1, 2, 0, 0, 1, 0, 0, 0, 0)
+    assert solver.position_value(board) == -1, "X to move is lost"
+    assert solver.depth_to_result(board) == 4
+
+def test_policy_is_optimal():
+    """Test the emitted policy covers every position and never loses."""
+    perfect = solver.perfect_policy()
+    assert len(perfect) == 4520, "Every reachable non-terminal board should be covered"
+    fixed = convert_to_fixed_length(perfect)
+    random = convert_to_fixed_length(create_random_policy(perfect))
+    assert np.allclose(outcome_probabilities(fixed, fixed), [1, 0, 0]), "Self-play should draw"
+    assert outcome_probabilities(random, fixed)[1] == 0, "Perfect X should never lose"
+    assert outcome_probabilities(fixed, random)[2] == 0, "Perfect O should never lose"
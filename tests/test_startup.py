@@ -0,0 +1,49 @@
+#!/usr/bin/env python3
+"""
+Tests that importing the package stays cheap.
+"""
+
+import subprocess
+import sys
+from pathlib import Path
+
+ROOT = Path(__file__).resolve().parent.parent
+
+# Cumulative import time budget for the pure-Python game module.
+GAME_IMPORT_BUDGET_US = 50_000
+
+def loaded_modules(code):
+    """Run ``code`` in a fresh interpreter and return the names in sys.modules."""
+    script = code + "\nimport sys\nprint('\\n'.join(sys.modules))"
+    output = subprocess.run([sys.executable, "-c", script], cwd=ROOT, capture_output=True,
+                            text=True, check=True).stdout
+    return set(output.split())
+
+def test_package_import_is_light():
+    """Test importing the package and game module loads neither NumPy nor matplotlib."""
+    modules = loaded_modules("import tictactoe, tictactoe.game")
+    assert "matplotlib" not in modules, "import tictactoe must not pull in matplotlib"
+    assert "numpy" not in modules, "tictactoe.game should be pure Python"
+
+def test_features_do_not_load_matplotlib():
+    """Test simulation, training and the analysis script import without matplotlib."""
+    code = ("import tictactoe.simulation, tictactoe.training, tictactoe.plotting\n"
+            f"import runpy; runpy.run_path({str(ROOT / 'scripts' / 'run_analysis.py')!r},"
+            " run_name='analysis')")
+    assert "matplotlib" not in loaded_modules(code)
+
+def test_cli_help_is_light():
+    """Test the command-line entry point and ``--help`` do not import NumPy."""
+    modules = loaded_modules("import tictactoe.cli\n"
+                             "try:\n    tictactoe.cli.main(['--help'])\nexcept SystemExit:\n    pass")
+    assert "numpy" not in modules, "numpy should load only in the subcommands that need it"
+
+def test_game_import_time():
+    """Test the measured import time of tictactoe.game stays within budget."""
+    stderr = subprocess.run([sys.executable, "-X", "importtime", "-c", "import tictactoe.game"],
+                            cwd=ROOT, capture_output=True, text=True, check=True).stderr
+    # Lines look like "import time:   self |  cumulative | module"
+    cumulative = {line.split("|")[2].strip(): int(line.split("|")[1])
+                  for line in stderr.splitlines() if line.count("|") == 2 and "cumulative" not in line}
+    own = cumulative["tictactoe.game"] + cumulative["tictactoe"]
+    assert own < GAME_IMPORT_BUDGET_US, f"import tictactoe.game took {own} us"
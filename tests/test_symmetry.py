@@ -0,0 +1,53 @@
+#!/usr/bin/env python3
+"""
+Tests for symmetry canonicalization and the orbit-keyed policy wrapper.
+"""
+
+import numpy as np
+from tictactoe import symmetry
+from tictactoe.board import encode, decode
+from tictactoe.game import state_of_board
+
+def test_canonical_is_orbit_minimum():
+    """Test every image of a board shares one representative."""
+    board = (1, 0, 2, 0, 1, 0, 0, 0, 0)
+    images = {symmetry.transform(board, perm) for perm in symmetry.PERMUTATIONS}
+    representatives = {symmetry.canonical_board(image) for image in images}
+    assert len(representatives) == 1, "All images should share a representative"
+    assert encode(representatives.pop()) == min(encode(image) for image in images)
+    assert len(images) == len(symmetry.orbit(encode(board)))
+
+def test_symmetries_preserve_outcome():
+    """Test every transform maps winning lines to winning lines."""
+    for board in [(1, 1, 1, 0, 2, 2, 0, 0, 0), (2, 0, 0, 1, 2, 1, 0, 0, 2)]:
+        for perm in symmetry.PERMUTATIONS:
+            assert state_of_board(symmetry.transform(board, perm)) == state_of_board(board)
+
+def test_move_remapping():
+    """Test moves survive a round trip through the representative's frame."""
+    board = (0, 0, 1, 0, 2, 0, 0, 0, 0)
+    state = encode(board)
+    canonical = decode(symmetry.canonical_state(state))
+    for move in range(9):
+        mapped = symmetry.to_canonical_move(state, move)
+        assert symmetry.from_canonical_move(state, mapped) == move
+        assert canonical[mapped] == board[move], "Mapped cell should hold the same piece"
+
+def test_symmetric_policy_matches_dict(random_policy):
+    """Test the wrapper reproduces a symmetric policy from 1/8 of the entries."""
+    policy = random_policy
+    wrapped = symmetry.SymmetricPolicy(policy)
+    assert len(wrapped.canonical) < len(policy) / 6, "Orbit storage should be much smaller"
+    assert len(wrapped) == len(policy)
+    assert set(wrapped) == set(policy)
+    for board, probs in policy.items():
+        assert board in wrapped
+        assert np.allclose(wrapped[board], probs)
+
+    board = (1, 0, 0, 0, 0, 0, 0, 0, 0)
+    probs = np.array([0, 0.5, 0, 0.5, 0, 0, 0, 0, 0])
+    wrapped[board] = probs
+    assert np.allclose(wrapped[board], probs)
+    # The update is visible, mirrored, from the opposite corner
+    mirrored = wrapped[(0, 0, 1, 0, 0, 0, 0, 0, 0)]
+    assert np.allclose(mirrored[[1, 5]], 0.5) and np.isclose(mirrored.sum(), 1.0)
@@ -0,0 +1,58 @@
+#!/usr/bin/env python3
+"""
+Tests for the multi-process tournament runner.
+"""
+
+import numpy as np
+from tictactoe.stats import sprt, wilson_interval
+from tictactoe.tournament import run_tournament, format_cross_table
+
+def test_results_independent_of_workers():
+    """Test a fixed master seed gives identical counts for any worker count."""
+    policies = {"A": {}, "B": {}, "C": {}}
+    serial = run_tournament(policies, num_games=3000, seed=7, workers=1, chunk_size=1000)
+    parallel = run_tournament(policies, num_games=3000, seed=7, workers=2, chunk_size=1000)
+    assert np.array_equal(serial.counts, parallel.counts), "Counts should be bit-identical"
+    assert (serial.games == 3000).all(), "Every ordered pairing should be played"
+    other = run_tournament(policies, num_games=3000, seed=8, workers=1, chunk_size=1000)
+    assert not np.array_equal(serial.counts, other.counts), "Seeds should matter"
+
+def test_cross_table():
+    """Test rates, intervals and the rendered table."""
+    result = run_tournament({"A": {}, "B": {}}, num_games=2000, seed=0, workers=1, self_play=False)
+    assert result.games[0, 0] == 0 and result.games[0, 1] == 2000
+    low, high = result.confidence_intervals()
+    rates = result.rates()
+    assert np.all((low <= rates) & (rates <= high))
+    assert "A" in format_cross_table(result)
+
+def test_wilson_interval():
+    """Test the Wilson interval on textbook values."""
+    low, high = wilson_interval(50, 100)
+    assert np.isclose(low, 0.4038, atol=1e-4) and np.isclose(high, 0.5962, atol=1e-4)
+    low, high = wilson_interval(0, 0)
+    assert low == 0 and high == 1
+
+def test_sprt():
+    """Test the sequential test decides lopsided records and settles even ones."""
+    assert sprt(60, 15) == 1
+    assert sprt(15, 60) == -1
+    assert sprt(50, 50) is None, "100 even games are not yet enough to settle"
+    assert sprt(300, 300) == 0
+
+def test_adaptive_tournament():
+    """Test pairings stop early with a precision and stay worker-independent."""
+    policies = {"A": {}, "B": {}}
+    serial = run_tournament(policies, num_games=50000, seed=3, workers=1, precision=0.02)
+    parallel = run_tournament(policies, num_games=50000, seed=3, workers=2, precision=0.02)
+    assert np.array_equal(serial.counts, parallel.counts)
+    assert (serial.games < 50000).all()
+
+def test_sequential_tournament_keeps_swapped_games():
+    """Test the seat-swapped games of the sequential test land in the reverse pairing."""
+    policies = {"A": {}, "B": {}}
+    result = run_tournament(policies, num_games=100, seed=1, workers=1, self_play=False,
+                            precision=0.001)
+    # One batch of 100 is too few to settle anything, so each pairing plays
+    # its cap and adds as many swapped games to the other.
+    assert (result.games[[0, 1], [1, 0]] == 200).all()
@@ -0,0 +1,107 @@
+#!/usr/bin/env python3
+"""
+Tests for the batched Q-learning engine.
+"""
+
+import numpy as np
+from tictactoe.board import LEGAL, TERMINAL, encode
+from tictactoe.evaluation import outcome_probabilities
+from tictactoe.game import make_move
+from tictactoe.records import GameRecordWriter, iter_transitions
+from tictactoe.simulation import simulate_games
+from tictactoe.training import (DEFAULT_BATCH_SIZE, QLearner, default_batch_size, resume_training,
+                                train_offline, train_q_learning)
+
+def test_batch_update_matches_sequential():
+    """Test the collapsed batch update equals applying targets one by one."""
+    learner = QLearner({}, alpha=0.3, rng=0)
+    learner.Q[:] = np.random.default_rng(1).uniform(-1, 1, learner.Q.shape)
+    expected = learner.Q.copy()
+    states, actions, outcomes = learner._play(200)
+
+    for game in range(200):
+        for ply in range(9):
+            state = states[game, ply]
+            if state < 0:
+                break
+            player = 1 + ply % 2
+            outcome = outcomes[game]
+            reward = 1 if outcome == player else (-1 if outcome == 3 - player else 0)
+            action = actions[game, ply]
+            expected[state, action] += 0.3 * (reward - expected[state, action])
+
+    learner.learn_batch(states, actions, outcomes)
+    assert np.allclose(learner.Q, expected), "Batch update should equal the sequential loop"
+    assert learner.episode == 200
+    assert not learner.cdf.flags.writeable, "The sampling table is exposed read-only"
+
+def test_global_seed_makes_runs_repeatable():
+    """Test unseeded training follows np.random.seed, as the original loop did."""
+    np.random.seed(5)
+    first = train_q_learning({}, episodes=500)
+    np.random.seed(5)
+    second = train_q_learning({}, episodes=500)
+    assert first.keys() == second.keys()
+    assert all(np.array_equal(first[board], second[board]) for board in first)
+
+def test_default_batch_size():
+    """Test short runs get smaller batches and long runs the full default."""
+    assert default_batch_size(1000) == 125
+    assert default_batch_size(10 ** 6) == DEFAULT_BATCH_SIZE == 1024
+    assert default_batch_size(3) == 1
+
+def test_policy_rows_are_legal_softmax():
+    """Test exported rows are distributions over the empty cells only."""
+    policy = train_q_learning({}, episodes=2000, rng=0)
+    assert policy, "Visited boards should be written back"
+    for board, probs in policy.items():
+        assert np.isclose(probs.sum(), 1.0)
+        assert np.all(probs[[i for i in range(9) if board[i] != 0]] == 0)
+
+def test_training_improves_on_random():
+    """Test a trained O beats uniform X more often than uniform O does."""
+    baseline = outcome_probabilities({}, {})[1]
+    for symmetric in (False, True):
+        trained = train_q_learning({}, episodes=20000, symmetric=symmetric, rng=0)
+        assert outcome_probabilities(trained, {})[1] > baseline + 0.05
+
+def test_seeded_runs_repeat():
+    """Test a fixed seed reproduces the same policy."""
+    first = train_q_learning({}, episodes=3000, rng=5)
+    second = train_q_learning({}, episodes=3000, rng=5)
+    assert first.keys() == second.keys()
+    assert all(np.array_equal(first[b], second[b]) for b in first)
+
+def test_resume_matches_uninterrupted(tmp_path):
+    """Test a run resumed from a checkpoint ends in the same state as a straight run."""
+    path = tmp_path / "run.npz"
+    straight = QLearner({}, batch_size=100, symmetric=True, rng=3)
+    straight.run(1000)
+
+    # Stands in for a job killed right after its checkpoint at episode 400
+    interrupted = QLearner({}, batch_size=100, symmetric=True, rng=3)
+    interrupted.run(400, path, checkpoint_every=150)
+    assert QLearner.load_checkpoint(path).episode == 400
+
+    resumed = resume_training(path, 1000, checkpoint_every=150)
+    assert resumed.episode == 1000
+    assert np.array_equal(resumed.Q, straight.Q), "Q should match the uninterrupted run"
+    assert np.array_equal(resumed.P, straight.P), "Policy should match the uninterrupted run"
+    assert np.array_equal(resumed.touched, straight.touched)
+
+def test_offline_fit_reaches_bellman_fixed_point(tmp_path):
+    """Test fitted Q iteration satisfies the Bellman equation on every logged move."""
+    path = tmp_path / "games.ttt"
+    with GameRecordWriter(path) as writer:
+        simulate_games({}, {}, 3000, rng=0, recorder=writer)
+
+    learner = QLearner({}, gamma=0.9)
+    assert learner.fit_records(path, chunk_games=500) == 3000
+    for state, action, reward in iter_transitions(path):
+        player = 1 if state.count(0) % 2 == 1 else 2
+        after = encode(make_move(state, action, player))
+        expected = reward if TERMINAL[after] else -0.9 * learner.Q[after][LEGAL[after]].max()
+        assert np.isclose(learner.Q[encode(state), action], expected)
+
+    policy = train_offline(path)
+    assert outcome_probabilities(policy, {})[1] > outcome_probabilities({}, {})[1]
@@ -1 +1,25 @@
-"# Tic-Tac-Toe AI Package" 
+"""Tic-Tac-Toe AI package.
+
+Submodules are imported on first attribute access, so ``import tictactoe``
+is nearly free and NumPy or matplotlib load only when a feature that needs
+them is used. ``tictactoe.game`` itself is pure Python.
+"""
+
+import importlib
+
+__version__ = "0.1.0"
+
+__all__ = [
+    "board", "cache", "cli", "distributed", "evaluation", "exploitability",
+    "game", "graph", "mcts", "mnk", "plotting", "policies", "profiling",
+    "records", "server", "simulation", "solver", "stats", "symmetry",
+    "tournament", "training",
+]
+
+def __getattr__(name):
+    if name in __all__:
+        return importlib.import_module(f".{name}", __name__)
+    raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
+
+def __dir__():
+    return sorted(list(globals()) + __all__)
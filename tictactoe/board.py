@@ -0,0 +1,85 @@
+"""Compact integer board encoding with precomputed lookup tables.
+
+A board is encoded as a base-3 integer ``sum(board[i] * 3**i)``, so every
+possible 3x3 position maps to an index in ``range(N_STATES)``. The tables
+below are indexed by that code and let simulations and training run on
+plain integers instead of tuples.
+"""
+
+import numpy as np
+from typing import Tuple
+from .game import WINNING_LINES
+
+N_CELLS = 9
+N_STATES = 3 ** N_CELLS
+EMPTY_STATE = 0
+
+POW3 = 3 ** np.arange(N_CELLS, dtype=np.int32)
+
+def _build_tables():
+    """Compute decode, status and legal-move tables for all 3^9 codes."""
+    codes = np.arange(N_STATES, dtype=np.int32)
+    cells = ((codes[:, None] // POW3) % 3).astype(np.int8)
+
+    # Walk the lines backwards so the first matching line wins, exactly
+    # like the loop in state_of_board.
+    status = np.where((cells == 0).any(axis=1), -1, 0).astype(np.int8)
+    for a, b, c in reversed(WINNING_LINES):
+        line = cells[:, a]
+        won = (line != 0) & (line == cells[:, b]) & (line == cells[:, c])
+        status[won] = line[won]
+
+    legal = (cells == 0) & (status == -1)[:, None]
+    empty_mask = ((cells == 0).astype(np.uint16) << np.arange(N_CELLS, dtype=np.uint16)).sum(
+        axis=1, dtype=np.uint16
+    )
+    return cells, status, legal, empty_mask
+
+CELLS, STATUS, LEGAL, EMPTY_MASK = _build_tables()
+TERMINAL = STATUS != -1
+WINNER = np.where(STATUS > 0, STATUS, 0).astype(np.int8)
+N_PIECES = (CELLS != 0).sum(axis=1).astype(np.int8)
+
+for _table in (CELLS, STATUS, LEGAL, EMPTY_MASK, TERMINAL, WINNER, N_PIECES):
+    _table.flags.writeable = False
+
+# Plain-list mirrors for the scalar helpers; indexing a list is several
+# times faster than indexing a NumPy array with a Python int.
+_STATUS = STATUS.tolist()
+_EMPTY_MASK = EMPTY_MASK.tolist()
+_MASK_MOVES = [tuple(i for i in range(N_CELLS) if mask >> i & 1) for mask in range(1 << N_CELLS)]
+_POW3 = POW3.tolist()
+_N_PIECES = N_PIECES.tolist()
+
+def encode(board: Tuple[int, ...]) -> int:
+    """Convert a tuple board to its integer code."""
+    state = 0
+    for cell in reversed(board):
+        state = state * 3 + cell
+    return state
+
+def decode(state: int) -> Tuple[int, ...]:
+    """Convert an integer code back to a tuple board."""
+    return tuple(CELLS[state].tolist())
+
+def make_move(state: int, location: int, player: int) -> int:
+    """Apply a move to an encoded board."""
+    return state + player * _POW3[location]
+
+def status(state: int) -> int:
+    """Encoded equivalent of ``state_of_board``: -1 ongoing, 0 draw, else winner."""
+    return _STATUS[state]
+
+def is_terminal(state: int) -> bool:
+    """Return True if the game is over for this encoded board."""
+    return _STATUS[state] != -1
+
+def legal_moves(state: int) -> Tuple[int, ...]:
+    """Return the empty cell indices of an ongoing encoded board."""
+    if _STATUS[state] != -1:
+        return ()
+    return _MASK_MOVES[_EMPTY_MASK[state]]
+
+def player_to_move(state: int) -> int:
+    """Return the player to move, assuming player 1 (O) moves first."""
+    return 1 if _N_PIECES[state] % 2 == 0 else 2
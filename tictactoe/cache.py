@@ -0,0 +1,220 @@
+"""Content-addressed disk cache for expensive, deterministic results.
+
+``ResultCache.call(func, *args, **kwargs)`` returns ``func(*args, **kwargs)``,
+computing it only if the same call has not been cached before. The key is
+a SHA-256 over the function's qualified name, every argument (after
+defaults are applied), and a code version that covers the package version
+and the source of every ``tictactoe`` module. Editing the code therefore
+invalidates old entries instead of serving stale results.
+
+Arguments are hashed by content: policy dicts by their sorted boards and
+probabilities, arrays by dtype, shape and bytes. Calls whose ``rng`` or
+``seed`` argument is ``None`` are not reproducible, so they bypass the
+cache. So do arguments that cannot be hashed by content, such as a
+``Generator``.
+
+A hit only returns the stored result: side effects of the original call,
+such as ``train_q_learning`` writing into its ``policy`` argument, are not
+replayed, so callers should use the return value.
+
+Each entry is one pickle file named ``<function>-<key>.pkl``. Hits refresh
+the file's modification time, and after each write the least recently
+used entries are deleted until the cache fits in ``max_bytes``.
+"""
+
+import hashlib
+import inspect
+import os
+import pickle
+import time
+from collections.abc import Mapping
+from pathlib import Path
+from typing import Any, Callable, Dict, List, Optional, Union
+import numpy as np
+from .board import POW3
+from .profiling import count
+
+ENV_VAR = "TICTACTOE_CACHE_DIR"
+DEFAULT_MAX_BYTES = 256 * 1024 * 1024
+
+# Parameters that make a call non-deterministic when left as None.
+_UNSEEDED_PARAMS = ("rng", "seed")
+
+_CODE_VERSION: Optional[str] = None
+
+class Uncacheable(TypeError):
+    """Raised when an argument cannot be hashed by content."""
+
+def default_cache_dir() -> Path:
+    """``$TICTACTOE_CACHE_DIR`` if set, else ``~/.cache/tictactoe``."""
+    return Path(os.environ.get(ENV_VAR) or Path.home() / ".cache" / "tictactoe")
+
+def code_version() -> str:
+    """Hash of the package version and every module's source."""
+    global _CODE_VERSION
+    if _CODE_VERSION is None:
+        from . import __version__
+        digest = hashlib.sha256(__version__.encode())
+        for path in sorted(Path(__file__).parent.glob("*.py")):
+            digest.update(path.name.encode())
+            digest.update(path.read_bytes())
+        _CODE_VERSION = digest.hexdigest()
+    return _CODE_VERSION
+
+def _feed(digest, value: Any) -> None:
+    """Add a type-tagged, order-independent encoding of ``value`` to ``digest``."""
+    if value is None or isinstance(value, (bool, int, float, str, bytes)):
+        digest.update(f"{type(value).__name__}:{value!r};".encode())
+    elif isinstance(value, np.ndarray):
+        digest.update(f"ndarray:{value.dtype.str}:{value.shape};".encode())
+        digest.update(np.ascontiguousarray(value).tobytes())
+    elif isinstance(value, np.generic):
+        _feed(digest, value.item())
+    elif isinstance(value, (tuple, list)):
+        digest.update(f"{type(value).__name__}:{len(value)}[".encode())
+        for item in value:
+            _feed(digest, item)
+        digest.update(b"]")
+    elif isinstance(value, Mapping) and _feed_policy(digest, value):
+        pass
+    elif isinstance(value, Mapping):
+        items = sorted(((repr(key), key, item) for key, item in value.items()), key=lambda t: t[0])
+        digest.update(f"mapping:{len(items)}{{".encode())
+        for _, key, item in items:
+            _feed(digest, key)
+            _feed(digest, item)
+        digest.update(b"}")
+    else:
+        raise Uncacheable(f"cannot hash {type(value).__name__} arguments by content")
+
+def _feed_policy(digest, policy: Mapping) -> bool:
+    """Hash a board-keyed policy in a few array passes; False if it is not one.
+
+    Boards are sorted by integer code, and the rows are hashed as one block
+    together with their lengths, so variable-length policies work too.
+    """
+    boards = list(policy)
+    if not boards or not all(type(board) is tuple and len(board) == 9 for board in boards):
+        return False
+    cells = np.array(boards)
+    if cells.dtype.kind not in "iu" or cells.min() < 0 or cells.max() > 2:
+        return False
+    rows = [np.asarray(policy[board]) for board in boards]
+    if not all(row.ndim == 1 and row.dtype.kind == "f" for row in rows):
+        return False
+
+    codes = cells @ POW3
+    order = np.argsort(codes)
+    digest.update(f"policy:{len(boards)};".encode())
+    digest.update(codes[order].astype(np.int64).tobytes())
+    digest.update(np.array([rows[i].size for i in order], dtype=np.int64).tobytes())
+    digest.update(np.concatenate([rows[i] for i in order]).astype(np.float64).tobytes())
+    return True
+
+def cache_key(func: Callable, *args, **kwargs) -> str:
+    """Return the hex key of a call; raises ``Uncacheable`` if it has none."""
+    bound = inspect.signature(func).bind(*args, **kwargs)
+    bound.apply_defaults()
+    if any(bound.arguments.get(name, 0) is None for name in _UNSEEDED_PARAMS):
+        raise Uncacheable(f"{func.__qualname__} is unseeded")
+    digest = hashlib.sha256(code_version().encode())
+    _feed(digest, f"{func.__module__}.{func.__qualname__}")
+    _feed(digest, dict(bound.arguments))
+    return digest.hexdigest()
+
+class ResultCache:
+    """A size-bounded LRU cache of pickled call results in one directory."""
+
+    def __init__(self, directory: Optional[Union[str, Path]] = None,
+                 max_bytes: int = DEFAULT_MAX_BYTES):
+        self.directory = Path(directory) if directory is not None else default_cache_dir()
+        self.max_bytes = max_bytes
+        self.hits = 0
+        self.misses = 0
+
+    def _path(self, func: Callable, key: str) -> Path:
+        return self.directory / f"{func.__name__}-{key}.pkl"
+
+    def call(self, func: Callable, *args, **kwargs):
+        """Return ``func(*args, **kwargs)``, from the cache when possible."""
+        try:
+            path = self._path(func, cache_key(func, *args, **kwargs))
+        except Uncacheable:
+            return func(*args, **kwargs)
+
+        try:
+            with open(path, "rb") as f:
+                result = pickle.load(f)
+            os.utime(path)
+            self.hits += 1
+            count("cache_hits")
+            return result
+        except (FileNotFoundError, EOFError, pickle.UnpicklingError):
+            pass
+
+        result = func(*args, **kwargs)
+        self.misses += 1
+        count("cache_misses")
+        self._store(path, result)
+        return result
+
+    def _store(self, path: Path, result: Any) -> None:
+        """Atomically write one entry, then evict down to ``max_bytes``."""
+        self.directory.mkdir(parents=True, exist_ok=True)
+        tmp_path = path.with_name(path.name + f".{os.getpid()}.tmp")
+        with open(tmp_path, "wb") as f:
+            pickle.dump(result, f, protocol=pickle.HIGHEST_PROTOCOL)
+        os.replace(tmp_path, path)
+        self.evict()
+
+    def entries(self) -> List[Dict[str, Any]]:
+        """Describe every entry, least recently used first."""
+        if not self.directory.is_dir():
+            return []
+        entries = []
+        for path in self.directory.glob("*.pkl"):
+            try:
+                stat = path.stat()
+            except FileNotFoundError:
+                continue
+            function, _, key = path.stem.rpartition("-")
+            entries.append({"function": function, "key": key, "bytes": stat.st_size,
+                            "last_used": stat.st_mtime, "path": str(path)})
+        return sorted(entries, key=lambda entry: entry["last_used"])
+
+    def size(self) -> int:
+        """Total bytes held by the cache."""
+        return sum(entry["bytes"] for entry in self.entries())
+
+    def evict(self, max_bytes: Optional[int] = None) -> int:
+        """Delete least recently used entries until the cache fits; return how many."""
+        limit = self.max_bytes if max_bytes is None else max_bytes
+        entries = self.entries()
+        total = sum(entry["bytes"] for entry in entries)
+        removed = 0
+        for entry in entries:
+            if total <= limit:
+                break
+            try:
+                os.remove(entry["path"])
+            except FileNotFoundError:
+                pass
+            total -= entry["bytes"]
+            removed += 1
+        return removed
+
+    def clear(self) -> int:
+        """Delete every entry; return how many were removed."""
+        return self.evict(0)
+
+    def describe(self) -> str:
+        """Render a summary and the entry list for ``tictactoe cache info``."""
+        entries = self.entries()
+        total = sum(entry["bytes"] for entry in entries)
+        lines = [f"{self.directory}: {len(entries)} entries, {total / 1e6:.1f} MB"
+                 f" of {self.max_bytes / 1e6:.0f} MB"]
+        for entry in reversed(entries):
+            used = time.strftime("%Y-%m-%d %H:%M:%S", time.localtime(entry["last_used"]))
+            lines.append(f"  {entry['function']:<24} {entry['key'][:12]}"
+                         f" {entry['bytes'] / 1e3:>9.1f} kB  {used}")
+        return "\n".join(lines)
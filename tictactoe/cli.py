@@ -0,0 +1,475 @@
+"""The ``tictactoe`` command-line interface.
+
+Subcommands cover the whole pipeline::
+
+    tictactoe solve -o data/perfectPolicy.p
+    tictactoe train --policy random --episodes 100000 -o data/trained.npz
+    tictactoe simulate data/trained.npz perfect --games 1000000 -o results.json
+    tictactoe tournament random perfect trained=data/trained.npz --workers 4
+    tictactoe plot results.json -o performance.png
+    tictactoe serve data/trained.npz --port 8765
+    tictactoe loadgen --port 8765 --requests 100000 --concurrency 64
+    tictactoe cache info
+
+Wherever a policy is expected, ``random`` (uniform over legal moves),
+``perfect`` (solved on the fly) or the path of a pickled or ``.npz``
+policy may be given. Each stage reports its wall time, and the
+throughput where that makes sense, on stderr. ``--profile report.json``
+saves stage timings, hot-function timings and counters (see
+``tictactoe.profiling``); ``--cprofile run.prof`` dumps cProfile stats.
+"""
+
+import argparse
+import json
+import pickle
+import sys
+import time
+from contextlib import contextmanager
+from pathlib import Path
+from typing import TYPE_CHECKING, Dict, Iterator, List, Optional
+
+from . import profiling
+
+if TYPE_CHECKING:
+    import numpy as np
+
+class _Stages:
+    """Times the stages of one command and reports them on stderr."""
+
+    def __init__(self, quiet: bool = False):
+        self.quiet = quiet
+
+    @contextmanager
+    def __call__(self, name: str, count: int = 0, unit: str = "") -> Iterator[dict]:
+        """Time a block; it may update the yielded ``{"count": ...}`` once known."""
+        info = {"count": count}
+        start = time.perf_counter()
+        with profiling.stage(name):
+            yield info
+        elapsed = time.perf_counter() - start
+        if self.quiet:
+            return
+        line = f"[{name}] {elapsed:.3f}s"
+        if info["count"] and elapsed > 0:
+            line += f" ({info['count'] / elapsed:,.0f} {unit}/s)"
+        print(line, file=sys.stderr)
+
+def load_policy_spec(spec: str):
+    """Resolve ``random``, ``perfect`` or a policy file into a fixed-length policy."""
+    from .policies import convert_to_fixed_length, load_policy
+
+    if spec == "random":
+        return {}
+    if spec == "perfect":
+        from .solver import perfect_policy
+        return convert_to_fixed_length(perfect_policy())
+    policy = load_policy(spec)
+    if isinstance(policy, dict) and any(len(probs) != 9 for probs in policy.values()):
+        policy = convert_to_fixed_length(policy)
+    return policy
+
+def save_policy(policy, path: str) -> None:
+    """Write ``policy`` as a DensePolicy for ``.npz`` paths, otherwise pickle it."""
+    import numpy as np
+    from .policies import DensePolicy
+
+    path = Path(path)
+    path.parent.mkdir(parents=True, exist_ok=True)
+    if path.suffix == ".npz":
+        if not isinstance(policy, DensePolicy):
+            policy = DensePolicy.from_dict(policy, dtype=np.float64)
+        policy.save(path)
+    else:
+        with open(path, "wb") as f:
+            pickle.dump(dict(policy), f)
+
+def _write_json(data: dict, path: Optional[str]) -> None:
+    text = json.dumps(data, indent=2)
+    if path is None:
+        print(text)
+        return
+    Path(path).parent.mkdir(parents=True, exist_ok=True)
+    Path(path).write_text(text + "\n")
+
+def _format_counts(name: str, counts: List[int], exact: Optional["np.ndarray"] = None) -> str:
+    from .stats import wilson_interval
+
+    total = max(sum(counts), 1)
+    low, high = wilson_interval(counts, total)
+    lines = [f"{name}: {sum(counts)} games"]
+    for label, index in (("O wins", 1), ("X wins", 2), ("Draws", 0)):
+        lines.append(f"  {label}: {counts[index]} ({counts[index] / total * 100:.1f}%,"
+                     f" 95% CI {low[index] * 100:.1f}-{high[index] * 100:.1f}%)")
+    if exact is not None:
+        lines.append(f"  Exact: O {exact[1] * 100:.1f}%, X {exact[2] * 100:.1f}%,"
+                     f" draw {exact[0] * 100:.1f}%")
+    return "\n".join(lines)
+
+def cmd_solve(args: argparse.Namespace, stage: _Stages) -> int:
+    from .board import encode
+    from .policies import create_random_policy, convert_to_fixed_length, policy_table
+    from .solver import perfect_policy
+
+    with stage("solve"):
+        if args.method == "negamax":
+            policy = perfect_policy()
+        else:
+            from .graph import optimal_policy
+            policy = optimal_policy(args.method, args.gamma)
+    # negamax gives variable-length rows, which .npz files cannot hold.
+    variable = args.method == "negamax"
+
+    def for_file(policy, path):
+        return convert_to_fixed_length(policy) if variable and Path(path).suffix == ".npz" else policy
+
+    with stage("save"):
+        save_policy(for_file(policy, args.output), args.output)
+        if args.random_output:
+            if variable:
+                random_policy = create_random_policy(policy)
+            else:
+                uniform = policy_table({})
+                random_policy = {board: uniform[encode(board)] for board in policy}
+            save_policy(for_file(random_policy, args.random_output), args.random_output)
+    print(f"Perfect policy saved to {args.output} ({len(policy)} states)")
+    return 0
+
+def cmd_train(args: argparse.Namespace, stage: _Stages) -> int:
+    from .training import default_batch_size, resume_training, train_offline, train_q_learning
+
+    args.batch_size = args.batch_size or default_batch_size(args.episodes)
+
+    with stage("load"):
+        policy = load_policy_spec(args.policy)
+        policy = policy.to_dict() if hasattr(policy, "to_dict") else dict(policy)
+    if args.records:
+        with stage("train-offline"):
+            policy = train_offline(args.records, policy, gamma=args.gamma,
+                                   symmetric=args.symmetric)
+    elif args.resume:
+        with stage("train", args.episodes, "episodes"):
+            learner = resume_training(args.checkpoint, args.episodes, args.checkpoint_every)
+            policy = learner.export(policy)
+    elif args.actors:
+        from .distributed import train_parallel
+
+        with stage("train", args.episodes, "episodes"):
+            policy = train_parallel(policy, args.episodes, args.actors, args.batch_size,
+                                    args.alpha, args.gamma, args.symmetric, args.seed)
+    elif args.eval_every:
+        from .exploitability import exploitability
+        from .training import QLearner
+
+        learner = QLearner(policy, args.alpha, args.gamma, args.symmetric, args.batch_size, args.seed)
+        # Whole batches per segment, so evaluating does not change the run.
+        every = -(-args.eval_every // args.batch_size) * args.batch_size
+        with stage("train", args.episodes, "episodes"):
+            while learner.episode < args.episodes:
+                learner.run(min(every, args.episodes - learner.episode),
+                            args.checkpoint, args.checkpoint_every)
+                print(f"episode {learner.episode}: exploitability {exploitability(learner.P):.4f}")
+        policy = learner.export(policy)
+    else:
+        with stage("train", args.episodes, "episodes"):
+            policy = train_q_learning(policy, args.episodes, args.alpha, args.gamma,
+                                      args.symmetric, args.batch_size, args.seed,
+                                      args.checkpoint, args.checkpoint_every)
+    with stage("save"):
+        save_policy(policy, args.output)
+    print(f"Trained policy saved to {args.output}")
+    return 0
+
+def cmd_exploit(args: argparse.Namespace, stage: _Stages) -> int:
+    from .exploitability import best_response
+    from .policies import as_policy_table
+
+    with stage("load"):
+        table = as_policy_table(load_policy_spec(args.policy))
+    with stage("best-response"):
+        as_o, as_x = best_response(table, 1), best_response(table, 2)
+    exploitability = (as_o.value + as_x.value) / 2
+    if args.br_output:
+        save_policy({**as_o.policy, **as_x.policy}, args.br_output)
+    if args.format == "json":
+        _write_json({"exploitability": exploitability, "best_response_as_o": as_o.value,
+                     "best_response_as_x": as_x.value}, args.output)
+    else:
+        print(f"{args.policy}: exploitability {exploitability:.4f}")
+        print(f"  best response as O scores {as_o.value:+.4f}, as X {as_x.value:+.4f}")
+    return 0
+
+def cmd_simulate(args: argparse.Namespace, stage: _Stages) -> int:
+    from .evaluation import outcome_probabilities
+    from .policies import as_policy_table
+    from .records import GameRecordWriter
+    from .simulation import simulate_adaptive, simulate_games
+
+    name = args.name or f"{args.policy_a} vs {args.policy_b}"
+    with stage("load"):
+        table_a = as_policy_table(load_policy_spec(args.policy_a))
+        table_b = as_policy_table(load_policy_spec(args.policy_b))
+    adaptive = None
+    recorder = GameRecordWriter(args.record) if args.record else None
+    try:
+        with stage("simulate", args.games, "games") as info:
+            if args.precision is None:
+                counts = simulate_games(table_a, table_b, args.games, args.seed, recorder=recorder)
+            else:
+                adaptive = simulate_adaptive(table_a, table_b, args.precision, args.games,
+                                             args.batch_size, args.sequential, rng=args.seed,
+                                             recorder=recorder)
+                counts = adaptive.counts
+                info["count"] = adaptive.games
+    finally:
+        if recorder is not None:
+            recorder.close()
+    exact = None
+    if args.exact:
+        with stage("exact"):
+            exact = outcome_probabilities(table_a, table_b)
+
+    if args.format == "json":
+        data = {"results": {name: counts}}
+        if adaptive is not None:
+            data["adaptive"] = {name: {"games": adaptive.games, "decision": adaptive.decision,
+                                       "reason": adaptive.reason, "swapped": adaptive.swapped}}
+        if exact is not None:
+            data["exact"] = {name: exact.tolist()}
+        _write_json(data, args.output)
+    else:
+        print(_format_counts(name, counts, exact))
+        if adaptive is not None:
+            verdict = {1: f"{args.policy_a} stronger", -1: f"{args.policy_b} stronger",
+                       0: "evenly matched"}[adaptive.decision]
+            if adaptive.reason == "sequential test":
+                print(f"  Stopped after {adaptive.games}/{args.games} games (sequential test: {verdict})")
+            else:
+                print(f"  Stopped after {adaptive.games}/{args.games} games ({adaptive.reason})")
+            if sum(adaptive.swapped):
+                print(_format_counts(f"{args.policy_b} vs {args.policy_a} (seats swapped)",
+                                     adaptive.swapped))
+    return 0
+
+def _parse_entrant(entrant: str):
+    name, sep, spec = entrant.partition("=")
+    return (name, spec) if sep else (Path(entrant).stem, entrant)
+
+def cmd_tournament(args: argparse.Namespace, stage: _Stages) -> int:
+    from .policies import as_policy_table
+    from .tournament import format_cross_table, run_tournament
+
+    entrants = dict(_parse_entrant(entrant) for entrant in args.policies)
+    with stage("load"):
+        tables = {name: as_policy_table(load_policy_spec(spec)) for name, spec in entrants.items()}
+    with stage("tournament", unit="games") as info:
+        result = run_tournament(tables, args.games, args.seed, args.workers,
+                                args.chunk_size, args.self_play, args.precision, args.sequential)
+        info["count"] = int(result.games.sum())
+
+    if args.format == "json":
+        _write_json({"names": result.names, "counts": result.counts.tolist()}, args.output)
+    else:
+        print(format_cross_table(result))
+    return 0
+
+def load_results(paths: List[str]) -> Dict[str, List[int]]:
+    """Collect "A vs B" -> counts from ``simulate`` and ``tournament`` JSON output."""
+    results = {}
+    for path in paths:
+        data = json.loads(Path(path).read_text())
+        results.update(data.get("results", {}))
+        names, counts = data.get("names", []), data.get("counts", [])
+        for i, name_a in enumerate(names):
+            for j, name_b in enumerate(names):
+                if sum(counts[i][j]):
+                    results[f"{name_a} vs {name_b}"] = counts[i][j]
+    return results
+
+def cmd_plot(args: argparse.Namespace, stage: _Stages) -> int:
+    from .plotting import create_clear_performance_plot
+
+    results = load_results(args.results)
+    with stage("plot"):
+        fig = create_clear_performance_plot(results, args.title)
+        Path(args.output).parent.mkdir(parents=True, exist_ok=True)
+        fig.savefig(args.output, dpi=args.dpi, bbox_inches="tight")
+    print(f"Plot saved to {args.output}")
+    return 0
+
+def cmd_serve(args: argparse.Namespace, stage: _Stages) -> int:
+    from .server import serve
+
+    with stage("load"):
+        policy = load_policy_spec(args.policy)
+    serve(policy, args.host, args.port, max_batch=args.max_batch,
+          max_delay=args.max_delay_ms / 1000, seed=args.seed)
+    return 0
+
+def cmd_loadgen(args: argparse.Namespace, stage: _Stages) -> int:
+    import asyncio
+    from .server import run_load
+
+    with stage("loadgen", args.requests, "requests"):
+        result = asyncio.run(run_load(args.host, args.port, args.requests, args.concurrency,
+                                      args.pipeline, args.op, seed=args.seed))
+    if args.format == "json":
+        _write_json(result, args.output)
+    else:
+        server = result["server"]
+        print(f"{result['requests']} requests in {result['seconds']:.2f}s"
+              f" ({result['requests_per_sec']:,.0f}/s), {result['errors']} errors")
+        print(f"  client latency: p50 {result['p50_ms']:.2f} ms, p99 {result['p99_ms']:.2f} ms")
+        print(f"  server latency: p50 {server['p50_ms']:.2f} ms, p99 {server['p99_ms']:.2f} ms,"
+              f" mean batch {server['mean_batch']:.1f}")
+    return 0
+
+def cmd_cache(args: argparse.Namespace, stage: _Stages) -> int:
+    from .cache import ResultCache
+
+    cache = ResultCache(args.dir, max_bytes=int(args.max_mb * 1e6))
+    if args.action == "clear":
+        print(f"Removed {cache.clear()} entries from {cache.directory}")
+    elif args.action == "evict":
+        print(f"Removed {cache.evict()} entries from {cache.directory}")
+    else:
+        print(cache.describe())
+    return 0
+
+def build_parser() -> argparse.ArgumentParser:
+    parser = argparse.ArgumentParser(prog="tictactoe", description="Tic-Tac-Toe AI analysis")
+    parser.add_argument("-q", "--quiet", action="store_true", help="do not report stage timings")
+    parser.add_argument("--profile", metavar="PATH", help="save timings and counters as JSON")
+    parser.add_argument("--cprofile", metavar="PATH", help="dump cProfile stats for pstats")
+    commands = parser.add_subparsers(dest="command", required=True)
+
+    solve = commands.add_parser("solve", help="solve the game and save the perfect policy")
+    solve.add_argument("-o", "--output", default="data/perfectPolicy.p",
+                       help="policy file; .npz for a dense policy, otherwise a pickle")
+    solve.add_argument("--random-output", help="also save a uniform random policy here")
+    solve.add_argument("--method", choices=("negamax", "value", "policy"), default="negamax",
+                       help="negamax search (variable-length policy) or value/policy iteration"
+                            " on the state graph (fixed-length policy)")
+    solve.add_argument("--gamma", type=float, default=0.9,
+                       help="discount for value/policy iteration; below 1 prefers quick wins")
+    solve.set_defaults(func=cmd_solve)
+
+    train = commands.add_parser("train", help="train a policy with Q-learning")
+    train.add_argument("--policy", default="random", help="starting policy (default: random)")
+    train.add_argument("--episodes", type=int, default=10000)
+    train.add_argument("--alpha", type=float, default=0.1)
+    train.add_argument("--gamma", type=float, default=0.9)
+    train.add_argument("--batch-size", type=int,
+                       help="episodes per batch (default: 1024, or episodes/8 for short runs)")
+    train.add_argument("--symmetric", action="store_true", help="share values across symmetric boards")
+    train.add_argument("--seed", type=int)
+    train.add_argument("--checkpoint", help="checkpoint file for resumable runs")
+    train.add_argument("--checkpoint-every", type=int, default=0)
+    train.add_argument("--resume", action="store_true", help="continue from --checkpoint")
+    train.add_argument("--records", help="fit offline to a game record file instead of self-play")
+    train.add_argument("--actors", type=int, default=0,
+                       help="self-play actor processes feeding one learner"
+                            " (--batch-size episodes per actor per round)")
+    train.add_argument("--eval-every", type=int, default=0,
+                       help="print exploitability every this many episodes")
+    train.add_argument("-o", "--output", required=True)
+    train.set_defaults(func=cmd_train)
+
+    exploit = commands.add_parser("exploit", help="score a policy against its exact best responses")
+    exploit.add_argument("policy")
+    exploit.add_argument("--br-output", help="save both best-response policies here")
+    exploit.add_argument("--format", choices=("text", "json"), default="text")
+    exploit.add_argument("-o", "--output", help="JSON output file (default: stdout)")
+    exploit.set_defaults(func=cmd_exploit)
+
+    simulate = commands.add_parser("simulate", help="play one policy against another")
+    simulate.add_argument("policy_a", help="policy playing O")
+    simulate.add_argument("policy_b", help="policy playing X")
+    simulate.add_argument("--games", type=int, default=500)
+    simulate.add_argument("--seed", type=int)
+    simulate.add_argument("--precision", type=float,
+                          help="stop early once every 95%% interval half-width is at most this;"
+                               " --games becomes the cap")
+    simulate.add_argument("--batch-size", type=int, default=100,
+                          help="games between stopping checks with --precision")
+    simulate.add_argument("--no-sequential", dest="sequential", action="store_false",
+                          help="with --precision, do not stop when one policy is shown stronger")
+    simulate.add_argument("--name", help='matchup name (default: "A vs B")')
+    simulate.add_argument("--exact", action="store_true", help="also compute exact outcome probabilities")
+    simulate.add_argument("--record", help="append every game to this record file")
+    simulate.add_argument("--format", choices=("text", "json"), default="text")
+    simulate.add_argument("-o", "--output", help="JSON output file (default: stdout)")
+    simulate.set_defaults(func=cmd_simulate)
+
+    tournament = commands.add_parser("tournament", help="round-robin between several policies")
+    tournament.add_argument("policies", nargs="+", metavar="[NAME=]POLICY")
+    tournament.add_argument("--games", type=int, default=10000, help="games per pairing")
+    tournament.add_argument("--seed", type=int, default=0)
+    tournament.add_argument("--workers", type=int, help="worker processes (default: all cores)")
+    tournament.add_argument("--chunk-size", type=int, default=100_000)
+    tournament.add_argument("--precision", type=float,
+                            help="stop each pairing early at this interval half-width")
+    tournament.add_argument("--no-sequential", dest="sequential", action="store_false",
+                            help="with --precision, do not stop when one policy is shown stronger")
+    tournament.add_argument("--no-self-play", dest="self_play", action="store_false")
+    tournament.add_argument("--format", choices=("text", "json"), default="text")
+    tournament.add_argument("-o", "--output", help="JSON output file (default: stdout)")
+    tournament.set_defaults(func=cmd_tournament)
+
+    plot = commands.add_parser("plot", help="plot saved simulate/tournament results")
+    plot.add_argument("results", nargs="+", help="JSON files written with --format json")
+    plot.add_argument("-o", "--output", default="results/plots/performance_comparison.png")
+    plot.add_argument("--title", default="Tic-Tac-Toe AI Performance")
+    plot.add_argument("--dpi", type=int, default=300)
+    plot.set_defaults(func=cmd_plot)
+
+    serve = commands.add_parser("serve", help="answer move queries as line-delimited JSON over TCP")
+    serve.add_argument("policy")
+    serve.add_argument("--host", default="127.0.0.1")
+    serve.add_argument("--port", type=int, default=8765)
+    serve.add_argument("--max-batch", type=int, default=256)
+    serve.add_argument("--max-delay-ms", type=float, default=1.0,
+                       help="longest wait for a batch to fill")
+    serve.add_argument("--seed", type=int, help="seed for sampled moves")
+    serve.set_defaults(func=cmd_serve)
+
+    loadgen = commands.add_parser("loadgen", help="benchmark a running server")
+    loadgen.add_argument("--host", default="127.0.0.1")
+    loadgen.add_argument("--port", type=int, default=8765)
+    loadgen.add_argument("--requests", type=int, default=10000)
+    loadgen.add_argument("--concurrency", type=int, default=32, help="client connections")
+    loadgen.add_argument("--pipeline", type=int, default=1, help="requests in flight per connection")
+    loadgen.add_argument("--op", choices=("probs", "move"), default="probs")
+    loadgen.add_argument("--seed", type=int)
+    loadgen.add_argument("--format", choices=("text", "json"), default="text")
+    loadgen.add_argument("-o", "--output", help="JSON output file (default: stdout)")
+    loadgen.set_defaults(func=cmd_loadgen)
+
+    cache = commands.add_parser("cache", help="inspect or clear the analysis result cache")
+    cache.add_argument("action", nargs="?", choices=("info", "clear", "evict"), default="info",
+                       help="list entries, delete them all, or trim to --max-mb (default: info)")
+    cache.add_argument("--dir", help="cache directory (default: $TICTACTOE_CACHE_DIR"
+                                     " or ~/.cache/tictactoe)")
+    cache.add_argument("--max-mb", type=float, default=256.0, help="size limit for evict")
+    cache.set_defaults(func=cmd_cache)
+    return parser
+
+def main(argv: Optional[List[str]] = None) -> int:
+    parser = build_parser()
+    args = parser.parse_args(argv)
+    if getattr(args, "resume", False):
+        if not args.checkpoint:
+            parser.error("--resume needs --checkpoint")
+        if not Path(args.checkpoint).is_file():
+            parser.error(f"--resume: checkpoint {args.checkpoint} does not exist")
+    if getattr(args, "actors", 0) and (args.checkpoint or args.resume or args.eval_every):
+        parser.error("--actors cannot be combined with --checkpoint, --resume or --eval-every")
+    if args.profile:
+        profiling.enable()
+    if args.cprofile:
+        with profiling.cprofile(args.cprofile):
+            status = args.func(args, _Stages(args.quiet))
+    else:
+        status = args.func(args, _Stages(args.quiet))
+    if args.profile:
+        profiling.save_report(args.profile)
+    return status
@@ -0,0 +1,140 @@
+"""Parallel actor-learner Q-learning.
+
+Actor processes generate self-play episodes from a snapshot of the
+behaviour policy's sampling table, held once in
+``multiprocessing.shared_memory`` and attached by every actor. Each actor
+sends its episodes back through a queue as compact 10-byte game records
+(see ``tictactoe.records``). The calling process is the learner: it
+decodes the trajectories, applies them with one bulk ``QLearner`` update
+and publishes the refreshed table before the next round.
+
+Rounds are synchronous and every actor draws from its own stream spawned
+from one seed, and the learner applies each round's episodes in actor
+order. A run is therefore reproducible for a fixed seed and actor count,
+whatever the scheduling, and identical to ``processes=False``, which runs
+the actors in-process. The learner's update is serial, so throughput
+scales with the number of actors until episode generation stops being
+the bottleneck.
+"""
+
+import multiprocessing as mp
+import queue
+import numpy as np
+from multiprocessing import shared_memory
+from typing import List, Optional, Tuple
+from .board import N_STATES
+from .policies import Policy
+from .records import decode_records, encode_records, record_states
+from .simulation import _PLY_PLAYERS
+from .training import QLearner, play_episodes
+
+def episodes_to_records(states: np.ndarray, actions: np.ndarray, outcomes: np.ndarray) -> np.ndarray:
+    """Pack ``play_episodes`` output into an (n, 10) game record array."""
+    played = states >= 0
+    moves = np.where(played, actions, -1)
+    return encode_records(moves, np.where(played, _PLY_PLAYERS, -1), outcomes)
+
+def records_to_episodes(records: np.ndarray) -> Tuple[np.ndarray, np.ndarray, np.ndarray]:
+    """Invert ``episodes_to_records``, rebuilding the board code before each ply."""
+    moves, players, outcomes = decode_records(records)
+    return record_states(moves, players), np.maximum(moves, 0).astype(np.intp), outcomes
+
+def _actor(index: int, shm_name: str, seed: np.random.SeedSequence, tasks, results) -> None:
+    """Play the requested number of episodes per round until told to stop."""
+    shm = shared_memory.SharedMemory(name=shm_name)
+    cdf = np.ndarray((N_STATES, 9), dtype=np.float64, buffer=shm.buf)
+    rng = np.random.default_rng(seed)
+    try:
+        while True:
+            n = tasks.get()
+            if n is None:
+                return
+            results.put((index, episodes_to_records(*play_episodes(cdf, n, rng)).tobytes()))
+    finally:
+        # The view must go before the mapping can be closed.
+        del cdf
+        shm.close()
+
+def _split(total: int, parts: int) -> List[int]:
+    return [total // parts + (i < total % parts) for i in range(parts)]
+
+def train_parallel(
+    policy: Policy,
+    episodes: int = 100000,
+    actors: Optional[int] = None,
+    round_episodes: int = 1024,
+    alpha: float = 0.1,
+    gamma: float = 0.9,
+    symmetric: bool = False,
+    seed: Optional[int] = 0,
+    processes: bool = True
+) -> Policy:
+    """Train ``policy`` with ``actors`` self-play processes and one learner.
+
+    Each round every actor plays ``round_episodes`` episodes (fewer in
+    the last round) with the policy as published after the previous
+    round; the learner then applies the whole round as one batch. Writes
+    the learned rows into ``policy`` and returns it, like
+    ``train_q_learning``. ``actors=None`` uses every core.
+    """
+    actors = actors or mp.cpu_count()
+    learner = QLearner(policy, alpha, gamma, symmetric)
+    seeds = np.random.SeedSequence(seed).spawn(actors)
+
+    shm = shared_memory.SharedMemory(create=True, size=learner.cdf.nbytes)
+    shared_cdf = np.ndarray(learner.cdf.shape, dtype=np.float64, buffer=shm.buf)
+    shared_cdf[:] = learner.cdf
+    workers = []
+    try:
+        if processes:
+            context = mp.get_context()
+            results = context.Queue()
+            task_queues = [context.Queue() for _ in range(actors)]
+            workers = [context.Process(target=_actor, daemon=True,
+                                       args=(i, shm.name, seeds[i], task_queues[i], results))
+                       for i in range(actors)]
+            for worker in workers:
+                worker.start()
+        else:
+            rngs = [np.random.default_rng(s) for s in seeds]
+
+        done = 0
+        while done < episodes:
+            n = min(actors * round_episodes, episodes - done)
+            shares = _split(n, actors)
+            if processes:
+                for task_queue, share in zip(task_queues, shares):
+                    task_queue.put(share)
+                chunks = [None] * actors
+                for _ in range(actors):
+                    index, data = _collect(results, workers)
+                    chunks[index] = np.frombuffer(data, dtype=np.uint8).reshape(-1, 10)
+            else:
+                chunks = [episodes_to_records(*play_episodes(shared_cdf, share, rng))
+                          for share, rng in zip(shares, rngs)]
+
+            learner.learn_batch(*records_to_episodes(np.concatenate(chunks)))
+            shared_cdf[:] = learner.cdf
+            done += n
+    finally:
+        for task_queue in task_queues if workers else ():
+            task_queue.put(None)
+        for worker in workers:
+            worker.join(timeout=5)
+            if worker.is_alive():
+                worker.terminate()
+        del shared_cdf
+        shm.close()
+        shm.unlink()
+
+    return learner.export(policy)
+
+def _collect(results, workers) -> Tuple[int, bytes]:
+    """Wait for the next actor result, failing if an actor has died."""
+    while True:
+        try:
+            return results.get(timeout=1.0)
+        except queue.Empty:
+            dead = [i for i, worker in enumerate(workers) if worker.exitcode not in (None, 0)]
+            if dead:
+                raise RuntimeError(f"actor {dead[0]} exited with code {workers[dead[0]].exitcode}")
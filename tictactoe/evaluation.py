@@ -0,0 +1,32 @@
+"""Exact evaluation of matchups between two policies."""
+
+import numpy as np
+from .board import EMPTY_STATE, POW3, STATUS
+from .policies import PolicyLike, as_policy_table
+
+def outcome_probabilities(policyA: PolicyLike, policyB: PolicyLike) -> np.ndarray:
+    """Return exact [draw, O win, X win] probabilities for policyA (O) vs policyB (X).
+
+    Reach probabilities are pushed forward one ply at a time from the empty
+    board. Transpositions are merged at every ply, so each position is
+    expanded once no matter how many move orders lead to it.
+    """
+    tables = (None, as_policy_table(policyA), as_policy_table(policyB))
+    outcome = np.zeros(3)
+    states = np.array([EMPTY_STATE], dtype=np.int32)
+    reach = np.ones(1)
+    player = 1
+
+    while states.size:
+        probs = reach[:, None] * tables[player][states]
+        rows, cells = np.nonzero(probs)
+        states, inverse = np.unique(states[rows] + player * POW3[cells], return_inverse=True)
+        reach = np.bincount(inverse, weights=probs[rows, cells])
+
+        result = STATUS[states]
+        done = result != -1
+        outcome += np.bincount(result[done], weights=reach[done], minlength=3)
+        states, reach = states[~done], reach[~done]
+        player = 3 - player
+
+    return outcome
@@ -0,0 +1,77 @@
+"""Exact best responses to a fixed policy and its exploitability.
+
+A best response is found by one backward pass over the reachable game
+tree, a whole ply at a time: on the responder's turns a position is worth
+its best child, on the policy's turns the policy-weighted average of its
+children. Values are the responder's expected score, +1 for a win, -1
+for a loss and 0 for a draw.
+
+Tic-Tac-Toe is a draw under perfect play, so a best response can always
+force a score of at least 0. ``exploitability`` averages the best-response
+value over both seats: 0 means the policy cannot be beaten, 1 that it
+loses every game from both sides against the right opponent.
+"""
+
+import numpy as np
+from typing import List, NamedTuple
+from .board import EMPTY_STATE, LEGAL, N_STATES, POW3, TERMINAL, WINNER, decode
+from .graph import state_graph
+from .policies import Policy, PolicyLike, as_policy_table
+
+class BestResponse(NamedTuple):
+    """A best response by the player in ``seat`` (1 for O, 2 for X).
+
+    ``policy`` is a fixed-length, one-hot policy over every reachable board
+    where the responder is to move; ties go to the lowest cell. ``values``
+    holds each reachable non-terminal board's value for the responder.
+    """
+    seat: int
+    value: float
+    policy: Policy
+    values: np.ndarray
+
+def reachable_layers() -> List[np.ndarray]:
+    """Return the reachable non-terminal board codes grouped by ply."""
+    graph = state_graph()
+    ongoing = ~graph.terminal
+    return [graph.states[ongoing & (graph.ply == ply)] for ply in range(9)]
+
+def best_response(policy: PolicyLike, seat: int = 2) -> BestResponse:
+    """Compute the exact best response to ``policy`` playing the other seat.
+
+    ``policy`` may be a fixed-length policy dict, a ``DensePolicy`` or a
+    table from ``policy_table`` (such as ``QLearner.P``).
+    """
+    if seat not in (1, 2):
+        raise ValueError(f"seat must be 1 (O) or 2 (X), got {seat}")
+    table = as_policy_table(policy)
+    terminal_score = np.where(WINNER == seat, 1.0, np.where(WINNER == 3 - seat, -1.0, 0.0))
+    values = np.zeros(N_STATES)
+    best_moves = []
+
+    layers = reachable_layers()
+    for ply in reversed(range(len(layers))):
+        states = layers[ply]
+        player = 1 + ply % 2
+        legal = LEGAL[states]
+        children = np.where(legal, states[:, None] + player * POW3, 0)
+        child_values = np.where(TERMINAL[children], terminal_score[children], values[children])
+        if player == seat:
+            scores = np.where(legal, child_values, -np.inf)
+            moves = scores.argmax(axis=1)
+            values[states] = scores[np.arange(states.size), moves]
+            best_moves.append((states, moves))
+        else:
+            values[states] = (table[states] * child_values).sum(axis=1)
+
+    response = {}
+    for states, moves in reversed(best_moves):
+        rows = np.zeros((states.size, 9))
+        rows[np.arange(states.size), moves] = 1.0
+        response.update(zip(map(decode, states.tolist()), rows))
+    return BestResponse(seat, float(values[EMPTY_STATE]), response, values)
+
+def exploitability(policy: PolicyLike) -> float:
+    """Average best-response score against ``policy`` over both seats, in [0, 1]."""
+    table = as_policy_table(policy)
+    return (best_response(table, 1).value + best_response(table, 2).value) / 2
@@ -1,30 +1,33 @@
 """Core Tic-Tac-Toe game mechanics."""
 
-import numpy as np
-from typing import Tuple, List, Optional
+from typing import Tuple, List
+from .profiling import instrumented
 
 def create_board() -> List[int]:
     """Create an empty 3x3 Tic-Tac-Toe board."""
     return [0] * 9
 
+WINNING_LINES = (
+    (0, 1, 2), (3, 4, 5), (6, 7, 8),  # rows
+    (0, 3, 6), (1, 4, 7), (2, 5, 8),  # columns
+    (0, 4, 8), (2, 4, 6)              # diagonals
+)
+
+@instrumented()
 def state_of_board(board: Tuple[int, ...]) -> int:
     """Check the current state of the board."""
-    winning_lines = [
-        (0, 1, 2), (3, 4, 5), (6, 7, 8),  # rows
-        (0, 3, 6), (1, 4, 7), (2, 5, 8),  # columns
-        (0, 4, 8), (2, 4, 6)              # diagonals
-    ]
-    
-    for a, b, c in winning_lines:
+    for a, b, c in WINNING_LINES:
         if board[a] == board[b] == board[c] != 0:
             return board[a]
     
     return -1 if 0 in board else 0
 
+@instrumented()
 def get_empty_cells(board: Tuple[int, ...]) -> List[int]:
     """Return list of empty cell indices."""
     return [i for i in range(9) if board[i] == 0]
 
+@instrumented()
 def make_move(board: Tuple[int, ...], location: int, player: int) -> Tuple[int, ...]:
     """Apply a move to the board."""
     board_list = list(board)
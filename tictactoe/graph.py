@@ -0,0 +1,200 @@
+"""The reachable game tree as a precomputed state graph, and solvers on it.
+
+Every position reachable from the empty board (terminal ones included)
+gets an integer id; ids are ordered by ply, then by board code. The
+moves out of each position are stored in CSR form: the edges of node
+``i`` are ``offsets[i]:offsets[i + 1]`` of ``targets`` (successor ids),
+``moves`` (cells played) and ``sources`` (``i`` again), in cell order.
+The graph is built once per process by ``state_graph``.
+
+Values are negamax values for the player to move at each node. A decided
+terminal position is worth -1 to the player to move (the opponent just
+won) and a draw 0. With ``gamma < 1`` every move that does not end the
+game is discounted, as in ``QLearner.fit_records``: a win ``k`` plies
+away is worth ``gamma ** (k - 1)`` (an immediate win is worth 1), so
+quicker wins and slower losses are preferred.
+Because the graph is acyclic with depth 9, both solvers below reach
+their fixed point in fewer than ten whole-graph sweeps.
+"""
+
+import numpy as np
+from typing import NamedTuple, Optional, Tuple
+from .board import EMPTY_STATE, LEGAL, N_STATES, POW3, TERMINAL, WINNER, decode
+from .policies import Policy, PolicyLike, as_policy_table
+
+class StateGraph(NamedTuple):
+    """Reachable positions and their moves; see the module docstring."""
+    states: np.ndarray
+    index: np.ndarray
+    ply: np.ndarray
+    player: np.ndarray
+    offsets: np.ndarray
+    targets: np.ndarray
+    moves: np.ndarray
+    sources: np.ndarray
+    terminal: np.ndarray
+    winner: np.ndarray
+    terminal_value: np.ndarray
+
+_GRAPH: Optional[StateGraph] = None
+
+def build_state_graph() -> StateGraph:
+    """Enumerate reachable positions ply by ply and link them."""
+    layers = [np.array([EMPTY_STATE], dtype=np.int32)]
+    frontier = layers[0]
+    while frontier.size:
+        player = 1 + (len(layers) - 1) % 2
+        rows, cells = np.nonzero(LEGAL[frontier])
+        children = np.unique(frontier[rows] + player * POW3[cells]).astype(np.int32)
+        if children.size:
+            layers.append(children)
+        frontier = children[~TERMINAL[children]]
+
+    states = np.concatenate(layers)
+    ply = np.repeat(np.arange(len(layers), dtype=np.int8), [len(layer) for layer in layers])
+    player = (1 + ply % 2).astype(np.int8)
+    index = np.full(N_STATES, -1, dtype=np.int32)
+    index[states] = np.arange(states.size, dtype=np.int32)
+
+    sources, moves = np.nonzero(LEGAL[states])
+    targets = index[states[sources] + player[sources] * POW3[moves]]
+    sources, moves = sources.astype(np.int32), moves.astype(np.int8)
+    offsets = np.zeros(states.size + 1, dtype=np.int64)
+    np.cumsum(LEGAL[states].sum(axis=1), out=offsets[1:])
+
+    terminal = TERMINAL[states]
+    winner = WINNER[states]
+    terminal_value = np.where(winner > 0, -1.0, 0.0)
+    for array in (states, index, ply, player, offsets, targets, moves, sources,
+                  terminal, winner, terminal_value):
+        array.flags.writeable = False
+    return StateGraph(states, index, ply, player, offsets, targets, moves, sources,
+                      terminal, winner, terminal_value)
+
+def state_graph() -> StateGraph:
+    """Return the process-wide state graph, building it on first use."""
+    global _GRAPH
+    if _GRAPH is None:
+        _GRAPH = build_state_graph()
+    return _GRAPH
+
+def clear_cache() -> None:
+    """Drop the process-wide state graph; ``state_graph`` rebuilds it on next use."""
+    global _GRAPH
+    _GRAPH = None
+
+def _edge_discount(graph: StateGraph, gamma: float) -> np.ndarray:
+    """Per-edge discount; moves that end the game are not discounted."""
+    return np.where(graph.terminal[graph.targets], 1.0, gamma)
+
+def _sweep_until_stable(graph: StateGraph, backup, tol: float, max_sweeps: int) -> Tuple[np.ndarray, int]:
+    """Apply ``backup`` to the non-terminal nodes until values stop changing."""
+    values = graph.terminal_value.copy()
+    ongoing = ~graph.terminal
+    for sweep in range(1, max_sweeps + 1):
+        updated = values.copy()
+        updated[ongoing] = backup(values)
+        if np.abs(updated - values).max() <= tol:
+            return updated, sweep
+        values = updated
+    return values, max_sweeps
+
+def value_iteration(
+    gamma: float = 1.0,
+    tol: float = 1e-12,
+    max_sweeps: int = 100,
+    graph: Optional[StateGraph] = None
+) -> Tuple[np.ndarray, int]:
+    """Compute optimal values; return (values per node id, sweeps used)."""
+    graph = graph or state_graph()
+    starts = graph.offsets[:-1][~graph.terminal]
+    discount = _edge_discount(graph, gamma)
+
+    def backup(values):
+        return np.maximum.reduceat(-discount * values[graph.targets], starts)
+
+    return _sweep_until_stable(graph, backup, tol, max_sweeps)
+
+def evaluate_policy(
+    policy: PolicyLike,
+    gamma: float = 1.0,
+    tol: float = 1e-12,
+    max_sweeps: int = 100,
+    graph: Optional[StateGraph] = None
+) -> Tuple[np.ndarray, int]:
+    """Compute node values when both players follow ``policy``."""
+    graph = graph or state_graph()
+    starts = graph.offsets[:-1][~graph.terminal]
+    weights = as_policy_table(policy)[graph.states[graph.sources], graph.moves]
+    discount = _edge_discount(graph, gamma)
+
+    def backup(values):
+        return np.add.reduceat(weights * -discount * values[graph.targets], starts)
+
+    return _sweep_until_stable(graph, backup, tol, max_sweeps)
+
+def greedy_table(
+    values: np.ndarray,
+    gamma: float = 1.0,
+    tol: float = 1e-9,
+    graph: Optional[StateGraph] = None
+) -> np.ndarray:
+    """Return a (3^9, 9) policy table uniform over each node's best moves.
+
+    Boards outside the graph keep the uniform rows of ``policy_table({})``.
+    """
+    graph = graph or state_graph()
+    edge_values = -_edge_discount(graph, gamma) * values[graph.targets]
+    starts = graph.offsets[:-1][~graph.terminal]
+    best = np.zeros(graph.states.size)
+    best[~graph.terminal] = np.maximum.reduceat(edge_values, starts)
+    chosen = edge_values >= best[graph.sources] - tol
+
+    table = as_policy_table({})
+    table[graph.states[~graph.terminal]] = 0.0
+    table[graph.states[graph.sources[chosen]], graph.moves[chosen]] = 1.0
+    totals = table.sum(axis=1, keepdims=True)
+    np.divide(table, totals, out=table, where=totals > 0)
+    return table
+
+def policy_iteration(
+    gamma: float = 1.0,
+    max_iterations: int = 50,
+    graph: Optional[StateGraph] = None
+) -> Tuple[np.ndarray, np.ndarray, int]:
+    """Alternate exact evaluation and greedy improvement from the uniform policy.
+
+    Returns (values, policy table, iterations used).
+    """
+    graph = graph or state_graph()
+    table = as_policy_table({})
+    for iteration in range(1, max_iterations + 1):
+        values, _ = evaluate_policy(table, gamma, graph=graph)
+        improved = greedy_table(values, gamma, graph=graph)
+        if np.array_equal(improved, table):
+            break
+        table = improved
+    return values, table, iteration
+
+def table_to_policy(table: np.ndarray, graph: Optional[StateGraph] = None) -> Policy:
+    """Return the rows of every reachable non-terminal board as a fixed-length policy."""
+    graph = graph or state_graph()
+    ongoing = graph.states[~graph.terminal]
+    return {decode(state): table[state].copy() for state in ongoing.tolist()}
+
+def optimal_policy(method: str = "value", gamma: float = 0.9) -> Policy:
+    """Solve the game on the state graph and return a fixed-length optimal policy.
+
+    ``method`` is ``"value"`` (value iteration) or ``"policy"`` (policy
+    iteration). With ``gamma < 1`` the result plays like
+    ``solver.perfect_policy``: uniform over the moves that win fastest or,
+    failing that, lose slowest.
+    """
+    if method == "value":
+        values, _ = value_iteration(gamma)
+        table = greedy_table(values, gamma)
+    elif method == "policy":
+        _, table, _ = policy_iteration(gamma)
+    else:
+        raise ValueError(f"unknown method {method!r}; expected 'value' or 'policy'")
+    return table_to_policy(table)
@@ -0,0 +1,275 @@
+"""Monte Carlo Tree Search agent for any m,n,k game.
+
+The tree lives in a ``NodePool`` of parallel NumPy arrays; the children of
+a node occupy one contiguous block, so UCT selection is a vectorized
+argmax over a slice. Each leaf is evaluated with a batch of random
+rollouts played out simultaneously, and the tree is kept between moves
+and re-rooted at the position the agent is next asked about.
+
+``MCTSAgent`` answers ``board in agent`` and ``agent[board]`` like a
+``Policy`` dict, so it can be passed straight to ``play_game``.
+"""
+
+import time
+import numpy as np
+from typing import Optional, Sequence, Tuple, Union
+from .mnk import MNKBoard, MNKGame, TICTACTOE
+
+class NodePool:
+    """Array-backed storage for search tree nodes.
+
+    ``value`` is the summed rollout reward (+1 win, -1 loss, 0 draw) from the
+    point of view of the player who made the move leading to the node.
+    """
+
+    __slots__ = ("parent", "move", "result", "first_child", "n_children",
+                 "visits", "value", "size")
+
+    def __init__(self, capacity: int = 1024):
+        self.parent = np.zeros(capacity, dtype=np.int32)
+        self.move = np.zeros(capacity, dtype=np.int32)
+        self.result = np.zeros(capacity, dtype=np.int8)
+        self.first_child = np.zeros(capacity, dtype=np.int32)
+        self.n_children = np.zeros(capacity, dtype=np.int32)
+        self.visits = np.zeros(capacity, dtype=np.float64)
+        self.value = np.zeros(capacity, dtype=np.float64)
+        self.size = 0
+
+    def __len__(self) -> int:
+        return self.size
+
+    def clear(self) -> None:
+        """Drop every node, keeping the allocated arrays."""
+        self.size = 0
+
+    def allocate(self, count: int, parent: int) -> int:
+        """Reserve ``count`` fresh nodes under ``parent``; return the first index."""
+        needed = self.size + count
+        if needed > len(self.visits):
+            capacity = max(needed, 2 * len(self.visits))
+            for name in NodePool.__slots__[:-1]:
+                array = getattr(self, name)
+                grown = np.zeros(capacity, dtype=array.dtype)
+                grown[:self.size] = array[:self.size]
+                setattr(self, name, grown)
+        start = self.size
+        block = slice(start, needed)
+        self.parent[block] = parent
+        self.result[block] = -1
+        self.first_child[block] = -1
+        self.n_children[block] = 0
+        self.visits[block] = 0.0
+        self.value[block] = 0.0
+        self.size = needed
+        return start
+
+def batch_rollouts(
+    game: MNKGame,
+    cells: Sequence[int],
+    player: int,
+    n: int,
+    rng: np.random.Generator
+) -> np.ndarray:
+    """Play ``n`` uniformly random games from a position at once.
+
+    Each rollout fills the empty cells in a random order, alternating from
+    ``player``. A game ends at the first k-cell window completed by one
+    player, so the winner is the owner of the window whose last cell is
+    filled earliest. Returns the result (0 draw, 1 or 2) of each rollout.
+    """
+    cells = np.asarray(cells, dtype=np.int8)
+    empty = np.flatnonzero(cells == 0)
+    order = np.argsort(rng.random((n, empty.size)), axis=1)
+    filled = empty[order]
+
+    owner = np.broadcast_to(cells, (n, cells.size)).copy()
+    owner[np.arange(n)[:, None], filled] = np.where(np.arange(empty.size) % 2 == 0,
+                                                    player, 3 - player).astype(np.int8)
+    times = np.zeros((n, cells.size), dtype=np.int32)
+    times[np.arange(n)[:, None], filled] = np.arange(1, empty.size + 1, dtype=np.int32)
+
+    windows = game.windows
+    owners = owner[:, windows]
+    complete = (owners[:, :, 0] != 0) & (owners == owners[:, :, :1]).all(axis=2)
+    finish = np.where(complete, times[:, windows].max(axis=2), np.iinfo(np.int32).max)
+    first = finish.argmin(axis=1)
+    rows = np.arange(n)
+    return np.where(complete[rows, first], owners[rows, first, 0], 0)
+
+class MCTSAgent:
+    """UCT search with tree reuse, batched rollouts and a per-move budget.
+
+    Each search runs ``iterations`` iterations, or stops earlier once
+    ``time_limit`` seconds have passed. ``temperature=0`` makes ``agent[board]``
+    put all probability on the most-visited move; a positive temperature
+    returns visit counts raised to ``1/temperature``, normalized.
+    """
+
+    def __init__(
+        self,
+        game: MNKGame = TICTACTOE,
+        iterations: int = 1000,
+        time_limit: Optional[float] = None,
+        rollouts: int = 16,
+        exploration: float = 1.4,
+        temperature: float = 0.0,
+        max_nodes: int = 1_000_000,
+        rng: Optional[Union[int, np.random.Generator]] = None
+    ):
+        self.game = game
+        self.iterations = iterations
+        self.time_limit = time_limit
+        self.rollouts = rollouts
+        self.exploration = exploration
+        self.temperature = temperature
+        self.max_nodes = max_nodes
+        self.rng = np.random.default_rng(rng)
+        self.pool = NodePool()
+        self.root = -1
+        self._root_cells: Optional[Tuple[int, ...]] = None
+
+    def __contains__(self, board: object) -> bool:
+        try:
+            return (len(board) == self.game.size
+                    and MNKBoard.from_cells(board, self.game).result == -1)
+        except TypeError:
+            return False
+
+    def __getitem__(self, board: Sequence[int]) -> np.ndarray:
+        visits = self.search(board)
+        if self.temperature <= 0:
+            probs = np.zeros_like(visits)
+            probs[np.argmax(visits)] = 1.0
+            return probs
+        weights = visits ** (1.0 / self.temperature)
+        return weights / weights.sum()
+
+    def best_move(self, board: Sequence[int]) -> int:
+        """Return the most-visited move after searching ``board``."""
+        return int(np.argmax(self.search(board)))
+
+    def _reroot(self, cells: Tuple[int, ...]) -> None:
+        """Move the root to ``cells``, reusing the subtree when it is reachable.
+
+        The new root is detached from its old ancestors, so later
+        searches only back values up to it.
+        """
+        if self.root >= 0 and len(self.pool) <= self.max_nodes:
+            node = self._descend(cells)
+            if node is not None:
+                self.root = node
+                self.pool.parent[node] = -1
+                self._root_cells = cells
+                return
+        self.pool.clear()
+        self.root = self.pool.allocate(1, -1)
+        self._root_cells = cells
+
+    def _descend(self, cells: Tuple[int, ...]) -> Optional[int]:
+        """Find a node for ``cells`` below the current root, if the tree has one.
+
+        Only the pieces added since the root are known, not the order they
+        were played in, so every order that alternates the root's mover
+        and the opponent is tried; any path found reaches the same position.
+        """
+        old = self._root_cells
+        added = [i for i in range(len(cells)) if cells[i] != old[i]]
+        if any(old[i] != 0 for i in added):
+            return None
+        player = MNKBoard.from_cells(old, self.game).player
+        mine = [i for i in added if cells[i] == player]
+        theirs = [i for i in added if cells[i] == 3 - player]
+        if len(mine) + len(theirs) != len(added) or len(mine) - len(theirs) not in (0, 1):
+            return None
+        return self._find_path(self.root, mine, theirs)
+
+    def _find_path(self, node: int, to_move: list, waiting: list) -> Optional[int]:
+        """Depth-first search for a line playing ``to_move`` and ``waiting`` alternately."""
+        if not to_move:
+            return node if not waiting else None
+        pool = self.pool
+        first = pool.first_child[node]
+        if first < 0:
+            return None
+        block = pool.move[first:first + pool.n_children[node]]
+        for move in to_move:
+            match = np.flatnonzero(block == move)
+            if match.size:
+                rest = [other for other in to_move if other != move]
+                found = self._find_path(first + int(match[0]), waiting, rest)
+                if found is not None:
+                    return found
+        return None
+
+    def search(self, board: Sequence[int]) -> np.ndarray:
+        """Search from ``board`` within the budget; return visit counts per cell."""
+        cells = tuple(board)
+        root_board = MNKBoard.from_cells(cells, self.game)
+        if root_board.result != -1:
+            raise ValueError("cannot search a finished game")
+        self._reroot(cells)
+
+        deadline = None if self.time_limit is None else time.perf_counter() + self.time_limit
+        for _ in range(self.iterations):
+            self._iterate(root_board.copy())
+            if deadline is not None and time.perf_counter() >= deadline:
+                break
+
+        pool = self.pool
+        visits = np.zeros(self.game.size)
+        first = pool.first_child[self.root]
+        if first >= 0:
+            block = slice(first, first + pool.n_children[self.root])
+            visits[pool.move[block]] = pool.visits[block]
+        return visits
+
+    def _iterate(self, board: MNKBoard) -> None:
+        """Run one select / expand / batched-rollout / backpropagate cycle."""
+        pool, rng = self.pool, self.rng
+        node = self.root
+
+        # Selection
+        while pool.first_child[node] >= 0 and board.result == -1:
+            first = pool.first_child[node]
+            block = slice(first, first + pool.n_children[node])
+            visits = pool.visits[block]
+            unvisited = np.flatnonzero(visits == 0)
+            if unvisited.size:
+                choice = int(unvisited[rng.integers(unvisited.size)])
+            else:
+                scores = (pool.value[block] / visits
+                          + self.exploration * np.sqrt(np.log(pool.visits[node]) / visits))
+                choice = int(np.argmax(scores))
+            node = first + choice
+            board.play(int(pool.move[node]))
+            pool.result[node] = board.result
+
+        # Expansion: grow a visited leaf, then step into one of its children
+        if board.result == -1 and pool.visits[node] > 0:
+            moves = sorted(board.legal)
+            first = pool.allocate(len(moves), node)
+            pool.first_child[node] = first
+            pool.n_children[node] = len(moves)
+            pool.move[first:first + len(moves)] = moves
+            node = first + int(rng.integers(len(moves)))
+            board.play(int(pool.move[node]))
+            pool.result[node] = board.result
+
+        # Simulation
+        n = self.rollouts
+        if board.result == -1:
+            results = batch_rollouts(self.game, board.cells, board.player, n, rng)
+            wins = np.bincount(results, minlength=3)
+        else:
+            wins = np.zeros(3)
+            wins[board.result] = n
+
+        # Backpropagation: the mover into ``node`` alternates going up to the root
+        mover = 3 - board.player
+        while True:
+            pool.visits[node] += n
+            pool.value[node] += wins[mover] - wins[3 - mover]
+            if node == self.root:
+                break
+            mover = 3 - mover
+            node = pool.parent[node]
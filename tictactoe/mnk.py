@@ -0,0 +1,182 @@
+"""Generalized m,n,k games: k in a row on an m x n board.
+
+Tic-Tac-Toe is the 3,3,3 game. Cells are numbered row-major like the
+3x3 tuple boards, players are 1 (O, moves first) and 2 (X), and
+``MNKBoard.result`` follows the ``state_of_board`` convention: -1 ongoing,
+0 draw, otherwise the winner.
+
+Win detection is incremental: after a move only the four lines through
+that cell are walked, at most k-1 cells each way, and the set of legal
+moves is updated in place instead of rescanning the board.
+"""
+
+import numpy as np
+from typing import List, Optional, Sequence, Tuple
+
+DIRECTIONS = ((0, 1), (1, 0), (1, 1), (1, -1))
+
+class MNKGame:
+    """Rules of one m,n,k game, with the rays through each cell precomputed."""
+
+    __slots__ = ("rows", "cols", "k", "size", "rays", "_windows")
+
+    def __init__(self, rows: int = 3, cols: int = 3, k: int = 3):
+        if rows < 1 or cols < 1 or not 1 <= k <= max(rows, cols):
+            raise ValueError(f"invalid m,n,k game: {rows},{cols},{k}")
+        self.rows = rows
+        self.cols = cols
+        self.k = k
+        self.size = rows * cols
+        # rays[cell] holds, per direction, the cells stepping forward and
+        # backward from ``cell``, nearest first, at most k-1 each.
+        self.rays = tuple(
+            tuple((self._ray(cell, dr, dc), self._ray(cell, -dr, -dc)) for dr, dc in DIRECTIONS)
+            for cell in range(self.size)
+        )
+        self._windows = None
+
+    def _ray(self, cell: int, dr: int, dc: int) -> Tuple[int, ...]:
+        r, c = divmod(cell, self.cols)
+        ray = []
+        for _ in range(self.k - 1):
+            r, c = r + dr, c + dc
+            if not (0 <= r < self.rows and 0 <= c < self.cols):
+                break
+            ray.append(r * self.cols + c)
+        return tuple(ray)
+
+    @property
+    def windows(self) -> np.ndarray:
+        """All k-cell winning windows as an (n_windows, k) array of cell indices."""
+        if self._windows is None:
+            windows = []
+            for cell in range(self.size):
+                for forward, _ in self.rays[cell]:
+                    if len(forward) == self.k - 1:
+                        windows.append((cell,) + forward)
+            self._windows = np.array(windows, dtype=np.intp).reshape(-1, self.k)
+        return self._windows
+
+    def new_board(self) -> "MNKBoard":
+        """Return an empty board for this game."""
+        return MNKBoard(self)
+
+    def __repr__(self) -> str:
+        return f"MNKGame({self.rows}, {self.cols}, {self.k})"
+
+TICTACTOE = MNKGame(3, 3, 3)
+
+class MNKBoard:
+    """A mutable m,n,k position with incremental win detection and undo."""
+
+    __slots__ = ("game", "cells", "legal", "history", "player", "result")
+
+    def __init__(self, game: MNKGame = TICTACTOE):
+        self.game = game
+        self.cells = [0] * game.size
+        self.legal = set(range(game.size))
+        self.history: List[int] = []
+        self.player = 1
+        self.result = -1
+
+    @classmethod
+    def from_cells(cls, cells: Sequence[int], game: Optional[MNKGame] = None) -> "MNKBoard":
+        """Build a board from a cell sequence such as a 3x3 tuple board.
+
+        The player to move comes from the piece counts and the result from
+        a full scan, so any position reachable in play is accepted.
+        """
+        game = game or TICTACTOE
+        if len(cells) != game.size:
+            raise ValueError(f"expected {game.size} cells, got {len(cells)}")
+        board = cls(game)
+        board.cells = list(cells)
+        board.legal = {i for i, cell in enumerate(cells) if cell == 0}
+        board.player = 1 if board.cells.count(1) == board.cells.count(2) else 2
+        for cell, owner in enumerate(board.cells):
+            if owner and board._completes_line(cell, owner):
+                board.result = owner
+                break
+        else:
+            board.result = -1 if board.legal else 0
+        return board
+
+    def copy(self) -> "MNKBoard":
+        """Return an independent copy of this position."""
+        board = MNKBoard.__new__(MNKBoard)
+        board.game = self.game
+        board.cells = self.cells.copy()
+        board.legal = self.legal.copy()
+        board.history = self.history.copy()
+        board.player = self.player
+        board.result = self.result
+        return board
+
+    def _completes_line(self, cell: int, player: int) -> bool:
+        """Return True if ``player`` has k in a row through ``cell``."""
+        cells = self.cells
+        k = self.game.k
+        for forward, backward in self.game.rays[cell]:
+            count = 1
+            for other in forward:
+                if cells[other] != player:
+                    break
+                count += 1
+            for other in backward:
+                if cells[other] != player:
+                    break
+                count += 1
+            if count >= k:
+                return True
+        return False
+
+    def play(self, cell: int) -> int:
+        """Place the current player's piece on ``cell`` and return the result."""
+        if self.result != -1:
+            raise ValueError("game is already over")
+        if cell not in self.legal:
+            raise ValueError(f"cell {cell} is not empty")
+        player = self.player
+        self.cells[cell] = player
+        self.legal.discard(cell)
+        self.history.append(cell)
+        if self._completes_line(cell, player):
+            self.result = player
+        elif not self.legal:
+            self.result = 0
+        self.player = 3 - player
+        return self.result
+
+    def undo(self) -> int:
+        """Take back the last move and return its cell."""
+        cell = self.history.pop()
+        self.cells[cell] = 0
+        self.legal.add(cell)
+        self.player = 3 - self.player
+        self.result = -1
+        return cell
+
+    def to_tuple(self) -> Tuple[int, ...]:
+        """Return the cells as a tuple, e.g. the 3x3 tuple board format."""
+        return tuple(self.cells)
+
+    def __str__(self) -> str:
+        symbols = ['.', 'O', 'X']
+        cols = self.game.cols
+        lines = [' | '.join(symbols[cell] for cell in self.cells[i:i + cols])
+                 for i in range(0, self.game.size, cols)]
+        return ('\n' + '+'.join(['--'] + ['---'] * (cols - 2) + ['--']) + '\n').join(lines)
+
+def random_playout(board: MNKBoard, rng: Optional[np.random.Generator] = None) -> int:
+    """Finish the game on ``board`` with uniformly random moves; return the result.
+
+    The board is played out in place; copy it first to keep the position.
+    """
+    if board.result != -1:
+        return board.result
+    rng = np.random.default_rng(rng)
+    order = sorted(board.legal)
+    for index in rng.permutation(len(order)).tolist():
+        if board.play(order[index]) != -1:
+            break
+    return board.result
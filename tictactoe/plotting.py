@@ -0,0 +1,108 @@
+"""Plots of simulation results.
+
+matplotlib is imported inside the plotting functions, so importing this
+module (or the package) does not pay matplotlib's start-up cost.
+"""
+
+import numpy as np
+
+def create_clear_performance_plot(results_dict, title):
+    """Create a clear performance plot showing which policy wins each matchup."""
+    import matplotlib.pyplot as plt
+
+    strategies = list(results_dict.keys())
+    
+    fig, ax = plt.subplots(figsize=(14, 10))
+    
+    # Prepare data with policy-specific interpretation
+    draws = [results_dict[s][0] for s in strategies]
+    first_policy_wins = []  # Wins for the first policy (plays as O)
+    second_policy_wins = []  # Wins for the second policy (plays as X)
+    
+    for strategy in strategies:
+        draws_count, o_wins, x_wins = results_dict[strategy]
+        first_policy_wins.append(o_wins)
+        second_policy_wins.append(x_wins)
+    
+    # Create grouped bars
+    x_pos = np.arange(len(strategies))
+    width = 0.25
+    
+    # Create bars with policy-specific colors and labels
+    bars1 = ax.bar(x_pos - width, first_policy_wins, width, 
+                  label='First Policy Wins (plays as O)', color='#3498db', alpha=0.8)
+    bars2 = ax.bar(x_pos, second_policy_wins, width, 
+                  label='Second Policy Wins (plays as X)', color='#e74c3c', alpha=0.8)
+    bars3 = ax.bar(x_pos + width, draws, width, 
+                  label='Draws', color='#f39c12', alpha=0.8)
+    
+    # Customize plot
+    ax.set_xlabel('Policy Matchups', fontweight='bold', fontsize=12)
+    totals = {sum(results_dict[s]) for s in strategies}
+    ylabel = f'Number of Games (out of {totals.pop()})' if len(totals) == 1 else 'Number of Games'
+    ax.set_ylabel(ylabel, fontweight='bold', fontsize=12)
+    ax.set_title(title, fontsize=14, fontweight='bold')
+    ax.set_xticks(x_pos)
+    
+    # Create clear matchup labels showing which policy is which
+    matchup_labels = []
+    for strategy in strategies:
+        parts = strategy.split(' vs ')
+        matchup_labels.append(f"{parts[0]} (O)\nvs\n{parts[1]} (X)")
+    
+    ax.set_xticklabels(matchup_labels, fontsize=10, fontweight='bold')
+    ax.legend(bbox_to_anchor=(1.05, 1), loc='upper left')
+    
+    # Label offsets scale with the tallest bar, whatever the game count
+    max_height = max(first_policy_wins + second_policy_wins + draws)
+    pad = max(max_height, 1) / 40
+
+    # Add value labels with explicit policy information
+    for i, strategy in enumerate(strategies):
+        draws_count, o_wins, x_wins = results_dict[strategy]
+        parts = strategy.split(' vs ')
+        
+        # Label for first policy (O wins)
+        ax.text(i - width, o_wins + pad, 
+               f'{parts[0]}\n{o_wins} wins', 
+               ha='center', va='bottom', fontsize=9, fontweight='bold',
+               bbox=dict(facecolor='lightblue', alpha=0.7, boxstyle='round,pad=0.3'))
+        
+        # Label for second policy (X wins)
+        ax.text(i, x_wins + pad, 
+               f'{parts[1]}\n{x_wins} wins', 
+               ha='center', va='bottom', fontsize=9, fontweight='bold',
+               bbox=dict(facecolor='lightcoral', alpha=0.7, boxstyle='round,pad=0.3'))
+        
+        # Label for draws
+        ax.text(i + width, draws_count + pad, 
+               f'Draws\n{draws_count}', 
+               ha='center', va='bottom', fontsize=9, fontweight='bold',
+               bbox=dict(facecolor='lightyellow', alpha=0.7, boxstyle='round,pad=0.3'))
+    
+    # Add overall winner indicators
+    for i, strategy in enumerate(strategies):
+        draws_count, o_wins, x_wins = results_dict[strategy]
+        parts = strategy.split(' vs ')
+        
+        if o_wins > x_wins:
+            winner_text = f"Winner: {parts[0]}"
+            ax.text(i - width, max(o_wins, x_wins) + 4 * pad, winner_text, 
+                   ha='center', va='bottom', fontweight='bold', color='green', fontsize=11,
+                   bbox=dict(facecolor='yellow', alpha=0.8, boxstyle='round,pad=0.5'))
+        elif x_wins > o_wins:
+            winner_text = f"Winner: {parts[1]}"
+            ax.text(i, max(o_wins, x_wins) + 4 * pad, winner_text, 
+                   ha='center', va='bottom', fontweight='bold', color='green', fontsize=11,
+                   bbox=dict(facecolor='yellow', alpha=0.8, boxstyle='round,pad=0.5'))
+        else:
+            draw_text = "Draw"
+            ax.text(i, max(o_wins, x_wins) + 4 * pad, draw_text, 
+                   ha='center', va='bottom', fontweight='bold', color='orange', fontsize=11,
+                   bbox=dict(facecolor='lightyellow', alpha=0.8, boxstyle='round,pad=0.5'))
+    # Dynamically extend y-axis to accommodate winner labels
+    ax.set_ylim(0, max_height + 6 * pad)
+
+
+    plt.tight_layout()
+    return fig
@@ -1,10 +1,18 @@
 """Policy implementations for Tic-Tac-Toe."""
 
+import pickle
+import struct
+import zipfile
 import numpy as np
-from typing import Dict, Tuple
+from collections.abc import Mapping, MutableMapping
+from pathlib import Path
+from typing import Dict, Iterator, Optional, Tuple, Union
 from .game import get_empty_cells
+from .board import LEGAL, N_STATES, decode, encode
+from .profiling import count, instrumented
 
 Policy = Dict[Tuple[int, ...], np.ndarray]
+PolicyLike = Union[Policy, np.ndarray]
 
 def create_random_policy(perfect_policy: Policy) -> Policy:
     """Create a random policy based on perfect policy structure."""
@@ -14,6 +22,7 @@ def create_random_policy(perfect_policy: Policy) -> Policy:
         random_policy[board] = np.ones(n_moves) / n_moves
     return random_policy
 
+@instrumented()
 def convert_to_fixed_length(policy: Policy) -> Policy:
     """Convert variable-length policy to fixed-length."""
     fixed_policy = {}
@@ -23,10 +32,14 @@ def convert_to_fixed_length(policy: Policy) -> Policy:
         for i, cell in enumerate(empty_cells):
             fixed_probs[cell] = probs[i]
         fixed_policy[board] = fixed_probs
+    count("states_converted", len(fixed_policy))
     return fixed_policy
 
 def get_valid_move_probs(board: Tuple[int, ...], policy: Policy) -> np.ndarray:
     """Get valid move probabilities for current board state."""
+    if isinstance(policy, CompiledPolicy):
+        return policy.move_probs(board)
+
     empty_cells = get_empty_cells(board)
     
     if board not in policy:
@@ -35,4 +48,252 @@ def get_valid_move_probs(board: Tuple[int, ...], policy: Policy) -> np.ndarray:
     probs = policy[board][empty_cells]
     if np.sum(probs) > 0:
         return probs / np.sum(probs)
-    return np.ones(len(empty_cells)) / len(empty_cells)
\ No newline at end of file
+    return np.ones(len(empty_cells)) / len(empty_cells)
+
+def policy_table(policy: Union[Policy, "DensePolicy"]) -> np.ndarray:
+    """Build a dense (3^9, 9) table of normalized move probabilities.
+
+    Expects a fixed-length policy (see ``convert_to_fixed_length``). Rows
+    are indexed by integer board code (see ``tictactoe.board``) and mirror
+    ``get_valid_move_probs``: boards missing from the policy, or whose
+    probabilities over the empty cells sum to zero, get a uniform
+    distribution. Terminal boards get an all-zero row.
+    """
+    table = LEGAL.astype(np.float64)
+    if len(policy):
+        if isinstance(policy, CompiledPolicy):
+            policy = policy.policy
+        if isinstance(policy, DensePolicy):
+            states, rows = policy.states, policy.probs.astype(np.float64)
+        else:
+            states = np.fromiter((encode(board) for board in policy), dtype=np.int64, count=len(policy))
+            rows = [np.asarray(probs, dtype=np.float64) for probs in policy.values()]
+            if any(row.shape != (9,) for row in rows):
+                raise ValueError("policy_table needs a fixed-length policy with 9 probabilities "
+                                 "per board; convert it with convert_to_fixed_length first")
+            rows = np.array(rows)
+        rows = np.where(LEGAL[states], rows, 0.0)
+        known = rows.sum(axis=1) > 0
+        table[states[known]] = rows[known]
+    totals = table.sum(axis=1, keepdims=True)
+    np.divide(table, totals, out=table, where=totals > 0)
+    return table
+
+def as_policy_table(policy: PolicyLike) -> np.ndarray:
+    """Return ``policy`` as a dense table, building one if given a dict."""
+    return policy if isinstance(policy, np.ndarray) else policy_table(policy)
+
+class DensePolicy(Mapping):
+    """A fixed-length policy held in one contiguous (n_states, 9) array.
+
+    Row ``i`` of ``probs`` holds the move probabilities of the board whose
+    integer code is ``states[i]``. Lookups go through a 3^9 code-to-row
+    index, so the object behaves like a ``Policy`` dict: rows come back as
+    views, and assigning to an existing board overwrites its row in place.
+    """
+
+    def __init__(self, states: np.ndarray, probs: np.ndarray):
+        self.states = np.asarray(states, dtype=np.int32)
+        self.probs = probs
+        self._rows = np.full(N_STATES, -1, dtype=np.int32)
+        self._rows[self.states] = np.arange(len(self.states), dtype=np.int32)
+
+    @classmethod
+    def from_dict(cls, policy: Policy, dtype: np.dtype = np.float32) -> "DensePolicy":
+        """Pack a fixed-length policy dict, keeping its key order.
+
+        float32 halves the footprint; use ``dtype=np.float64`` for a
+        bit-exact round trip through ``to_dict``.
+        """
+        states = np.fromiter((encode(board) for board in policy), dtype=np.int32, count=len(policy))
+        probs = np.zeros((len(policy), 9), dtype=dtype)
+        for row, values in enumerate(policy.values()):
+            probs[row] = values
+        return cls(states, probs)
+
+    def to_dict(self) -> Policy:
+        """Unpack into a plain fixed-length policy dict of float64 arrays."""
+        return {decode(state): row.astype(np.float64)
+                for state, row in zip(self.states.tolist(), self.probs)}
+
+    def _row(self, board: Tuple[int, ...]) -> int:
+        row = self._rows[encode(board)]
+        if row < 0:
+            raise KeyError(board)
+        return row
+
+    def __getitem__(self, board: Tuple[int, ...]) -> np.ndarray:
+        return self.probs[self._row(board)]
+
+    def __setitem__(self, board: Tuple[int, ...], probs: np.ndarray) -> None:
+        """Overwrite the row of a stored board; new boards cannot be added."""
+        self.probs[self._row(board)] = probs
+
+    def __contains__(self, board: object) -> bool:
+        try:
+            return self._rows[encode(board)] >= 0
+        except (TypeError, IndexError):
+            return False
+
+    def __iter__(self) -> Iterator[Tuple[int, ...]]:
+        return (decode(state) for state in self.states.tolist())
+
+    def __len__(self) -> int:
+        return len(self.states)
+
+    def update_rows(self, states: np.ndarray, probs: np.ndarray) -> "DensePolicy":
+        """Write the rows of board codes ``states`` and return the updated policy.
+
+        Rows are overwritten in place when every board is already stored
+        and ``probs`` is writable. Otherwise a new in-memory policy, with
+        any missing boards appended, is returned and this one is unchanged.
+        """
+        states = np.asarray(states, dtype=np.int32)
+        rows = self._rows[states]
+        missing = rows < 0
+        if not missing.any() and self.probs.flags.writeable:
+            self.probs[rows] = probs
+            return self
+        grown = DensePolicy(np.concatenate([self.states, states[missing]]),
+                            np.concatenate([self.probs, np.zeros((missing.sum(), 9), self.probs.dtype)]))
+        grown.probs[grown._rows[states]] = probs
+        return grown
+
+    def copy(self) -> "DensePolicy":
+        """Return an in-memory, writable copy (also of a memory-mapped policy)."""
+        return DensePolicy(self.states.copy(), np.array(self.probs))
+
+    def save(self, path: Union[str, Path]) -> None:
+        """Write an uncompressed ``.npz`` file that ``load`` can memory-map."""
+        with open(path, "wb") as f:
+            np.savez(f, states=self.states, probs=np.ascontiguousarray(self.probs))
+
+    @classmethod
+    def load(cls, path: Union[str, Path], mmap_mode: str = "r") -> "DensePolicy":
+        """Open a policy saved by ``save``.
+
+        The probability block is memory-mapped straight out of the archive,
+        so loading costs one small header read regardless of policy size.
+        Pass ``mmap_mode=None`` to read everything into memory instead.
+        """
+        if mmap_mode is None:
+            with np.load(path) as data:
+                return cls(data["states"], data["probs"])
+        return cls(np.array(_memmap_npz_member(path, "states", "r")),
+                   _memmap_npz_member(path, "probs", mmap_mode))
+
+_NPY_HEADER_READERS = {
+    (1, 0): np.lib.format.read_array_header_1_0,
+    (2, 0): np.lib.format.read_array_header_2_0,
+}
+
+def _memmap_npz_member(path: Union[str, Path], name: str, mmap_mode: str) -> np.ndarray:
+    """Memory-map one uncompressed array stored inside an ``.npz`` archive."""
+    with zipfile.ZipFile(path) as archive:
+        info = archive.getinfo(name + ".npy")
+    if info.compress_type != zipfile.ZIP_STORED:
+        raise ValueError(f"{name} in {path} is compressed and cannot be memory-mapped")
+
+    with open(path, "rb") as f:
+        # Skip the local file header: 30 fixed bytes, then name and extra field.
+        f.seek(info.header_offset + 26)
+        name_length, extra_length = struct.unpack("<HH", f.read(4))
+        f.seek(info.header_offset + 30 + name_length + extra_length)
+        version = np.lib.format.read_magic(f)
+        shape, fortran_order, dtype = _NPY_HEADER_READERS[version](f)
+        offset = f.tell()
+
+    return np.memmap(path, dtype=dtype, mode=mmap_mode, shape=shape,
+                     order="F" if fortran_order else "C", offset=offset)
+
+def load_policy(path: Union[str, Path]) -> Union[Policy, DensePolicy]:
+    """Load a pickled policy dict or, for ``.npz`` files, a memory-mapped DensePolicy."""
+    if Path(path).suffix == ".npz":
+        return DensePolicy.load(path)
+    with open(path, "rb") as f:
+        return pickle.load(f)
+
+class CompiledPolicy(MutableMapping):
+    """A policy wrapper that caches each board's legal moves and sampling CDF.
+
+    The first lookup of a board runs the ``get_valid_move_probs`` logic
+    once and keeps the empty cells, normalized probabilities and their
+    cumulative sum; after that ``sample`` is a dict lookup plus one uniform
+    draw. Reads and writes pass through to the wrapped policy, and writes
+    drop the board's cached entry. Mutating a returned row in place
+    bypasses this, so call ``invalidate`` afterwards.
+    """
+
+    def __init__(self, policy: Policy):
+        self.policy = policy
+        self._cache: Dict[Tuple[int, ...], Tuple[np.ndarray, np.ndarray, np.ndarray]] = {}
+
+    def _entry(self, board: Tuple[int, ...]) -> Tuple[np.ndarray, np.ndarray, np.ndarray]:
+        entry = self._cache.get(board)
+        if entry is None:
+            moves = np.array(get_empty_cells(board))
+            probs = get_valid_move_probs(board, self.policy)
+            cdf = np.cumsum(probs)
+            cdf /= cdf[-1]
+            entry = self._cache[board] = (moves, probs, cdf)
+        return entry
+
+    def move_probs(self, board: Tuple[int, ...]) -> np.ndarray:
+        """Normalized probabilities over ``get_empty_cells(board)``."""
+        return self._entry(board)[1]
+
+    def sample(self, board: Tuple[int, ...], rng: Optional[np.random.Generator] = None) -> int:
+        """Draw a move for ``board``.
+
+        Without ``rng`` the global NumPy generator is used, consuming the
+        same single draw as ``np.random.choice(moves, p=probs)`` would.
+        """
+        moves, _, cdf = self._entry(board)
+        u = np.random.random_sample() if rng is None else rng.random()
+        return int(moves[np.searchsorted(cdf, u, side="right")])
+
+    def precompile(self) -> None:
+        """Fill the cache for every board of the wrapped policy up front."""
+        for board in self.policy:
+            self._entry(board)
+
+    def invalidate(self, board: Optional[Tuple[int, ...]] = None) -> None:
+        """Forget the cached entry of ``board``, or of every board."""
+        if board is None:
+            self._cache.clear()
+        else:
+            self._cache.pop(board, None)
+
+    def __getitem__(self, board: Tuple[int, ...]) -> np.ndarray:
+        return self.policy[board]
+
+    def __setitem__(self, board: Tuple[int, ...], probs: np.ndarray) -> None:
+        self.policy[board] = probs
+        self._cache.pop(board, None)
+
+    def __delitem__(self, board: Tuple[int, ...]) -> None:
+        del self.policy[board]
+        self._cache.pop(board, None)
+
+    def __contains__(self, board: object) -> bool:
+        return board in self.policy
+
+    def __iter__(self) -> Iterator[Tuple[int, ...]]:
+        return iter(self.policy)
+
+    def __len__(self) -> int:
+        return len(self.policy)
+
+    def copy(self) -> "CompiledPolicy":
+        """Return a compiled copy of a copy of the wrapped policy."""
+        return CompiledPolicy(self.policy.copy())
+
+def compile_policy(policy):
+    """Wrap a mapping policy in a ``CompiledPolicy``; leave anything else as is.
+
+    Search-based agents such as ``MCTSAgent`` answer each lookup afresh
+    and must not be cached, so only mappings are wrapped.
+    """
+    if isinstance(policy, Mapping) and not isinstance(policy, CompiledPolicy):
+        return CompiledPolicy(policy)
+    return policy
\ No newline at end of file
@@ -0,0 +1,151 @@
+"""Lightweight timing and counter instrumentation.
+
+Three kinds of measurement, all off by default:
+
+* ``stage(name)`` times a block of the pipeline (loading, training, ...);
+* ``@instrumented(name)`` counts calls and time of a hot function;
+* ``count(name, n)`` adds to a counter such as games, moves, episodes or
+  states visited. Counts made inside a stage are also credited to it, so
+  ``report()`` can give per-stage rates like games/sec.
+
+Set the ``TICTACTOE_PROFILE`` environment variable, or call ``enable()``,
+to switch measurement on. ``instrumented`` decides when the function is
+defined: while profiling is off it returns the function itself, so the
+hot paths in ``tictactoe.game`` pay nothing. Calling ``enable()`` only
+instruments modules imported afterwards.
+
+``report()`` returns everything as a JSON-ready dict and ``save_report``
+writes it; ``cprofile(path)`` runs a block under cProfile and dumps the
+stats for ``pstats``.
+"""
+
+import os
+import time
+from contextlib import contextmanager
+from functools import wraps
+from typing import Dict, List, Optional
+
+ENV_VAR = "TICTACTOE_PROFILE"
+
+_enabled = os.environ.get(ENV_VAR, "") not in ("", "0")
+_stages: Dict[str, Dict] = {}
+_functions: Dict[str, List[float]] = {}
+_counters: Dict[str, int] = {}
+_active: List[str] = []
+
+def enabled() -> bool:
+    """Return True if measurements are being recorded."""
+    return _enabled
+
+def enable() -> None:
+    """Start recording; functions defined from now on are instrumented."""
+    global _enabled
+    _enabled = True
+
+def disable() -> None:
+    """Stop recording; collected data is kept until ``reset``."""
+    global _enabled
+    _enabled = False
+
+def reset() -> None:
+    """Drop every recorded timing and counter."""
+    _stages.clear()
+    _functions.clear()
+    _counters.clear()
+
+class stage:
+    """Context manager timing one pipeline stage; a no-op while disabled."""
+
+    __slots__ = ("name", "start")
+
+    def __init__(self, name: str):
+        self.name = name
+        self.start = 0.0
+
+    def __enter__(self) -> "stage":
+        if _enabled:
+            _active.append(self.name)
+            self.start = time.perf_counter()
+        return self
+
+    def __exit__(self, *exc) -> None:
+        if not self.start:
+            return
+        elapsed = time.perf_counter() - self.start
+        _active.remove(self.name)
+        entry = _stages.setdefault(self.name, {"calls": 0, "seconds": 0.0, "counters": {}})
+        entry["calls"] += 1
+        entry["seconds"] += elapsed
+
+def count(name: str, n: int = 1) -> None:
+    """Add ``n`` to counter ``name`` and to that counter of every active stage."""
+    if not _enabled:
+        return
+    _counters[name] = _counters.get(name, 0) + n
+    for active in set(_active):
+        counters = _stages.setdefault(active, {"calls": 0, "seconds": 0.0, "counters": {}})["counters"]
+        counters[name] = counters.get(name, 0) + n
+
+def instrumented(name: Optional[str] = None):
+    """Decorator recording call counts and total time of a function.
+
+    Returns the function unchanged unless profiling is enabled when the
+    decorator runs, i.e. when the defining module is imported.
+    """
+    def decorate(func):
+        if not _enabled:
+            return func
+        key = name or f"{func.__module__}.{func.__qualname__}"
+        totals = _functions.setdefault(key, [0, 0.0])
+
+        @wraps(func)
+        def wrapper(*args, **kwargs):
+            start = time.perf_counter()
+            try:
+                return func(*args, **kwargs)
+            finally:
+                totals[0] += 1
+                totals[1] += time.perf_counter() - start
+        return wrapper
+    return decorate
+
+def report() -> Dict:
+    """Return stage timings, per-stage rates, function timings and counters."""
+    stages = {}
+    for name, entry in _stages.items():
+        seconds = entry["seconds"]
+        rates = {f"{counter}/sec": value / seconds
+                 for counter, value in entry["counters"].items() if seconds > 0}
+        stages[name] = dict(entry, counters=dict(entry["counters"]), rates=rates)
+    functions = {name: {"calls": calls, "seconds": seconds}
+                 for name, (calls, seconds) in _functions.items() if calls}
+    return {"stages": stages, "functions": functions, "counters": dict(_counters)}
+
+def save_report(path: str) -> None:
+    """Write ``report()`` to ``path`` as JSON."""
+    import json
+
+    with open(path, "w") as f:
+        json.dump(report(), f, indent=2)
+        f.write("\n")
+
+@contextmanager
+def cprofile(path: Optional[str] = None, sort: str = "cumulative", limit: int = 25):
+    """Run the block under cProfile.
+
+    With a ``path`` the raw stats are dumped there for ``pstats`` or
+    snakeviz; otherwise the ``limit`` top entries by ``sort`` are printed.
+    """
+    import cProfile
+    import pstats
+
+    profiler = cProfile.Profile()
+    profiler.enable()
+    try:
+        yield profiler
+    finally:
+        profiler.disable()
+        if path is None:
+            pstats.Stats(profiler).sort_stats(sort).print_stats(limit)
+        else:
+            profiler.dump_stats(path)
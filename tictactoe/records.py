@@ -0,0 +1,152 @@
+"""Append-only binary game records and lazy replay readers.
+
+A record file starts with the 4-byte magic ``b"TTT1"`` followed by
+fixed-width 10-byte records, one per game:
+
+* byte 0: outcome (0 draw, 1 O wins, 2 X wins) in bits 0-1 and the number
+  of moves in bits 2-5;
+* bytes 1-9: one byte per move, the cell in bits 0-3 and the player
+  minus one in bit 4; unused move slots hold ``0xFF``.
+
+Fixed-width records let readers pull whole chunks into NumPy arrays, and
+appending never rewrites existing data.
+"""
+
+import numpy as np
+from pathlib import Path
+from typing import Iterator, NamedTuple, Sequence, Tuple, Union
+from .board import POW3
+from .game import make_move
+
+MAGIC = b"TTT1"
+RECORD_SIZE = 10
+EMPTY_SLOT = 0xFF
+
+class GameRecord(NamedTuple):
+    """One logged game."""
+    moves: Tuple[int, ...]
+    players: Tuple[int, ...]
+    outcome: int
+
+def encode_records(moves: np.ndarray, players: np.ndarray, outcomes: np.ndarray) -> np.ndarray:
+    """Pack games into an (n, 10) uint8 record array.
+
+    ``moves`` and ``players`` are (n, 9) arrays padded with -1 after each
+    game's last move; ``outcomes`` holds the final results.
+    """
+    moves = np.asarray(moves)
+    played = moves >= 0
+    records = np.full((len(moves), RECORD_SIZE), EMPTY_SLOT, dtype=np.uint8)
+    records[:, 0] = np.asarray(outcomes, dtype=np.uint8) | (played.sum(axis=1).astype(np.uint8) << 2)
+    packed = (moves | ((np.asarray(players) - 1) << 4)).astype(np.uint8)
+    records[:, 1:] = np.where(played, packed, EMPTY_SLOT)
+    return records
+
+def decode_records(records: np.ndarray) -> Tuple[np.ndarray, np.ndarray, np.ndarray]:
+    """Unpack a record array into (moves, players, outcomes); padding is -1."""
+    body = records[:, 1:].astype(np.int16)
+    played = body != EMPTY_SLOT
+    moves = np.where(played, body & 0x0F, -1)
+    players = np.where(played, (body >> 4) + 1, -1)
+    return moves, players, (records[:, 0] & 0x03).astype(np.int8)
+
+def record_states(moves: np.ndarray, players: np.ndarray) -> np.ndarray:
+    """Return the (n, 9) board codes before each decoded move; padding is -1.
+
+    Codes are built with a running sum over the move columns, so a whole
+    chunk is replayed without stepping through the games.
+    """
+    played = moves >= 0
+    contribution = np.where(played, players * POW3[np.maximum(moves, 0)], 0)
+    return np.where(played, np.cumsum(contribution, axis=1) - contribution, -1).astype(np.int32)
+
+class GameRecordWriter:
+    """Buffered appender for a record file; use as a context manager."""
+
+    def __init__(self, path: Union[str, Path], buffer_games: int = 4096):
+        self.path = Path(path)
+        self._file = open(self.path, "ab")
+        if self._file.tell() == 0:
+            self._file.write(MAGIC)
+        self._buffer = []
+        self._buffered = 0
+        self.buffer_games = buffer_games
+        self.games_written = 0
+
+    def write(self, moves: Sequence[int], outcome: int, first_player: int = 1) -> None:
+        """Append one game given its moves in order, players alternating."""
+        row = np.full((1, 9), -1, dtype=np.int16)
+        row[0, :len(moves)] = moves
+        players = np.where(np.arange(9) % 2 == 0, first_player, 3 - first_player)[None, :]
+        self.write_batch(row, players, [outcome])
+
+    def write_batch(self, moves: np.ndarray, players: np.ndarray, outcomes: Sequence[int]) -> None:
+        """Append many games at once; see ``encode_records`` for the layout."""
+        records = encode_records(moves, players, np.asarray(outcomes))
+        self._buffer.append(records)
+        self._buffered += len(records)
+        self.games_written += len(records)
+        if self._buffered >= self.buffer_games:
+            self.flush()
+
+    def flush(self) -> None:
+        """Write buffered records to disk."""
+        for records in self._buffer:
+            self._file.write(records.tobytes())
+        self._buffer.clear()
+        self._buffered = 0
+        self._file.flush()
+
+    def close(self) -> None:
+        """Flush and close the file."""
+        if not self._file.closed:
+            self.flush()
+            self._file.close()
+
+    def __enter__(self) -> "GameRecordWriter":
+        return self
+
+    def __exit__(self, *exc) -> None:
+        self.close()
+
+def iter_record_chunks(path: Union[str, Path], chunk_games: int = 65536) -> Iterator[np.ndarray]:
+    """Yield the file's records as (n, 10) uint8 arrays of up to ``chunk_games`` rows."""
+    with open(path, "rb") as f:
+        if f.read(len(MAGIC)) != MAGIC:
+            raise ValueError(f"{path} is not a game record file")
+        while True:
+            data = f.read(chunk_games * RECORD_SIZE)
+            if not data:
+                return
+            usable = len(data) - len(data) % RECORD_SIZE
+            yield np.frombuffer(data[:usable], dtype=np.uint8).reshape(-1, RECORD_SIZE)
+
+def iter_games(path: Union[str, Path], chunk_games: int = 65536) -> Iterator[GameRecord]:
+    """Lazily yield every game in a record file."""
+    for chunk in iter_record_chunks(path, chunk_games):
+        moves, players, outcomes = decode_records(chunk)
+        for row_moves, row_players, outcome in zip(moves.tolist(), players.tolist(), outcomes.tolist()):
+            n = row_moves.index(-1) if -1 in row_moves else 9
+            yield GameRecord(tuple(row_moves[:n]), tuple(row_players[:n]), outcome)
+
+def iter_transitions(
+    path: Union[str, Path],
+    gamma: float = 1.0,
+    chunk_games: int = 65536
+) -> Iterator[Tuple[Tuple[int, ...], int, float]]:
+    """Lazily yield (state, action, return) for every move of every game.
+
+    The return is the final reward from the mover's point of view (+1 win,
+    -1 loss, 0 draw), discounted by ``gamma`` per remaining move.
+    """
+    for game in iter_games(path, chunk_games):
+        board = (0,) * 9
+        n = len(game.moves)
+        for t, (move, player) in enumerate(zip(game.moves, game.players)):
+            reward = 0 if game.outcome == 0 else (1 if game.outcome == player else -1)
+            yield board, move, reward * gamma ** (n - 1 - t)
+            board = make_move(board, move, player)
+
+def count_games(path: Union[str, Path]) -> int:
+    """Return the number of complete records in a file without reading it."""
+    return (Path(path).stat().st_size - len(MAGIC)) // RECORD_SIZE
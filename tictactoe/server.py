@@ -0,0 +1,279 @@
+"""Asynchronous move server speaking line-delimited JSON over TCP.
+
+Each request is one JSON object per line::
+
+    {"id": 7, "board": [0, 0, 0, 0, 1, 0, 0, 0, 0]}
+    {"id": 8, "board": [...], "op": "move"}
+    {"op": "stats"}
+
+``op`` defaults to ``"probs"``, answered with the empty cells and their
+probabilities exactly as ``get_valid_move_probs`` would give them, plus
+the most likely move::
+
+    {"id": 7, "moves": [0, 1, 2, 3, 5, 6, 7, 8], "probs": [...], "best": 0}
+
+``"move"`` answers ``{"id": 8, "move": 3}`` with a move sampled from that
+distribution, and ``"stats"`` reports request counts, batch sizes and
+p50/p99 latency. Bad requests get ``{"id": ..., "error": "..."}``.
+
+The policy is turned into a dense table once at start-up. Requests from
+all connections go through one queue; the batcher takes whatever has
+arrived, waiting at most ``max_delay`` seconds for up to ``max_batch``
+requests, and answers the whole batch with one table gather. Responses
+on a connection come back in request order, so clients may pipeline.
+
+``run_load`` is a matching load generator for benchmarking.
+"""
+
+import asyncio
+import json
+import time
+from collections import deque
+from typing import Dict, List, Optional, Sequence, Tuple
+import numpy as np
+from .board import CELLS, POW3, TERMINAL
+from .policies import PolicyLike, as_policy_table
+
+class PolicyServer:
+    """Serve move distributions of one policy to concurrent TCP clients."""
+
+    def __init__(
+        self,
+        policy: PolicyLike,
+        host: str = "127.0.0.1",
+        port: int = 0,
+        max_batch: int = 256,
+        max_delay: float = 0.001,
+        latency_window: int = 100_000,
+        seed: Optional[int] = None
+    ):
+        self.table = as_policy_table(policy)
+        self._cdf = np.cumsum(self.table, axis=1)
+        self.host = host
+        self.port = port
+        self.max_batch = max_batch
+        self.max_delay = max_delay
+        self.rng = np.random.default_rng(seed)
+        self.requests = 0
+        self.batches = 0
+        self._latencies = deque(maxlen=latency_window)
+        self._queue: Optional[asyncio.Queue] = None
+        self._server: Optional[asyncio.AbstractServer] = None
+        self._batcher: Optional[asyncio.Task] = None
+
+    async def start(self) -> Tuple[str, int]:
+        """Start listening; return the bound (host, port)."""
+        self._queue = asyncio.Queue()
+        self._batcher = asyncio.ensure_future(self._run_batcher())
+        self._server = await asyncio.start_server(self._handle, self.host, self.port)
+        self.host, self.port = self._server.sockets[0].getsockname()[:2]
+        return self.host, self.port
+
+    async def serve_forever(self) -> None:
+        """Start if needed and serve until cancelled."""
+        if self._server is None:
+            await self.start()
+        await self._server.serve_forever()
+
+    async def close(self) -> None:
+        """Stop listening and stop the batcher."""
+        if self._server is not None:
+            self._server.close()
+            await self._server.wait_closed()
+        if self._batcher is not None:
+            self._batcher.cancel()
+            try:
+                await self._batcher
+            except asyncio.CancelledError:
+                pass
+
+    def stats(self) -> Dict[str, float]:
+        """Request and batch counts plus latency percentiles in milliseconds."""
+        latencies = np.array(self._latencies) * 1000
+        p50, p99 = np.percentile(latencies, [50, 99]) if latencies.size else (0.0, 0.0)
+        return {
+            "requests": self.requests,
+            "batches": self.batches,
+            "mean_batch": self.requests / max(self.batches, 1),
+            "p50_ms": float(p50),
+            "p99_ms": float(p99),
+        }
+
+    async def _handle(self, reader: asyncio.StreamReader, writer: asyncio.StreamWriter) -> None:
+        """Read requests and queue their answers; a writer task sends them in order."""
+        pending: asyncio.Queue = asyncio.Queue()
+        sender = asyncio.ensure_future(self._send(pending, writer))
+        try:
+            while True:
+                line = await reader.readline()
+                if not line:
+                    break
+                pending.put_nowait(self._submit(line, time.perf_counter()))
+        except ConnectionError:
+            pass
+        finally:
+            pending.put_nowait(None)
+            await sender
+            writer.close()
+
+    async def _send(self, pending: asyncio.Queue, writer: asyncio.StreamWriter) -> None:
+        while True:
+            response = await pending.get()
+            if response is None:
+                return
+            if isinstance(response, asyncio.Future):
+                response = await response
+            try:
+                writer.write(json.dumps(response).encode() + b"\n")
+                await writer.drain()
+            except ConnectionError:
+                return
+
+    def _submit(self, line: bytes, received: float):
+        """Validate one request; return the response or a future for it."""
+        try:
+            request = json.loads(line)
+            if not isinstance(request, dict):
+                raise ValueError("request must be a JSON object")
+        except ValueError as error:
+            return {"id": None, "error": f"invalid request: {error}"}
+        request_id = request.get("id")
+        op = request.get("op", "probs")
+        if op == "stats":
+            return dict(self.stats(), id=request_id)
+        if op not in ("probs", "move"):
+            return {"id": request_id, "error": f"unknown op {op!r}"}
+
+        board = request.get("board")
+        if (not isinstance(board, list) or len(board) != 9
+                or any(cell not in (0, 1, 2) or isinstance(cell, bool) for cell in board)):
+            return {"id": request_id, "error": "board must be a list of 9 cells in {0, 1, 2}"}
+        state = int(np.dot(board, POW3))
+        if TERMINAL[state]:
+            return {"id": request_id, "error": "game is over"}
+
+        future = asyncio.get_running_loop().create_future()
+        self._queue.put_nowait((state, op, request_id, received, future))
+        return future
+
+    async def _run_batcher(self) -> None:
+        queue = self._queue
+        while True:
+            batch = [await queue.get()]
+            deadline = time.perf_counter() + self.max_delay
+            while len(batch) < self.max_batch:
+                if not queue.empty():
+                    batch.append(queue.get_nowait())
+                    continue
+                remaining = deadline - time.perf_counter()
+                if remaining <= 0:
+                    break
+                try:
+                    batch.append(await asyncio.wait_for(queue.get(), remaining))
+                except asyncio.TimeoutError:
+                    break
+            self._answer(batch)
+
+    def _answer(self, batch: List[tuple]) -> None:
+        """Answer a batch of validated requests with one table gather."""
+        states = np.array([item[0] for item in batch])
+        rows = self.table[states]
+        sampled = (self._cdf[states] <= self.rng.random(len(batch))[:, None]
+                   * self._cdf[states, -1:]).sum(axis=1)
+        empty = CELLS[states] == 0
+        done = time.perf_counter()
+
+        for k, (_, op, request_id, received, future) in enumerate(batch):
+            if op == "move":
+                response = {"id": request_id, "move": int(sampled[k])}
+            else:
+                moves = np.flatnonzero(empty[k])
+                probs = rows[k, moves]
+                response = {"id": request_id, "moves": moves.tolist(), "probs": probs.tolist(),
+                            "best": int(moves[np.argmax(probs)])}
+            if not future.done():
+                future.set_result(response)
+            self._latencies.append(done - received)
+        self.requests += len(batch)
+        self.batches += 1
+
+def serve(policy: PolicyLike, host: str = "127.0.0.1", port: int = 8765, **options) -> None:
+    """Run a ``PolicyServer`` until interrupted."""
+    async def main():
+        server = PolicyServer(policy, host, port, **options)
+        host_, port_ = await server.start()
+        print(f"Serving on {host_}:{port_}")
+        try:
+            await server.serve_forever()
+        finally:
+            await server.close()
+    try:
+        asyncio.run(main())
+    except KeyboardInterrupt:
+        pass
+
+def sample_boards(n: int, seed: Optional[int] = None) -> List[List[int]]:
+    """Draw ``n`` ongoing boards with valid piece counts, for load tests."""
+    o_count, x_count = (CELLS == 1).sum(axis=1), (CELLS == 2).sum(axis=1)
+    valid = np.flatnonzero(~TERMINAL & ((o_count == x_count) | (o_count == x_count + 1)))
+    states = np.random.default_rng(seed).choice(valid, n)
+    return CELLS[states].tolist()
+
+async def run_load(
+    host: str,
+    port: int,
+    requests: int = 10000,
+    concurrency: int = 32,
+    pipeline: int = 1,
+    op: str = "probs",
+    boards: Optional[Sequence[Sequence[int]]] = None,
+    seed: Optional[int] = None
+) -> Dict[str, float]:
+    """Send ``requests`` queries over ``concurrency`` connections and time them.
+
+    Each connection keeps up to ``pipeline`` requests in flight. Returns
+    throughput and client-side p50/p99 latency in milliseconds, plus the
+    server's own statistics.
+    """
+    boards = list(boards) if boards is not None else sample_boards(min(requests, 4096), seed)
+    per_connection = [requests // concurrency + (c < requests % concurrency)
+                      for c in range(concurrency)]
+    latencies: List[float] = []
+    errors = 0
+
+    async def client(c: int, count: int) -> None:
+        nonlocal errors
+        reader, writer = await asyncio.open_connection(host, port)
+        sent_at = deque()
+        for start in range(0, count, pipeline):
+            chunk = range(start, min(start + pipeline, count))
+            for i in chunk:
+                board = boards[(c * 7919 + i) % len(boards)]
+                writer.write(json.dumps({"id": i, "op": op, "board": list(board)}).encode() + b"\n")
+                sent_at.append(time.perf_counter())
+            await writer.drain()
+            for _ in chunk:
+                response = json.loads(await reader.readline())
+                latencies.append(time.perf_counter() - sent_at.popleft())
+                errors += "error" in response
+        writer.close()
+
+    start = time.perf_counter()
+    await asyncio.gather(*(client(c, count) for c, count in enumerate(per_connection) if count))
+    elapsed = time.perf_counter() - start
+
+    reader, writer = await asyncio.open_connection(host, port)
+    writer.write(b'{"op": "stats"}\n')
+    server_stats = json.loads(await reader.readline())
+    writer.close()
+
+    p50, p99 = np.percentile(np.array(latencies) * 1000, [50, 99])
+    return {
+        "requests": len(latencies),
+        "errors": errors,
+        "seconds": elapsed,
+        "requests_per_sec": len(latencies) / elapsed,
+        "p50_ms": float(p50),
+        "p99_ms": float(p99),
+        "server": server_stats,
+    }
@@ -0,0 +1,230 @@
+"""Game simulation between two policies."""
+
+import numpy as np
+from typing import List, NamedTuple, Optional, Tuple, Union
+from .game import state_of_board, get_empty_cells, make_move
+from .board import POW3, STATUS
+from .policies import CompiledPolicy, Policy, PolicyLike, as_policy_table, compile_policy
+from .profiling import count, instrumented
+from .records import GameRecordWriter
+from .stats import sprt, wilson_interval
+
+def play_game(
+    policyA: Policy,
+    policyB: Policy,
+    recorder: Optional[GameRecordWriter] = None
+) -> int:
+    """Simulate a game between two policies, optionally logging it to ``recorder``."""
+    board = (0, 0, 0, 0, 0, 0, 0, 0, 0)
+    next_player = [0, 2, 1]
+    player = 1
+    history = []
+
+    while state_of_board(board) == -1:
+        current_policy = policyA if player == 1 else policyB
+        if isinstance(current_policy, CompiledPolicy):
+            chosen_location = current_policy.sample(board)
+        else:
+            locations = get_empty_cells(board)
+
+            # Get move probabilities
+            if board in current_policy:
+                probs = current_policy[board][locations]
+                if np.sum(probs) > 0:
+                    probs = probs / np.sum(probs)
+                else:
+                    probs = np.ones(len(locations)) / len(locations)
+            else:
+                probs = np.ones(len(locations)) / len(locations)
+
+            chosen_location = np.random.choice(locations, p=probs)
+
+        board = make_move(board, chosen_location, player)
+        history.append(chosen_location)
+        player = next_player[player]
+
+    count("games")
+    count("moves", len(history))
+    if recorder is not None:
+        recorder.write(history, state_of_board(board))
+    return state_of_board(board)
+
+# Player making each ply, O first.
+_PLY_PLAYERS = np.where(np.arange(9) % 2 == 0, 1, 2)
+
+def cdf_table(policy: PolicyLike) -> np.ndarray:
+    """Build a per-state cumulative move distribution for inverse-CDF sampling.
+
+    Accepts a policy dict or a table already built by ``policy_table``.
+    Each non-terminal row ends in exactly 1.0, so a uniform draw in [0, 1)
+    always lands on a move with non-zero probability.
+    """
+    cdf = np.cumsum(as_policy_table(policy), axis=1)
+    last = cdf[:, -1:].copy()
+    np.divide(cdf, last, out=cdf, where=last > 0)
+    return cdf
+
+@instrumented()
+def simulate_games(
+    policyA: PolicyLike,
+    policyB: PolicyLike,
+    num_games: int,
+    rng: Optional[Union[int, np.random.Generator]] = None,
+    chunk_size: int = 1 << 16,
+    recorder: Optional[GameRecordWriter] = None
+) -> List[int]:
+    """Play ``num_games`` games in lockstep and return [draws, O wins, X wins].
+
+    Boards are integer codes, so each ply is a table gather, one vectorized
+    inverse-CDF draw per active game and a status lookup. Games are played
+    in chunks of ``chunk_size`` to bound memory. With a ``recorder`` every
+    game is also appended to a record file, one chunk at a time.
+    """
+    rng = np.random.default_rng(rng)
+    cdfs = (None, cdf_table(policyA), cdf_table(policyB))
+    results = np.zeros(3, dtype=np.int64)
+    for start in range(0, num_games, chunk_size):
+        results += _play_batch(cdfs, min(chunk_size, num_games - start), rng, recorder)
+    return results.tolist()
+
+def _play_batch(
+    cdfs: Tuple[None, np.ndarray, np.ndarray],
+    n: int,
+    rng: np.random.Generator,
+    recorder: Optional[GameRecordWriter] = None
+) -> np.ndarray:
+    """Play ``n`` games from per-player CDF tables; return [draws, O wins, X wins]."""
+    results = np.zeros(3, dtype=np.int64)
+    states = np.zeros(n, dtype=np.int32)
+    active = np.arange(n)
+    history = np.full((n, 9), -1, dtype=np.int16)
+    outcomes = np.zeros(n, dtype=np.int8)
+    player = 1
+    for ply in range(9):
+        count("moves", states.size)
+        u = rng.random(states.size)
+        moves = (cdfs[player][states] <= u[:, None]).sum(axis=1)
+        if recorder is not None:
+            history[active, ply] = moves
+        states = states + player * POW3[moves]
+        outcome = STATUS[states]
+        done = outcome != -1
+        results += np.bincount(outcome[done], minlength=3)
+        outcomes[active[done]] = outcome[done]
+        states, active = states[~done], active[~done]
+        player = 3 - player
+        if not states.size:
+            break
+
+    if recorder is not None:
+        players = np.where(history >= 0, _PLY_PLAYERS, -1)
+        recorder.write_batch(history, players, outcomes)
+    count("games", n)
+    return results
+
+class AdaptiveResult(NamedTuple):
+    """Outcome of ``simulate_adaptive``.
+
+    ``counts`` and ``games`` cover the games with policyA as O. With the
+    sequential test, ``swapped`` holds as many games played with the
+    seats swapped (policyB as O), otherwise zeros. ``decision`` is 1 if
+    the test found policyA stronger, -1 if it found policyB stronger and
+    0 otherwise; ``reason`` is "precision", "sequential test" or
+    "max games".
+    """
+    counts: List[int]
+    games: int
+    decision: int
+    reason: str
+    swapped: List[int]
+
+def simulate_adaptive(
+    policyA: PolicyLike,
+    policyB: PolicyLike,
+    precision: float = 0.01,
+    max_games: int = 1_000_000,
+    batch_size: int = 100,
+    sequential: bool = True,
+    delta: float = 0.05,
+    alpha: float = 0.05,
+    beta: float = 0.05,
+    z: float = 1.96,
+    rng: Optional[Union[int, np.random.Generator]] = None,
+    recorder: Optional[GameRecordWriter] = None
+) -> AdaptiveResult:
+    """Play batches of games until the result is settled.
+
+    Stops once every Wilson interval on the draw, O-win and X-win rates
+    has a half-width of at most ``precision``, or, with ``sequential``,
+    once ``stats.sprt`` settles whether either policy is stronger, or
+    after ``max_games`` games. The intervals are checked after every
+    batch, so their nominal coverage is optimistic; pick a larger ``z``
+    when that matters.
+
+    The first player wins most decisive games even between identical
+    policies, so the sequential test does not compare O and X wins.
+    Every batch is also played with the seats swapped, and the test
+    scores each policy's wins over both seats. Only games with policyA
+    as O are logged to ``recorder``.
+    """
+    rng = np.random.default_rng(rng)
+    cdf_a, cdf_b = cdf_table(policyA), cdf_table(policyB)
+    cdfs, swapped_cdfs = (None, cdf_a, cdf_b), (None, cdf_b, cdf_a)
+    results = np.zeros(3, dtype=np.int64)
+    swapped = np.zeros(3, dtype=np.int64)
+    games, decision, reason = 0, 0, "max games"
+
+    while games < max_games:
+        n = min(batch_size, max_games - games)
+        results += _play_batch(cdfs, n, rng, recorder)
+        games += n
+        if sequential:
+            swapped += _play_batch(swapped_cdfs, n, rng, None)
+            verdict = sprt(results[1] + swapped[2], results[2] + swapped[1], delta, alpha, beta)
+            if verdict is not None:
+                decision, reason = verdict, "sequential test"
+                break
+        low, high = wilson_interval(results, games, z)
+        if (high - low).max() / 2 <= precision:
+            reason = "precision"
+            break
+
+    return AdaptiveResult(results.tolist(), games, decision, reason, swapped.tolist())
+
+def run_simulation(
+    policyA: Policy,
+    policyB: Policy,
+    num_games: int = 500,
+    description: str = "",
+    batched: bool = False,
+    rng: Optional[Union[int, np.random.Generator]] = None,
+    adaptive: bool = False,
+    precision: float = 0.01
+) -> List[int]:
+    """Run a simulation between two policies.
+
+    With ``batched=True`` all games are played at once by ``simulate_games``,
+    seeded from ``rng``. Otherwise dict policies are wrapped in a
+    ``CompiledPolicy`` so each move is one cached lookup and one draw.
+    ``adaptive=True`` uses ``simulate_adaptive`` with ``num_games`` as the
+    cap and may return fewer games.
+    """
+    print(f"Running {description}...")
+    if adaptive:
+        result = simulate_adaptive(policyA, policyB, precision, num_games, rng=rng)
+        print(f"  Stopped after {result.games}/{num_games} games ({result.reason})")
+        return result.counts
+    if batched:
+        return simulate_games(policyA, policyB, num_games, rng)
+
+    results = [0, 0, 0]  # [Draws, O wins, X wins]
+    policyA, policyB = compile_policy(policyA), compile_policy(policyB)
+
+    for i in range(num_games):
+        outcome = play_game(policyA, policyB)
+        results[outcome] += 1
+
+        if (i + 1) % 100 == 0:
+            print(f"  Completed {i + 1}/{num_games} games")
+
+    return results
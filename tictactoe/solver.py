@@ -0,0 +1,123 @@
+"""Exact game solver: negamax with alpha-beta pruning and a transposition table.
+
+Scores are from the point of view of the player to move. A win scores
+``WIN_SCORE - plies`` and a loss ``plies - WIN_SCORE``, where ``plies`` is
+the number of pieces on the board when the game ends, so faster wins and
+slower losses are preferred. Draws score 0. Because the score depends
+only on the final position, it is the same for every move order and
+every symmetric image, which lets the table be keyed on canonical boards.
+"""
+
+import numpy as np
+from typing import Dict, Tuple
+from . import board as bb
+from .game import get_empty_cells
+from .policies import Policy
+from .symmetry import canonical_state
+
+WIN_SCORE = 10
+
+_EXACT, _LOWER, _UPPER = 0, 1, 2
+_MOVE_ORDER = (4, 0, 2, 6, 8, 1, 3, 5, 7)  # center, corners, edges
+
+# canonical state -> (score, bound flag)
+_TABLE: Dict[int, Tuple[int, int]] = {}
+
+def clear_cache() -> None:
+    """Empty the transposition table, so the next search starts cold."""
+    _TABLE.clear()
+
+def negamax(state: int, alpha: int = -WIN_SCORE, beta: int = WIN_SCORE) -> int:
+    """Return the score of an encoded board for the player to move.
+
+    The result is exact when it lies strictly inside (alpha, beta) and a
+    bound otherwise; call with the default window for an exact score.
+    """
+    result = bb.status(state)
+    if result != -1:
+        # The previous player made the last move, so a decided game is a loss.
+        return 0 if result == 0 else int(bb.N_PIECES[state]) - WIN_SCORE
+
+    key = canonical_state(state)
+    entry = _TABLE.get(key)
+    if entry is not None:
+        score, flag = entry
+        if flag == _EXACT:
+            return score
+        if flag == _LOWER and score >= beta:
+            return score
+        if flag == _UPPER and score <= alpha:
+            return score
+
+    alpha_orig = alpha
+    player = bb.player_to_move(state)
+    legal = bb.legal_moves(state)
+    best = -WIN_SCORE
+    for move in _MOVE_ORDER:
+        if move not in legal:
+            continue
+        score = -negamax(bb.make_move(state, move, player), -beta, -alpha)
+        if score > best:
+            best = score
+        if best > alpha:
+            alpha = best
+        if alpha >= beta:
+            break
+
+    if best <= alpha_orig:
+        flag = _UPPER
+    elif best >= beta:
+        flag = _LOWER
+    else:
+        flag = _EXACT
+    _TABLE[key] = (best, flag)
+    return best
+
+def move_scores(board: Tuple[int, ...]) -> Dict[int, int]:
+    """Return the exact score of each legal move, from the mover's point of view."""
+    state = bb.encode(board)
+    player = bb.player_to_move(state)
+    return {move: -negamax(bb.make_move(state, move, player)) for move in bb.legal_moves(state)}
+
+def position_value(board: Tuple[int, ...]) -> int:
+    """Return the game-theoretic value for the player to move: 1 win, 0 draw, -1 loss."""
+    return int(np.sign(negamax(bb.encode(board))))
+
+def depth_to_result(board: Tuple[int, ...]) -> int:
+    """Return the number of plies until the game ends under optimal play."""
+    state = bb.encode(board)
+    score = negamax(state)
+    if score == 0:
+        # Optimal play never decides a drawn position early.
+        return len(get_empty_cells(board)) if bb.status(state) == -1 else 0
+    return WIN_SCORE - abs(score) - int(bb.N_PIECES[state])
+
+def solve() -> Dict[Tuple[int, ...], int]:
+    """Return the exact score of every reachable non-terminal position."""
+    scores = {}
+    stack = [bb.EMPTY_STATE]
+    while stack:
+        state = stack.pop()
+        board = bb.decode(state)
+        if board in scores or bb.is_terminal(state):
+            continue
+        scores[board] = negamax(state)
+        player = bb.player_to_move(state)
+        stack.extend(bb.make_move(state, move, player) for move in bb.legal_moves(state))
+    return scores
+
+def perfect_policy() -> Policy:
+    """Return an optimal policy in the variable-length dict format.
+
+    Every reachable non-terminal board maps to a distribution over its empty
+    cells (in ``get_empty_cells`` order) that is uniform over the best-scoring
+    moves, so the policy wins as fast as possible and otherwise never loses.
+    """
+    policy = {}
+    for board in solve():
+        scores = move_scores(board)
+        best = max(scores.values())
+        moves = get_empty_cells(board)
+        probs = np.array([1.0 if scores[move] == best else 0.0 for move in moves])
+        policy[board] = probs / probs.sum()
+    return policy
@@ -0,0 +1,43 @@
+"""Small statistics helpers for simulation results."""
+
+import numpy as np
+from typing import Optional, Tuple
+
+def wilson_interval(successes, trials, z: float = 1.96) -> Tuple[np.ndarray, np.ndarray]:
+    """Return the Wilson score interval (low, high) for a binomial rate.
+
+    Works elementwise on arrays; rates with zero trials get (0, 1).
+    """
+    successes = np.asarray(successes, dtype=np.float64)
+    trials = np.asarray(trials, dtype=np.float64)
+    n = np.maximum(trials, 1.0)
+    p = successes / n
+    denom = 1 + z ** 2 / n
+    center = (p + z ** 2 / (2 * n)) / denom
+    half = z * np.sqrt(p * (1 - p) / n + z ** 2 / (4 * n ** 2)) / denom
+    low = np.where(trials > 0, center - half, 0.0)
+    high = np.where(trials > 0, center + half, 1.0)
+    return np.clip(low, 0.0, 1.0), np.clip(high, 0.0, 1.0)
+
+def sprt(wins, losses, delta: float = 0.05, alpha: float = 0.05, beta: float = 0.05) -> Optional[int]:
+    """Wald's sequential probability ratio test on decisive games.
+
+    Runs two one-sided tests of an even score, a share of 0.5 of the
+    decisive games, against ``0.5 + delta`` and against ``0.5 - delta``.
+    Returns 1 once the first player is shown stronger, -1 once the second
+    is, 0 once both tests accept an even score (neither is stronger by
+    ``delta``) and None while more games are needed. ``alpha`` and
+    ``beta`` bound each test's false-alarm and miss rates.
+    """
+    up = np.log((0.5 + delta) / 0.5)
+    down = np.log((0.5 - delta) / 0.5)
+    accept, reject = np.log((1 - beta) / alpha), np.log(beta / (1 - alpha))
+    first_stronger = wins * up + losses * down
+    second_stronger = wins * down + losses * up
+    if first_stronger >= accept:
+        return 1
+    if second_stronger >= accept:
+        return -1
+    if first_stronger <= reject and second_stronger <= reject:
+        return 0
+    return None
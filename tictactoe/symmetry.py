@@ -0,0 +1,140 @@
+"""Board symmetries (the dihedral group D4 of the 3x3 square).
+
+Every board has up to 8 symmetric images. Picking the image with the
+smallest integer code as the orbit representative lets policies and value
+tables be stored once per orbit; the tables below map any board code to
+its representative and to the transform that produces it, so moves and
+probability vectors can be remapped between the two frames.
+"""
+
+import numpy as np
+from collections.abc import MutableMapping
+from typing import Iterator, Tuple
+from .board import CELLS, POW3, decode, encode
+from .policies import Policy
+
+def _build_permutations() -> Tuple[Tuple[int, ...], ...]:
+    """Return the 8 cell permutations, identity first.
+
+    A transformed board is ``tuple(board[p] for p in perm)``.
+    """
+    grid = np.arange(9).reshape(3, 3)
+    images = [np.rot90(grid, k) for k in range(4)] + [np.rot90(grid.T, k) for k in range(4)]
+    return tuple(tuple(image.flatten().tolist()) for image in images)
+
+PERMUTATIONS = _build_permutations()
+
+# PERM[k] maps canonical-frame cells to board cells, INVERSE[k] the reverse.
+PERM = np.array(PERMUTATIONS, dtype=np.intp)
+INVERSE = np.argsort(PERM, axis=1)
+
+# IMAGES[s, k] is the code of board s under permutation k.
+IMAGES = (CELLS[:, PERM].astype(np.int32) * POW3).sum(axis=2, dtype=np.int32)
+CANONICAL = IMAGES.min(axis=1)
+CANONICAL_TRANSFORM = IMAGES.argmin(axis=1).astype(np.int8)
+
+for _table in (PERM, INVERSE, IMAGES, CANONICAL, CANONICAL_TRANSFORM):
+    _table.flags.writeable = False
+
+_CANONICAL = CANONICAL.tolist()
+_CANONICAL_TRANSFORM = CANONICAL_TRANSFORM.tolist()
+
+def transform(board: Tuple[int, ...], perm: Tuple[int, ...]) -> Tuple[int, ...]:
+    """Apply a cell permutation to a tuple board."""
+    return tuple(board[p] for p in perm)
+
+def canonical_state(state: int) -> int:
+    """Return the smallest integer code among the 8 symmetric images of a board."""
+    return _CANONICAL[state]
+
+def canonical_board(board: Tuple[int, ...]) -> Tuple[int, ...]:
+    """Return the orbit representative of a tuple board."""
+    return decode(_CANONICAL[encode(board)])
+
+def orbit(state: int) -> Tuple[int, ...]:
+    """Return the distinct codes of all symmetric images of a board."""
+    return tuple(sorted(set(IMAGES[state].tolist())))
+
+def to_canonical_move(state: int, move: int) -> int:
+    """Map a cell on the board to the matching cell on its representative."""
+    return int(INVERSE[_CANONICAL_TRANSFORM[state], move])
+
+def from_canonical_move(state: int, move: int) -> int:
+    """Map a cell on the representative back to the board's own frame."""
+    return int(PERM[_CANONICAL_TRANSFORM[state], move])
+
+def to_canonical_probs(state: int, probs: np.ndarray) -> np.ndarray:
+    """Reorder a 9-cell vector from the board's frame to the representative's."""
+    return probs[PERM[_CANONICAL_TRANSFORM[state]]]
+
+def from_canonical_probs(state: int, probs: np.ndarray) -> np.ndarray:
+    """Reorder a 9-cell vector from the representative's frame to the board's."""
+    return probs[INVERSE[_CANONICAL_TRANSFORM[state]]]
+
+def canonicalize_policy(policy: Policy) -> Policy:
+    """Reduce a fixed-length policy to one entry per symmetry orbit.
+
+    Entries are keyed on representative boards with probabilities in the
+    representative's frame. When several members of an orbit are present,
+    the representative's own entry wins, otherwise the first one seen.
+    """
+    reduced = {}
+    for board, probs in policy.items():
+        state = encode(board)
+        key = decode(_CANONICAL[state])
+        if key not in reduced or key == board:
+            reduced[key] = to_canonical_probs(state, np.asarray(probs))
+    return reduced
+
+class SymmetricPolicy(MutableMapping):
+    """A fixed-length policy stored over orbit representatives only.
+
+    Behaves like a ``Policy`` dict keyed on every board of every stored
+    orbit: lookups remap the representative's probabilities into the
+    requested board's frame, and assignments update the whole orbit.
+    """
+
+    def __init__(self, policy: Policy = None):
+        self._canonical = canonicalize_policy(policy) if policy else {}
+
+    @classmethod
+    def from_canonical(cls, canonical: Policy) -> "SymmetricPolicy":
+        """Wrap a dict that is already keyed on representative boards."""
+        instance = cls()
+        instance._canonical = dict(canonical)
+        return instance
+
+    @property
+    def canonical(self) -> Policy:
+        """The underlying representative-keyed dict."""
+        return self._canonical
+
+    def __getitem__(self, board: Tuple[int, ...]) -> np.ndarray:
+        state = encode(board)
+        probs = self._canonical[decode(_CANONICAL[state])]
+        return from_canonical_probs(state, probs)
+
+    def __setitem__(self, board: Tuple[int, ...], probs: np.ndarray) -> None:
+        state = encode(board)
+        self._canonical[decode(_CANONICAL[state])] = to_canonical_probs(state, np.asarray(probs))
+
+    def __delitem__(self, board: Tuple[int, ...]) -> None:
+        del self._canonical[canonical_board(board)]
+
+    def __contains__(self, board: object) -> bool:
+        try:
+            return canonical_board(board) in self._canonical
+        except (TypeError, IndexError):
+            return False
+
+    def __iter__(self) -> Iterator[Tuple[int, ...]]:
+        for key in self._canonical:
+            for state in orbit(encode(key)):
+                yield decode(state)
+
+    def __len__(self) -> int:
+        return sum(len(orbit(encode(key))) for key in self._canonical)
+
+    def copy(self) -> "SymmetricPolicy":
+        """Return a shallow copy, like ``dict.copy``."""
+        return SymmetricPolicy.from_canonical(self._canonical)
@@ -0,0 +1,145 @@
+"""Round-robin tournaments between any number of policies.
+
+Every ordered pairing is split into fixed-size chunks of games and each
+chunk gets its own random stream spawned from one master seed. The
+schedule, not the worker that happens to run a chunk, decides the
+stream, so results are bit-identical for a given seed whatever the
+worker count. With a ``precision`` each pairing instead runs as one
+``simulate_adaptive`` task that stops as soon as its result is settled.
+"""
+
+import numpy as np
+from concurrent.futures import ProcessPoolExecutor
+from typing import Dict, List, NamedTuple, Optional, Tuple
+from .policies import PolicyLike, as_policy_table
+from .simulation import simulate_adaptive, simulate_games
+from .stats import wilson_interval
+
+# Per-process policy tables, set once by _init_worker.
+_TABLES: List[np.ndarray] = []
+
+class TournamentResult(NamedTuple):
+    """Outcome counts of a tournament.
+
+    ``counts[i, j]`` holds [draws, O wins, X wins] for policy ``names[i]``
+    playing O against ``names[j]`` playing X.
+    """
+    names: List[str]
+    counts: np.ndarray
+
+    @property
+    def games(self) -> np.ndarray:
+        """Number of games played in each pairing."""
+        return self.counts.sum(axis=2)
+
+    def rates(self) -> np.ndarray:
+        """Outcome rates with the same layout as ``counts``."""
+        games = np.maximum(self.games, 1)[:, :, None]
+        return self.counts / games
+
+    def confidence_intervals(self, z: float = 1.96) -> Tuple[np.ndarray, np.ndarray]:
+        """Wilson score intervals (low, high) for every rate in ``rates()``."""
+        return wilson_interval(self.counts, self.games[:, :, None], z)
+
+def _init_worker(tables: List[np.ndarray]) -> None:
+    global _TABLES
+    _TABLES = tables
+
+# Tasks return (O index, X index, counts) entries to add to the cross-table.
+Entries = List[Tuple[int, int, List[int]]]
+
+def _play_chunk(task: Tuple[int, int, int, np.random.SeedSequence]) -> Entries:
+    i, j, num_games, seed = task
+    return [(i, j, simulate_games(_TABLES[i], _TABLES[j], num_games, np.random.default_rng(seed)))]
+
+def _play_adaptive(task: Tuple[int, int, int, np.random.SeedSequence, float, bool]) -> Entries:
+    i, j, num_games, seed, precision, sequential = task
+    result = simulate_adaptive(_TABLES[i], _TABLES[j], precision, num_games, sequential=sequential,
+                               rng=np.random.default_rng(seed))
+    # The seat-swapped games of the sequential test belong to the reverse pairing.
+    return [(i, j, result.counts), (j, i, result.swapped)]
+
+def schedule(
+    n_policies: int,
+    num_games: int,
+    seed: int = 0,
+    chunk_size: int = 100_000,
+    self_play: bool = True
+) -> List[Tuple[int, int, int, np.random.SeedSequence]]:
+    """Return the (O index, X index, games, seed) chunks of a tournament."""
+    pairings = [(i, j) for i in range(n_policies) for j in range(n_policies)
+                if self_play or i != j]
+    tasks = []
+    for (i, j), pair_seed in zip(pairings, np.random.SeedSequence(seed).spawn(len(pairings))):
+        n_chunks = -(-num_games // chunk_size)
+        for c, chunk_seed in enumerate(pair_seed.spawn(n_chunks)):
+            tasks.append((i, j, min(chunk_size, num_games - c * chunk_size), chunk_seed))
+    return tasks
+
+def run_tournament(
+    policies: Dict[str, PolicyLike],
+    num_games: int = 10000,
+    seed: int = 0,
+    workers: Optional[int] = None,
+    chunk_size: int = 100_000,
+    self_play: bool = True,
+    precision: Optional[float] = None,
+    sequential: bool = True
+) -> TournamentResult:
+    """Play every ordered pairing of ``policies`` and collect a cross-table.
+
+    ``workers=1`` runs in-process; otherwise chunks are spread over a
+    ``ProcessPoolExecutor`` (``None`` uses every core). With a
+    ``precision``, ``num_games`` is a per-pairing cap and pairings stop
+    early once settled (see ``simulate_adaptive``; ``sequential=False``
+    waits for the precision alone), so ``result.games`` varies by pairing.
+    The sequential test also plays every game with the seats swapped, and
+    those games are added to the reverse pairing's cell.
+    """
+    names = list(policies)
+    tables = [as_policy_table(policy) for policy in policies.values()]
+    counts = np.zeros((len(names), len(names), 3), dtype=np.int64)
+    if precision is None:
+        tasks, play = schedule(len(names), num_games, seed, chunk_size, self_play), _play_chunk
+    else:
+        # One chunk per pairing, so each pairing keeps its own seed.
+        tasks = [task + (precision, sequential) for task in
+                 schedule(len(names), num_games, seed, max(num_games, 1), self_play)]
+        play = _play_adaptive
+
+    if workers == 1:
+        _init_worker(tables)
+        for entries in map(play, tasks):
+            for i, j, result in entries:
+                counts[i, j] += result
+    else:
+        with ProcessPoolExecutor(max_workers=workers, initializer=_init_worker,
+                                 initargs=(tables,)) as executor:
+            for entries in executor.map(play, tasks):
+                for i, j, result in entries:
+                    counts[i, j] += result
+
+    return TournamentResult(names, counts)
+
+def format_cross_table(result: TournamentResult, z: float = 1.96) -> str:
+    """Render O-win / X-win / draw percentages with interval half-widths.
+
+    Rows are the policy playing O, columns the policy playing X.
+    """
+    rates = result.rates() * 100
+    low, high = result.confidence_intervals(z)
+    margin = (high - low) / 2 * 100
+    width = max(24, max(len(name) for name in result.names) + 2)
+
+    lines = ["O \\ X".ljust(width) + "".join(name.ljust(width) for name in result.names)]
+    for i, name in enumerate(result.names):
+        cells = []
+        for j in range(len(result.names)):
+            if not result.games[i, j]:
+                cells.append("-".ljust(width))
+                continue
+            draw, o_win, x_win = rates[i, j]
+            cells.append(f"{o_win:.1f}/{x_win:.1f}/{draw:.1f} ±{margin[i, j].max():.1f}".ljust(width))
+        lines.append(name.ljust(width) + "".join(cells))
+    lines.append("cells: O win % / X win % / draw % ± largest interval half-width")
+    return "\n".join(lines)
@@ -1,48 +1,415 @@
 """Reinforcement learning training functions."""
 
+import json
+import os
 import numpy as np
-from collections import defaultdict
-from typing import Dict, Tuple
-from .game import state_of_board, get_empty_cells, make_move
-from .policies import Policy
-from .policies import Policy, get_valid_move_probs  
+from pathlib import Path
+from typing import Optional, Union
+from .board import LEGAL, N_STATES, POW3, STATUS, TERMINAL, decode
+from .policies import DensePolicy, Policy, policy_table
+from .profiling import count, instrumented
+from .records import decode_records, iter_record_chunks, record_states
+from .symmetry import CANONICAL, CANONICAL_TRANSFORM, IMAGES, INVERSE
+
+def record_transitions(records: np.ndarray):
+    """Turn a chunk of game records into flat transition arrays.
+
+    Returns (states, actions, rewards, next_states), one entry per logged
+    move: the board codes before and after it, and the final reward from
+    the mover's point of view on the move that ends the game (0 before).
+    """
+    moves, players, outcomes = decode_records(records)
+    played = moves >= 0
+    states = record_states(moves, players)
+    actions = np.maximum(moves, 0)
+    next_states = states + np.where(played, players * POW3[actions], 0)
+
+    last = np.arange(9) == played.sum(axis=1, keepdims=True) - 1
+    reward = np.where(outcomes[:, None] == players, 1.0,
+                      np.where(outcomes[:, None] == 0, 0.0, -1.0))
+    rewards = np.where(last, reward, 0.0)
+    return states[played], actions[played].astype(np.intp), rewards[played], next_states[played]
+
+@instrumented()
+def play_episodes(cdf_table: np.ndarray, n: int, rng: np.random.Generator):
+    """Play ``n`` episodes in lockstep from a per-state cumulative policy table.
+
+    Returns (states, actions, outcomes): (n, 9) board codes before each ply
+    (-1 after the game ends), the moves played and the final results.
+    """
+    states = np.full((n, 9), -1, dtype=np.int32)
+    actions = np.zeros((n, 9), dtype=np.intp)
+    outcomes = np.zeros(n, dtype=np.int8)
+    current = np.zeros(n, dtype=np.int32)
+    active = np.arange(n)
+
+    for ply in range(9):
+        player = 1 + ply % 2
+        s = current[active]
+        count("moves", s.size)
+        cdf = cdf_table[s]
+        u = rng.random(active.size) * cdf[:, -1]
+        moves = (cdf <= u[:, None]).sum(axis=1)
+        states[active, ply] = s
+        actions[active, ply] = moves
+        s = s + player * POW3[moves]
+        current[active] = s
+
+        result = STATUS[s]
+        done = result != -1
+        outcomes[active[done]] = result[done]
+        active = active[~done]
+        if not active.size:
+            break
+
+    return states, actions, outcomes
+
+# Policy rows of an empty policy: uniform over legal moves.
+_UNIFORM = policy_table({})
+
+DEFAULT_BATCH_SIZE = 1024
+
+def default_batch_size(episodes: int) -> int:
+    """``DEFAULT_BATCH_SIZE``, or ``episodes // 8`` for runs too short for eight full batches."""
+    return max(1, min(DEFAULT_BATCH_SIZE, episodes // 8))
+
+def _generator(rng: Optional[Union[int, np.random.Generator]]) -> np.random.Generator:
+    """Return a Generator for ``rng``; None seeds one from the global NumPy state.
+
+    Drawing the seed from ``np.random`` keeps runs repeatable after
+    ``np.random.seed``, as they were when training used the global stream.
+    """
+    if rng is None:
+        return np.random.default_rng(np.random.randint(2 ** 63))
+    return np.random.default_rng(rng)
+
+class QLearner:
+    """Tabular Q-learning engine over integer board codes.
+
+    ``Q`` and the behaviour policy ``P`` are dense (3^9, 9) arrays indexed
+    by board code. Episodes are played ``batch_size`` at a time in lockstep
+    with the policy as it stood at the start of the batch; the Q update then
+    applies every (state, action) target of the batch in episode order, and
+    the softmax policy is recomputed once per batch for the touched rows
+    only. ``batch_size=1`` reproduces the classic one-episode-at-a-time loop.
+    Larger batches vectorize better, but the learner only acts on what it
+    has learned once per batch. At the default of 1024 a million episodes
+    train in about 4 seconds; 256 takes about 6.
+
+    Self-play updates target the undiscounted final outcome from the
+    mover's point of view, as in the original loop. ``gamma`` discounts the
+    next board's value in the Bellman targets of ``fit_records``.
+    """
+
+    def __init__(
+        self,
+        policy: Policy,
+        alpha: float = 0.1,
+        gamma: float = 0.9,
+        symmetric: bool = False,
+        batch_size: int = DEFAULT_BATCH_SIZE,
+        rng: Optional[Union[int, np.random.Generator]] = None
+    ):
+        self.alpha = alpha
+        self.gamma = gamma
+        self.symmetric = symmetric
+        self.batch_size = batch_size
+        self.rng = _generator(rng)
+        self.episode = 0
+        self.Q = np.zeros((N_STATES, 9))
+        self.P = policy_table(policy)
+        # Boards whose policy row has been replaced by a Q softmax.
+        self.touched = np.zeros(N_STATES, dtype=bool)
+        self._cdf = np.cumsum(self.P, axis=1)
+
+    def run(
+        self,
+        episodes: int,
+        checkpoint_path: Optional[Union[str, Path]] = None,
+        checkpoint_every: int = 0
+    ) -> None:
+        """Train for ``episodes`` more episodes.
+
+        With a ``checkpoint_path``, a checkpoint is written every
+        ``checkpoint_every`` episodes (rounded up to whole batches, so a
+        resumed run replays the same batches) and once more at the end.
+        """
+        remaining = episodes
+        if checkpoint_path is not None and checkpoint_every > 0:
+            every = -(-checkpoint_every // self.batch_size) * self.batch_size
+            while remaining > every:
+                self.run(every)
+                self.save_checkpoint(checkpoint_path)
+                remaining -= every
+
+        while remaining > 0:
+            n = min(self.batch_size, remaining)
+            self.learn_batch(*self._play(n))
+            remaining -= n
+
+        if checkpoint_path is not None:
+            self.save_checkpoint(checkpoint_path)
+
+    @property
+    def cdf(self) -> np.ndarray:
+        """Read-only view of the per-state cumulative policy that episodes are sampled from."""
+        view = self._cdf.view()
+        view.flags.writeable = False
+        return view
+
+    def learn_batch(self, states: np.ndarray, actions: np.ndarray, outcomes: np.ndarray) -> None:
+        """Apply a batch of episodes in ``play_episodes`` form as one bulk update.
+
+        The episodes may have been played elsewhere, for instance by actor
+        processes sampling from ``cdf``; the episode counter advances by
+        the batch size.
+        """
+        self._learn(states, actions, outcomes)
+        self.episode += len(outcomes)
+        count("episodes", len(outcomes))
+
+    def _play(self, n: int):
+        """Play ``n`` episodes; return per-ply states, actions and outcomes."""
+        return play_episodes(self._cdf, n, self.rng)
+
+    @instrumented()
+    def _learn(self, states: np.ndarray, actions: np.ndarray, outcomes: np.ndarray) -> None:
+        """Apply one batch of Monte Carlo targets and refresh the touched policy rows."""
+        played = states >= 0
+        player = np.where(np.arange(9) % 2 == 0, 1, 2)
+        reward = np.where(outcomes[:, None] == player, 1.0,
+                          np.where(outcomes[:, None] == 3 - player, -1.0, 0.0))
+
+        # Row-major order keeps episodes, and plies within them, in play order.
+        s, a, r = states[played], actions[played], reward[played]
+        if self.symmetric:
+            a = INVERSE[CANONICAL_TRANSFORM[s], a]
+            s = CANONICAL[s]
+
+        # k sequential updates Q += alpha * (r_j - Q) collapse to
+        # Q = (1-alpha)^k Q + sum_j alpha (1-alpha)^(k-j) r_j.
+        flat = s.astype(np.intp) * 9 + a
+        order = np.argsort(flat, kind="stable")
+        sorted_flat = flat[order]
+        starts = np.flatnonzero(np.r_[True, sorted_flat[1:] != sorted_flat[:-1]])
+        counts = np.diff(np.r_[starts, sorted_flat.size])
+        position = np.arange(sorted_flat.size) - np.repeat(starts, counts)
+        remaining = np.repeat(counts, counts) - position - 1
+        decay = 1.0 - self.alpha
+        weighted = self.alpha * decay ** remaining * r[order]
+
+        cells = sorted_flat[starts]
+        q = self.Q.reshape(-1)
+        q[cells] = decay ** counts * q[cells] + np.add.reduceat(weighted, starts)
+
+        self._refresh(np.unique(s))
+
+    def fit_records(
+        self,
+        path: Union[str, Path],
+        chunk_games: int = 65536,
+        alpha: Optional[float] = None,
+        sweeps: int = 9
+    ) -> int:
+        """Fit Q offline to a game record file by fitted Q iteration.
+
+        Each sweep reads the file in chunks, decodes every logged move to a
+        (state, action, reward, next state) transition and regresses Q onto
+        its Bellman target: the mover's reward if the move ends the game,
+        otherwise ``-gamma`` times the best Q of the next board, where the
+        opponent moves. Targets are scatter-added per cell with
+        ``np.bincount``. With ``alpha=None`` each sweep sets Q to the mean
+        target of every logged (state, action) under the previous sweep's
+        Q; otherwise Q moves ``alpha`` of the way to each chunk's mean
+        target. Games last at most nine moves, so the default nine sweeps
+        carry every result back to the first move. The policy is refreshed
+        once at the end. Returns the number of games in the file.
+        """
+        size = N_STATES * 9
+        q = self.Q.reshape(-1)
+        hit = np.zeros(size, dtype=bool)
+        games = 0
+
+        for _ in range(sweeps):
+            sums = np.zeros(size)
+            counts = np.zeros(size)
+            games = 0
+            for chunk in iter_record_chunks(path, chunk_games):
+                s, a, targets, s_next = record_transitions(chunk)
+                if self.symmetric:
+                    a = INVERSE[CANONICAL_TRANSFORM[s], a]
+                    s, s_next = CANONICAL[s], CANONICAL[s_next]
+                ongoing = ~TERMINAL[s_next]
+                after = s_next[ongoing]
+                best = np.where(LEGAL[after], self.Q[after], -np.inf).max(axis=1)
+                targets[ongoing] = -self.gamma * best
+
+                flat = s.astype(np.intp) * 9 + a
+                chunk_sums = np.bincount(flat, weights=targets, minlength=size)
+                chunk_counts = np.bincount(flat, minlength=size).astype(np.float64)
+                if alpha is None:
+                    sums += chunk_sums
+                else:
+                    seen = chunk_counts > 0
+                    q[seen] += alpha * (chunk_sums[seen] / chunk_counts[seen] - q[seen])
+                counts += chunk_counts
+                games += len(chunk)
+                count("games", len(chunk))
+
+            hit = counts > 0
+            if alpha is None:
+                q[hit] = sums[hit] / counts[hit]
+
+        self._refresh(np.flatnonzero(hit.reshape(N_STATES, 9).any(axis=1)))
+        self.episode += games
+        return games
+
+    def _refresh(self, rows: np.ndarray) -> None:
+        """Replace the policy rows fed by Q ``rows`` with a softmax over legal moves.
+
+        In symmetric mode ``rows`` are representatives and every image of
+        each one is refreshed in its own frame.
+        """
+        if self.symmetric:
+            targets = np.unique(IMAGES[rows])
+            frames = INVERSE[CANONICAL_TRANSFORM[targets]]
+            logits = np.take_along_axis(self.Q[CANONICAL[targets]], frames, axis=1)
+        else:
+            targets = rows
+            logits = self.Q[targets]
+        exp_logits = np.exp(np.clip(logits, -10, 10)) * LEGAL[targets]
+        probs = exp_logits / exp_logits.sum(axis=1, keepdims=True)
+        self.P[targets] = probs
+        self._cdf[targets] = np.cumsum(probs, axis=1)
+        count("states_visited", int(np.count_nonzero(~self.touched[targets])))
+        self.touched[targets] = True
+
+    def save_checkpoint(self, path: Union[str, Path]) -> None:
+        """Atomically write the full training state to an ``.npz`` file.
+
+        Only rows that carry information are stored: Q rows that have been
+        updated and policy rows that differ from the uniform default, which
+        keeps a checkpoint under a megabyte and its write to milliseconds.
+        The file is written beside ``path`` and renamed into place, so an
+        interrupted write never leaves a truncated checkpoint.
+        """
+        q_states = np.flatnonzero(self.Q.any(axis=1)).astype(np.int32)
+        p_states = np.flatnonzero((self.P != _UNIFORM).any(axis=1)).astype(np.int32)
+        meta = {
+            "alpha": self.alpha,
+            "gamma": self.gamma,
+            "symmetric": self.symmetric,
+            "batch_size": self.batch_size,
+            "episode": self.episode,
+            "rng": self.rng.bit_generator.state,
+        }
+
+        path = Path(path)
+        tmp_path = path.with_name(path.name + ".tmp")
+        with open(tmp_path, "wb") as f:
+            np.savez(
+                f,
+                meta=np.array(json.dumps(meta)),
+                q_states=q_states,
+                q_rows=self.Q[q_states],
+                p_states=p_states,
+                p_rows=self.P[p_states],
+                touched=np.flatnonzero(self.touched).astype(np.int32),
+            )
+            f.flush()
+            os.fsync(f.fileno())
+        os.replace(tmp_path, path)
+
+    @classmethod
+    def load_checkpoint(cls, path: Union[str, Path]) -> "QLearner":
+        """Rebuild a learner, RNG state included, from ``save_checkpoint`` output."""
+        with np.load(path) as data:
+            meta = json.loads(data["meta"].item())
+            learner = cls({}, meta["alpha"], meta["gamma"], meta["symmetric"], meta["batch_size"],
+                          rng=0)
+            learner.episode = meta["episode"]
+            learner.rng.bit_generator.state = meta["rng"]
+            learner.Q[data["q_states"]] = data["q_rows"]
+            learner.P[data["p_states"]] = data["p_rows"]
+            learner.touched[data["touched"]] = True
+        learner._cdf = np.cumsum(learner.P, axis=1)
+        return learner
+
+    def export(self, policy: Policy) -> Policy:
+        """Write every touched policy row into ``policy`` and return it.
+
+        A ``DensePolicy`` goes through ``update_rows``: a read-only one (as
+        memory-mapped by ``load_policy``) or one missing some visited
+        boards is replaced by an updated copy, so always use the result.
+        """
+        if isinstance(policy, DensePolicy):
+            states = np.flatnonzero(self.touched)
+            return policy.update_rows(states, self.P[states])
+        for state in np.flatnonzero(self.touched).tolist():
+            policy[decode(state)] = self.P[state].copy()
+        return policy
 
 def train_q_learning(
     policy: Policy,
     episodes: int = 10000,
     alpha: float = 0.1,
-    gamma: float = 0.9
+    gamma: float = 0.9,
+    symmetric: bool = False,
+    batch_size: Optional[int] = None,
+    rng: Optional[Union[int, np.random.Generator]] = None,
+    checkpoint_path: Optional[Union[str, Path]] = None,
+    checkpoint_every: int = 0
+) -> Policy:
+    """Train policy using Q-learning.
+
+    Runs a ``QLearner`` and writes the learned rows back into ``policy``,
+    or into a copy of it for a ``DensePolicy`` that is read-only or lacks
+    a visited board; either way the trained policy is returned. With
+    ``symmetric=True`` Q-values are shared across the 8 symmetric images
+    of each board, and every image's policy entry is refreshed whenever
+    one of them is updated. A ``checkpoint_path`` makes the run resumable
+    with ``resume_training``.
+
+    ``batch_size=None`` uses ``default_batch_size(episodes)``, so short
+    runs such as the 1000 episodes of ``run_analysis.py`` still refresh
+    the policy eight times. ``rng=None`` draws a seed from the global
+    NumPy state.
+    """
+    batch_size = batch_size or default_batch_size(episodes)
+    learner = QLearner(policy, alpha, gamma, symmetric, batch_size, rng)
+    learner.run(episodes, checkpoint_path, checkpoint_every)
+    return learner.export(policy)
+
+def resume_training(
+    checkpoint_path: Union[str, Path],
+    episodes: int,
+    checkpoint_every: int = 0
+) -> QLearner:
+    """Continue a checkpointed run until it has trained ``episodes`` in total.
+
+    Checkpoints keep being written to ``checkpoint_path``. The returned
+    learner is in the same state an uninterrupted run would have reached;
+    call ``export`` on it to get the policy.
+    """
+    learner = QLearner.load_checkpoint(checkpoint_path)
+    learner.run(max(episodes - learner.episode, 0), checkpoint_path, checkpoint_every)
+    return learner
+
+def train_offline(
+    path: Union[str, Path],
+    policy: Optional[Policy] = None,
+    gamma: float = 1.0,
+    alpha: Optional[float] = None,
+    symmetric: bool = False,
+    chunk_games: int = 65536,
+    sweeps: int = 9
 ) -> Policy:
-    """Train policy using Q-learning."""
-    Q = defaultdict(lambda: np.zeros(9))
-    
-    for episode in range(episodes):
-        board = (0, 0, 0, 0, 0, 0, 0, 0, 0)
-        player = 1
-        history = []
-
-        # Play episode
-        while state_of_board(board) == -1:
-            empty_cells = get_empty_cells(board)
-            probs = get_valid_move_probs(board, policy)
-            action = np.random.choice(empty_cells, p=probs)
-            
-            history.append((board, action, player))
-            board = make_move(board, action, player)
-            player = 3 - player
-
-        # Update Q-values
-        outcome = state_of_board(board)
-        for state, action, p in history:
-            reward = 1 if outcome == p else (-1 if outcome == 3 - p else 0)
-            Q[state][action] += alpha * (reward - Q[state][action])
-            
-            # Update policy
-            empty_cells = get_empty_cells(state)
-            if empty_cells:
-                logits = Q[state][empty_cells]
-                exp_logits = np.exp(np.clip(logits, -10, 10))
-                policy[state] = np.zeros(9)
-                policy[state][empty_cells] = exp_logits / np.sum(exp_logits)
-    
-    return policy
\ No newline at end of file
+    """Learn a policy from a logged game file instead of self-play.
+
+    Wraps ``QLearner.fit_records`` and writes the learned rows into
+    ``policy`` (a new dict by default), like ``train_q_learning``.
+    """
+    policy = {} if policy is None else policy
+    learner = QLearner(policy, gamma=gamma, symmetric=symmetric)
+    learner.fit_records(path, chunk_games, alpha, sweeps)
+    return learner.export(policy)
\ No newline at end of file